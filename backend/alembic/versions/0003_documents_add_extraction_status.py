@@ -0,0 +1,29 @@
+"""add documents extraction_status
+
+Revision ID: 0003_doc_extraction_status
+Revises: 0002_doc_meta
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_doc_extraction_status"
+down_revision = "0002_doc_meta"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "documents",
+        sa.Column("extraction_status", sa.String(length=32), nullable=False, server_default=sa.text("'ok'")),
+    )
+    op.alter_column("documents", "extraction_status", server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column("documents", "extraction_status")
@@ -0,0 +1,43 @@
+"""add upload_sessions
+
+Revision ID: 0004_upload_sessions
+Revises: 0003_doc_extraction_status
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0004_upload_sessions"
+down_revision = "0003_doc_extraction_status"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "upload_sessions",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("deal_id", sa.String(length=36), sa.ForeignKey("deals.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("filename", sa.String(length=512), nullable=False),
+        sa.Column("content_type", sa.String(length=128), nullable=True),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("chunk_size", sa.Integer(), nullable=False),
+        sa.Column("received_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("expected_sha256", sa.String(length=64), nullable=True),
+        sa.Column("storage_state", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("document_id", sa.Integer(), sa.ForeignKey("documents.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_upload_sessions_deal_id", "upload_sessions", ["deal_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_upload_sessions_deal_id", table_name="upload_sessions")
+    op.drop_table("upload_sessions")
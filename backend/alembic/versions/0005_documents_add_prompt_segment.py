@@ -0,0 +1,30 @@
+"""add documents prompt_segment, segment_sha256, redaction_version
+
+Revision ID: 0005_doc_prompt_segment
+Revises: 0004_upload_sessions
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_doc_prompt_segment"
+down_revision = "0004_upload_sessions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows stay NULL and are backfilled the first time they feed a prompt.
+    op.add_column("documents", sa.Column("prompt_segment", sa.Text(), nullable=True))
+    op.add_column("documents", sa.Column("segment_sha256", sa.String(length=64), nullable=True))
+    op.add_column("documents", sa.Column("redaction_version", sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("documents", "redaction_version")
+    op.drop_column("documents", "segment_sha256")
+    op.drop_column("documents", "prompt_segment")
@@ -0,0 +1,27 @@
+"""add documents passages_json
+
+Revision ID: 0006_doc_passages
+Revises: 0005_doc_prompt_segment
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0006_doc_passages"
+down_revision = "0005_doc_prompt_segment"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Backfilled lazily alongside prompt_segment.
+    op.add_column("documents", sa.Column("passages_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("documents", "passages_json")
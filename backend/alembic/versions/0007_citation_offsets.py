@@ -0,0 +1,30 @@
+"""add documents page_offsets and deal_terms citation_spans_json
+
+Revision ID: 0007_citation_offsets
+Revises: 0006_doc_passages
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0007_citation_offsets"
+down_revision = "0006_doc_passages"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing documents get single-page offsets when their segment is next rebuilt;
+    # spans for existing terms are resolved on read until the next extract or edit.
+    op.add_column("documents", sa.Column("page_offsets", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column("deal_terms", sa.Column("citation_spans_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("deal_terms", "citation_spans_json")
+    op.drop_column("documents", "page_offsets")
@@ -0,0 +1,39 @@
+"""add document_extractions
+
+Revision ID: 0008_document_extractions
+Revises: 0007_citation_offsets
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0008_document_extractions"
+down_revision = "0007_citation_offsets"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_extractions",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("segment_sha256", sa.String(length=64), nullable=False),
+        sa.Column("document_sha256", sa.String(length=64), nullable=False),
+        sa.Column("prompt_name", sa.String(length=128), nullable=False),
+        sa.Column("prompt_version", sa.String(length=64), nullable=False),
+        sa.Column("model", sa.String(length=128), nullable=False),
+        sa.Column("output_json", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("segment_sha256", "prompt_name", "prompt_version", "model", name="uq_document_extractions_key"),
+    )
+    op.create_index("ix_document_extractions_document_sha256", "document_extractions", ["document_sha256"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_extractions_document_sha256", table_name="document_extractions")
+    op.drop_table("document_extractions")
@@ -0,0 +1,30 @@
+"""add input_hash to deal_terms, deal_analysis and deal_drafts
+
+Revision ID: 0009_stage_input_hashes
+Revises: 0008_document_extractions
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009_stage_input_hashes"
+down_revision = "0008_document_extractions"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("deal_terms", "deal_analysis", "deal_drafts")
+
+
+def upgrade() -> None:
+    # NULL never matches a computed hash, so existing rows are recomputed once.
+    for table in _TABLES:
+        op.add_column(table, sa.Column("input_hash", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    for table in reversed(_TABLES):
+        op.drop_column(table, "input_hash")
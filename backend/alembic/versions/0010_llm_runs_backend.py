@@ -0,0 +1,26 @@
+"""add backend to llm_runs
+
+Revision ID: 0010_llm_runs_backend
+Revises: 0009_stage_input_hashes
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010_llm_runs_backend"
+down_revision = "0009_stage_input_hashes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NULL for runs recorded before multi-deployment routing.
+    op.add_column("llm_runs", sa.Column("backend", sa.String(length=128), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("llm_runs", "backend")
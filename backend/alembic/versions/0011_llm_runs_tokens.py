@@ -0,0 +1,28 @@
+"""add prompt_tokens and completion_tokens to llm_runs
+
+Revision ID: 0011_llm_runs_tokens
+Revises: 0010_llm_runs_backend
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011_llm_runs_tokens"
+down_revision = "0010_llm_runs_backend"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Older runs have no counts; per-deal usage treats them as zero.
+    op.add_column("llm_runs", sa.Column("prompt_tokens", sa.Integer(), nullable=True))
+    op.add_column("llm_runs", sa.Column("completion_tokens", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("llm_runs", "completion_tokens")
+    op.drop_column("llm_runs", "prompt_tokens")
@@ -0,0 +1,32 @@
+"""add updated_at to deal_analysis and deal_drafts
+
+Revision ID: 0012_results_updated_at
+Revises: 0011_llm_runs_tokens
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012_results_updated_at"
+down_revision = "0011_llm_runs_tokens"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("deal_analysis", "deal_drafts")
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.add_column(table, sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+        # Existing rows were last written when they were created.
+        op.execute(f"UPDATE {table} SET updated_at = created_at")
+        op.alter_column(table, "updated_at", nullable=False)
+
+
+def downgrade() -> None:
+    for table in reversed(_TABLES):
+        op.drop_column(table, "updated_at")
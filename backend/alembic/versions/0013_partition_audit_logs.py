@@ -0,0 +1,128 @@
+"""partition audit_logs by month; indexes for the audit query API
+
+Revision ID: 0013_partition_audit_logs
+Revises: 0012_results_updated_at
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013_partition_audit_logs"
+down_revision = "0012_results_updated_at"
+branch_labels = None
+depends_on = None
+
+# Later months are created by python -m backend.services.audit_partitions.
+_MONTHS_AHEAD = 3
+
+_INDEXES = """
+CREATE INDEX ix_audit_logs_deal_id_created_at ON audit_logs (deal_id, created_at, id);
+CREATE INDEX ix_audit_logs_actor_created_at ON audit_logs (actor, created_at, id);
+CREATE INDEX ix_audit_logs_action_created_at ON audit_logs (action, created_at, id);
+CREATE INDEX ix_audit_logs_created_at_brin ON audit_logs USING brin (created_at);
+"""
+
+
+def _add_months(month: dt.date, n: int) -> dt.date:
+    index = month.year * 12 + month.month - 1 + n
+    return dt.date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        # Declarative partitioning is Postgres-only; elsewhere just swap the indexes.
+        for column in ("actor", "action", "deal_id"):
+            op.drop_index(f"ix_audit_logs_{column}", table_name="audit_logs")
+        for column in ("deal_id", "actor", "action"):
+            op.create_index(f"ix_audit_logs_{column}_created_at", "audit_logs", [column, "created_at", "id"])
+        return
+
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned")
+    op.execute("ALTER INDEX audit_logs_pkey RENAME TO audit_logs_unpartitioned_pkey")
+    for column in ("actor", "action", "deal_id"):
+        op.execute(f"DROP INDEX ix_audit_logs_{column}")
+
+    # A partitioned table's primary key must include the partition key.
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY,
+            actor VARCHAR(256) NOT NULL,
+            action VARCHAR(128) NOT NULL,
+            deal_id VARCHAR(36),
+            metadata_json JSONB NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM audit_logs_unpartitioned")).scalar()
+    this_month = dt.datetime.now(dt.timezone.utc).date().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else this_month
+    last = _add_months(this_month, _MONTHS_AHEAD)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE audit_logs_{month:%Y_%m} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+
+    # Created on the parent, so every partition (present and future) gets them.
+    op.execute(_INDEXES)
+
+    op.execute(
+        "INSERT INTO audit_logs (id, actor, action, deal_id, metadata_json, created_at) "
+        "SELECT id, actor, action, deal_id, metadata_json, created_at FROM audit_logs_unpartitioned"
+    )
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('audit_logs', 'id'), "
+        "coalesce((SELECT max(id) FROM audit_logs), 0) + 1, false)"
+    )
+    op.execute("DROP TABLE audit_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        for column in ("action", "actor", "deal_id"):
+            op.drop_index(f"ix_audit_logs_{column}_created_at", table_name="audit_logs")
+        for column in ("actor", "action", "deal_id"):
+            op.create_index(f"ix_audit_logs_{column}", "audit_logs", [column])
+        return
+
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER INDEX audit_logs_pkey RENAME TO audit_logs_partitioned_pkey")
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id SERIAL PRIMARY KEY,
+            actor VARCHAR(256) NOT NULL,
+            action VARCHAR(128) NOT NULL,
+            deal_id VARCHAR(36),
+            metadata_json JSONB NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL
+        )
+        """
+    )
+    op.execute(
+        "INSERT INTO audit_logs (id, actor, action, deal_id, metadata_json, created_at) "
+        "SELECT id, actor, action, deal_id, metadata_json, created_at FROM audit_logs_partitioned"
+    )
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('audit_logs', 'id'), "
+        "coalesce((SELECT max(id) FROM audit_logs), 0) + 1, false)"
+    )
+    # Dropping the parent drops every partition and their indexes.
+    op.execute("DROP TABLE audit_logs_partitioned")
+    for column in ("actor", "action", "deal_id"):
+        op.create_index(f"ix_audit_logs_{column}", "audit_logs", [column])
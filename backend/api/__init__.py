@@ -2,5 +2,7 @@
 
 from .health import router as health_router
 from .deals import router as deals_router
+from .metrics import router as metrics_router
+from .audit import router as audit_router
 
-__all__ = ["health_router", "deals_router"]
+__all__ = ["health_router", "deals_router", "metrics_router", "audit_router"]
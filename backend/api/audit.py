@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import base64
+import datetime as dt
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from backend.db.session import get_db
+from backend.models import AuditLog
+from backend.services.audit import audit
+
+router = APIRouter(prefix="/audit", tags=["audit"])
+
+
+def _actor(request: Request) -> str:
+    return getattr(request.state, "actor", "anonymous")
+
+
+def _encode_cursor(row: AuditLog) -> str:
+    raw = json.dumps([row.created_at.isoformat(), row.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[dt.datetime, int]:
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return dt.datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _utc(value: dt.datetime | None) -> dt.datetime | None:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(dt.timezone.utc)
+
+
+@router.get("")
+def list_audit_entries(
+    request: Request,
+    deal_id: str | None = None,
+    actor: str | None = None,
+    action: str | None = None,
+    since: dt.datetime | None = Query(None, description="Inclusive lower bound on created_at"),
+    until: dt.datetime | None = Query(None, description="Exclusive upper bound on created_at"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_db),
+):
+    """Audit entries, newest first, filtered by deal, actor, action and time range.
+
+    Pages by keyset on ``(created_at, id)``: pass ``next_cursor`` back as ``cursor``
+    until it is null. Each filter column leads one of the ``audit_logs`` composite
+    indexes, and on Postgres a time range also prunes monthly partitions.
+    """
+    since, until = _utc(since), _utc(until)
+    q = db.query(AuditLog)
+    if deal_id is not None:
+        q = q.filter(AuditLog.deal_id == deal_id)
+    if actor is not None:
+        q = q.filter(AuditLog.actor == actor)
+    if action is not None:
+        q = q.filter(AuditLog.action == action)
+    if since is not None:
+        q = q.filter(AuditLog.created_at >= since)
+    if until is not None:
+        q = q.filter(AuditLog.created_at < until)
+    if cursor is not None:
+        created_at, row_id = _decode_cursor(cursor)
+        q = q.filter(
+            or_(
+                AuditLog.created_at < created_at,
+                and_(AuditLog.created_at == created_at, AuditLog.id < row_id),
+            )
+        )
+    rows = q.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(limit + 1).all()
+    page = rows[:limit]
+    # Built before the commit below, which expires the loaded rows.
+    result = {
+        "items": [
+            {
+                "id": row.id,
+                "actor": row.actor,
+                "action": row.action,
+                "deal_id": row.deal_id,
+                "metadata": row.metadata_json,
+                "created_at": row.created_at.isoformat(),
+            }
+            for row in page
+        ],
+        "next_cursor": _encode_cursor(page[-1]) if len(rows) > limit else None,
+    }
+
+    audit(
+        db,
+        actor=_actor(request),
+        action="audit_query",
+        deal_id=deal_id,
+        metadata={
+            "actor": actor,
+            "action": action,
+            "since": since.isoformat() if since else None,
+            "until": until.isoformat() if until else None,
+            "returned": len(page),
+        },
+    )
+    db.commit()
+    return result
@@ -1,14 +1,26 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+import asyncio
+import json
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Awaitable, Callable, TypeVar
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
 from fastapi.concurrency import run_in_threadpool
-from fastapi.responses import Response
-from sqlalchemy.orm import Session
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session, undefer_group
 
+from backend.core import tracing
 from backend.core.config import settings
+from backend.core.metrics import stage
 from backend.db.session import get_db
-from backend.llm import get_llm_client
-from backend.models import Deal, DealAnalysis, DealDraft, DealTerms, Document, LLMRun
+from backend.db.upsert import upsert
+from backend.llm import LLMCall, Priority, get_llm_client, last_call
+from backend.llm.tokens import MESSAGE_OVERHEAD_TOKENS, count_tokens, prompt_budget, token_cost_usd
+from backend.models import Deal, DealAnalysis, DealDraft, DealTerms, Document, DocumentExtraction, LLMRun, UploadSession
+from backend.models.document import PROMPT_COLUMNS
 from backend.schemas import (
     AnalysisResponse,
     DealCreate,
@@ -17,19 +29,50 @@ from backend.schemas import (
     ExtractedTerms,
     ICDraft,
     TermsUpdate,
+    UploadSessionCreate,
 )
 from backend.services.analysis import analyze
 from backend.services.audit import audit
+from backend.services.citations import get_citation_index, resolve_citations
+from backend.services.events import format_sse, get_event_bus, publish, token_progress
 from backend.services.export_pdf import build_export_pdf
-from backend.services.prompts import ensure_prompt_version, load_prompt_template
+from backend.services.prompts import (
+    assemble_deal_text,
+    ensure_prompt_segment,
+    ensure_prompt_version,
+    load_prompt_template,
+    render_prompt,
+    set_prompt_segment,
+)
 from backend.services.redaction import redact, redact_obj
-from backend.services.text_extraction import extract_text
-from backend.storage.local import LocalStorage
+from backend.services.pipeline import (
+    BLOCKED,
+    RAN,
+    SKIPPED,
+    STAGES,
+    StageOutcome,
+    analysis_input_hash,
+    draft_input_hash,
+    export_input_hash,
+    extract_input_hash,
+)
+from backend.services.singleflight import coalesce
+from backend.services.term_merge import merge_terms
+from backend.services.upload_hashes import RUNNING_HASHES
+from backend.services.extraction_pool import get_extraction_pool
+from backend.storage import StorageClient, get_storage
 from backend.utils.hashing import sha256_bytes, sha256_text
-from backend.utils.sanitize import sanitize_text
+from backend.utils.http_headers import content_disposition
+from backend.utils.http_range import RangeNotSatisfiable, parse_range
+from backend.utils.time import now_utc
 
 router = APIRouter(prefix="/deals", tags=["deals"])
 
+T = TypeVar("T")
+
+# Set on extract/analyze/draft responses: "ran" or "skipped" (inputs unchanged).
+STAGE_STATUS_HEADER = "X-Stage-Status"
+
 
 def _actor(request: Request) -> str:
     return getattr(request.state, "actor", "anonymous")
@@ -42,8 +85,8 @@ def _get_deal(db: Session, deal_id: str) -> Deal:
     return deal
 
 
-def _storage() -> LocalStorage:
-    return LocalStorage(root=settings.storage_root)
+def _storage() -> StorageClient:
+    return get_storage()
 
 
 @router.post("", response_model=DealOut)
@@ -73,6 +116,13 @@ def deal_detail(deal_id: str, db: Session = Depends(get_db)):
     analysis = db.query(DealAnalysis).filter(DealAnalysis.deal_id == deal_id).one_or_none()
     draft = db.query(DealDraft).filter(DealDraft.deal_id == deal_id).one_or_none()
 
+    citation_spans = None
+    if terms:
+        citation_spans = terms.citation_spans_json
+        if citation_spans is None:
+            # Terms saved before spans were stored; resolving is cheap, so do it on read.
+            citation_spans = _citation_spans(docs, terms.citations_json)
+
     return {
         "deal": {"id": deal.id, "name": deal.name, "created_at": deal.created_at.isoformat()},
         "documents": [
@@ -83,12 +133,14 @@ def deal_detail(deal_id: str, db: Session = Depends(get_db)):
                 "content_type": d.content_type,
                 "size_bytes": d.size_bytes,
                 "sha256": d.sha256,
+                "extraction_status": d.extraction_status,
                 "created_at": d.created_at.isoformat(),
             }
             for d in docs
         ],
         "terms": terms.terms_json if terms else None,
         "citations": terms.citations_json if terms else None,
+        "citation_spans": citation_spans,
         "confirmed_fields": terms.confirmed_fields_json if terms else None,
         "analysis": {
             "metrics": analysis.metrics_json,
@@ -102,6 +154,77 @@ def deal_detail(deal_id: str, db: Session = Depends(get_db)):
     }
 
 
+@router.get("/{deal_id}/usage")
+def llm_usage(deal_id: str, db: Session = Depends(get_db)):
+    """Tokens spent on a deal's LLM runs, by prompt and backend, with cost at current prices."""
+    _get_deal(db, deal_id)
+    rows = (
+        db.query(
+            LLMRun.prompt_name,
+            LLMRun.backend,
+            func.count(LLMRun.id),
+            func.coalesce(func.sum(LLMRun.prompt_tokens), 0),
+            func.coalesce(func.sum(LLMRun.completion_tokens), 0),
+        )
+        .filter(LLMRun.deal_id == deal_id)
+        .group_by(LLMRun.prompt_name, LLMRun.backend)
+        .order_by(LLMRun.prompt_name, LLMRun.backend)
+        .all()
+    )
+    by_prompt = [
+        {
+            "prompt_name": prompt_name,
+            "backend": backend,
+            "runs": runs,
+            "prompt_tokens": int(prompt_tokens),
+            "completion_tokens": int(completion_tokens),
+            "cost_usd": token_cost_usd(int(prompt_tokens), int(completion_tokens)),
+        }
+        for prompt_name, backend, runs, prompt_tokens, completion_tokens in rows
+    ]
+    prompt_total = sum(r["prompt_tokens"] for r in by_prompt)
+    completion_total = sum(r["completion_tokens"] for r in by_prompt)
+    return {
+        "runs": sum(r["runs"] for r in by_prompt),
+        "prompt_tokens": prompt_total,
+        "completion_tokens": completion_total,
+        "cost_usd": token_cost_usd(prompt_total, completion_total),
+        "by_prompt": by_prompt,
+    }
+
+
+@router.get("/{deal_id}/events")
+async def deal_events(deal_id: str, request: Request, db: Session = Depends(get_db)):
+    """Server-sent events for one deal: stage transitions, uploads and LLM progress.
+
+    Events are notifications only (no replay); a client that connects or reconnects
+    should read deal_detail once and then apply events. A comment line is sent every
+    ``events_heartbeat_seconds`` so proxies keep the connection open.
+    """
+    _get_deal(db, deal_id)
+    # Do not hold a pooled connection for the life of the stream.
+    db.close()
+    bus = get_event_bus()
+
+    async def stream():
+        async with bus.subscribe(deal_id) as sub:
+            yield "retry: 3000\n\n"
+            event_id = 0
+            while not await request.is_disconnected():
+                event = await sub.get(timeout=settings.events_heartbeat_seconds)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                event_id += 1
+                yield format_sse(event, event_id)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{deal_id}/documents", response_model=list[DocumentOut])
 def list_documents(deal_id: str, db: Session = Depends(get_db)):
     _get_deal(db, deal_id)
@@ -114,12 +237,196 @@ def list_documents(deal_id: str, db: Session = Depends(get_db)):
             content_type=d.content_type,
             size_bytes=d.size_bytes,
             sha256=d.sha256,
+            extraction_status=d.extraction_status,
             created_at=d.created_at.isoformat(),
         )
         for d in docs
     ]
 
 
+@router.get("/{deal_id}/documents/{document_id}/content")
+def download_document(deal_id: str, document_id: int, request: Request, db: Session = Depends(get_db)):
+    """Stream a stored document, honouring single ``Range`` requests (e.g. PDF preview)."""
+    doc = db.query(Document).filter(Document.deal_id == deal_id, Document.id == document_id).one_or_none()
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    storage = _storage()
+    path = doc.storage_path
+    try:
+        size = storage.size(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Document content missing from storage")
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{doc.sha256}"',
+        "Content-Disposition": content_disposition("inline", doc.filename),
+    }
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != headers["ETag"]:
+        range_header = None
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+
+    start, end = byte_range or (0, size)
+    audit(
+        db,
+        actor=_actor(request),
+        action="download_doc",
+        deal_id=deal_id,
+        metadata={"document_id": doc.id, "range": [start, end] if byte_range else None},
+    )
+    db.commit()
+
+    headers["Content-Length"] = str(end - start)
+    status_code = 200
+    if byte_range:
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+
+    return StreamingResponse(
+        storage.iter_range(path, start, end),
+        status_code=status_code,
+        media_type=doc.content_type or "application/octet-stream",
+        headers=headers,
+    )
+
+
+_SUPPORTED_SUFFIXES = {"pdf", "docx", "txt"}
+
+
+def _document_suffix(filename: str | None) -> str:
+    if not filename:
+        raise HTTPException(status_code=400, detail="Missing filename")
+    suffix = filename.lower().rsplit(".", 1)[-1]
+    if suffix not in _SUPPORTED_SUFFIXES:
+        raise HTTPException(status_code=400, detail="Unsupported file type. Use PDF/DOCX/TXT.")
+    return suffix
+
+
+async def _prepare_document(
+    *,
+    deal_id: str,
+    filename: str,
+    content_type: str | None,
+    suffix: str,
+    raw: bytes | Path,
+    sha256: str,
+    path: Path | str,
+) -> Document:
+    """Extract and redact an already-stored file into an unsaved Document.
+
+    ``raw`` is the file's bytes, or a local copy of it that the extraction worker reads.
+    """
+    with stage("upload_document", "parse"):
+        # Parse in a sandboxed worker so a pathological file cannot stall this process.
+        extraction = await run_in_threadpool(get_extraction_pool().extract, raw, suffix)
+    # Store redacted extracted text (MVP). TODO: store raw text encrypted-at-rest.
+    with stage("upload_document", "redact"):
+        redacted_text = await run_in_threadpool(redact, extraction.text)
+
+    doc = Document(
+        deal_id=deal_id,
+        filename=filename,
+        content_type=content_type,
+        size_bytes=raw.stat().st_size if isinstance(raw, Path) else len(raw),
+        storage_path=str(path),
+        sha256=sha256,
+        extracted_text=redacted_text,
+        extraction_status=extraction.status,
+        metadata_json={
+            "suffix": suffix,
+            "extraction": {"pages": len(extraction.pages), "elapsed_ms": round(extraction.elapsed_ms, 1), "error": extraction.error},
+        },
+    )
+    # Prompt-ready segment, built once here so extraction runs only join segments.
+    with stage("upload_document", "segment"):
+        # PDF pages are kept separate so citations can be mapped back to a page number.
+        await run_in_threadpool(set_prompt_segment, doc, extraction.pages if suffix == "pdf" else extraction.text)
+        await run_in_threadpool(get_citation_index, doc)
+    return doc
+
+
+def _audit_upload(db: Session, request: Request, doc: Document, extra: dict | None = None) -> None:
+    audit(
+        db,
+        actor=_actor(request),
+        action="upload_doc",
+        deal_id=doc.deal_id,
+        metadata={
+            "filename": doc.filename,
+            "sha256": doc.sha256,
+            "content_type": doc.content_type,
+            "size_bytes": doc.size_bytes,
+            "extraction_status": doc.extraction_status,
+            **(extra or {}),
+        },
+    )
+
+
+async def _ingest_document(
+    db: Session,
+    request: Request,
+    *,
+    storage: StorageClient,
+    deal_id: str,
+    filename: str,
+    content_type: str | None,
+    suffix: str,
+    raw: bytes | Path,
+    sha256: str,
+    path: Path | str,
+    audit_extra: dict | None = None,
+    before_commit: Callable[[Document], None] | None = None,
+) -> Document:
+    """Extract, redact and record an already-stored file. Releases ``path`` on failure.
+
+    ``before_commit`` runs after the document row is flushed (so it has an id), inside
+    the same transaction.
+    """
+    try:
+        doc = await _prepare_document(
+            deal_id=deal_id,
+            filename=filename,
+            content_type=content_type,
+            suffix=suffix,
+            raw=raw,
+            sha256=sha256,
+            path=path,
+        )
+        db.add(doc)
+        if before_commit is not None:
+            db.flush()
+            before_commit(doc)
+        _audit_upload(db, request, doc, audit_extra)
+
+        with stage("upload_document", "db_commit"):
+            db.commit()
+            db.refresh(doc)
+    except Exception:
+        db.rollback()
+        storage.release(path)
+        raise
+    publish(deal_id, "document", **_document_response(doc))
+    return doc
+
+
+def _document_response(doc: Document) -> dict:
+    return {
+        "document_id": doc.id,
+        "filename": doc.filename,
+        "sha256": doc.sha256,
+        "content_type": doc.content_type,
+        "size_bytes": doc.size_bytes,
+        "extraction_status": doc.extraction_status,
+    }
+
+
 @router.post("/{deal_id}/documents")
 async def upload_document(
     deal_id: str,
@@ -132,138 +439,619 @@ async def upload_document(
     if not deal:
         raise HTTPException(status_code=404, detail="Deal not found")
 
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="Missing filename")
-
-    suffix = file.filename.lower().rsplit(".", 1)[-1]
-    if suffix not in {"pdf", "docx", "txt"}:
-        raise HTTPException(status_code=400, detail="Unsupported file type. Use PDF/DOCX/TXT.")
+    suffix = _document_suffix(file.filename)
 
-    raw = await file.read()
+    with stage("upload_document", "read"):
+        raw = await file.read()
     if len(raw) > 100 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="File too large (max 100MB)")
+        raise HTTPException(status_code=400, detail="File too large (max 100MB); use /uploads for larger files")
 
-    sha256 = sha256_bytes(raw)
+    with stage("upload_document", "hash"):
+        sha256 = sha256_bytes(raw)
 
-    try:
-        storage = _storage()
+    storage = _storage()
+    with stage("upload_document", "storage"):
         path = await run_in_threadpool(storage.save, deal_id, file.filename, raw)
-        extracted_text = await run_in_threadpool(extract_text, path)
-        # Store redacted extracted text (MVP). TODO: store raw text encrypted-at-rest.
-        redacted_text = await run_in_threadpool(redact, extracted_text)
 
-        doc = Document(
-            deal_id=deal_id,
-            filename=file.filename,
-            content_type=file.content_type,
-            size_bytes=len(raw),
-            storage_path=str(path),
-            sha256=sha256,
-            extracted_text=redacted_text,
-            metadata_json={
-                "suffix": suffix,
-            },
-        )
-        db.add(doc)
+    doc = await _ingest_document(
+        db,
+        request,
+        storage=storage,
+        deal_id=deal_id,
+        filename=file.filename,
+        content_type=file.content_type,
+        suffix=suffix,
+        raw=raw,
+        sha256=sha256,
+        path=path,
+    )
+    return _document_response(doc)
 
-        audit(
-            db,
-            actor=_actor(request),
-            action="upload_doc",
-            deal_id=deal_id,
-            metadata={"filename": file.filename, "sha256": sha256, "content_type": file.content_type, "size_bytes": len(raw)},
-        )
 
-        db.commit()
-        db.refresh(doc)
+@router.post("/{deal_id}/documents/batch")
+async def upload_documents_batch(
+    deal_id: str,
+    request: Request,
+    files: list[UploadFile] = File(...),
+    db: Session = Depends(get_db),
+):
+    """Ingest many files at once; each file gets its own status in the response.
+
+    Files are stored and extracted concurrently (at most ``upload_batch_concurrency`` at
+    a time, and extraction is further bounded by the worker pool). All documents and
+    their audit rows are then written in a single transaction.
+    """
+    _get_deal(db, deal_id)
+    if len(files) > settings.upload_batch_max_files:
+        raise HTTPException(status_code=400, detail=f"Too many files (max {settings.upload_batch_max_files})")
+
+    storage = _storage()
+    sem = asyncio.Semaphore(max(1, settings.upload_batch_concurrency))
+    results: list[dict] = [{"filename": f.filename, "status": "pending"} for f in files]
+    prepared: list[tuple[int, Document]] = []
+
+    async def process(index: int, file: UploadFile) -> None:
+        result = results[index]
+        try:
+            suffix = _document_suffix(file.filename)
+        except HTTPException as exc:
+            result.update(status="error", error=exc.detail)
+            return
+        async with sem:
+            raw = await file.read()
+            if len(raw) > 100 * 1024 * 1024:
+                result.update(status="error", error="File too large (max 100MB)")
+                return
+            sha256 = await run_in_threadpool(sha256_bytes, raw)
+            path = None
+            try:
+                with stage("upload_document", "storage"):
+                    path = await run_in_threadpool(storage.save, deal_id, file.filename, raw)
+                doc = await _prepare_document(
+                    deal_id=deal_id,
+                    filename=file.filename,
+                    content_type=file.content_type,
+                    suffix=suffix,
+                    raw=raw,
+                    sha256=sha256,
+                    path=path,
+                )
+            except Exception as exc:
+                if path is not None:
+                    storage.release(path)
+                result.update(status="error", error=f"{type(exc).__name__}: {exc}")
+                return
+        prepared.append((index, doc))
+        publish(deal_id, "upload", filename=file.filename, status="extracted", completed=len(prepared), total=len(files))
+
+    await asyncio.gather(*(process(i, f) for i, f in enumerate(files)))
+
+    try:
+        db.add_all(doc for _, doc in prepared)
+        for _, doc in prepared:
+            _audit_upload(db, request, doc, {"batch_size": len(files)})
+        with stage("upload_document", "db_commit"):
+            db.flush()
+            # Build responses before commit expires the rows, to avoid a reload per document.
+            for index, doc in prepared:
+                results[index] = {**_document_response(doc), "status": "ok"}
+            db.commit()
     except Exception:
         db.rollback()
+        for _, doc in prepared:
+            storage.release(doc.storage_path)
         raise
+    for index, _ in prepared:
+        publish(deal_id, "document", **results[index])
 
     return {
-        "document_id": doc.id,
-        "filename": doc.filename,
-        "sha256": doc.sha256,
-        "content_type": doc.content_type,
-        "size_bytes": doc.size_bytes,
+        "results": results,
+        "created": len(prepared),
+        "failed": len(files) - len(prepared),
     }
 
 
-@router.post("/{deal_id}/extract")
-async def extract_terms(deal_id: str, request: Request, db: Session = Depends(get_db)):
+# Resumable uploads: create a session, PUT chunks at increasing offsets (retrying a chunk
+# is safe), GET progress to resume after a failure, then POST .../complete.
+
+
+def _get_upload(db: Session, deal_id: str, upload_id: str, *, for_update: bool = False) -> UploadSession:
+    query = db.query(UploadSession).filter(UploadSession.id == upload_id, UploadSession.deal_id == deal_id)
+    if for_update:
+        query = query.with_for_update()
+    session = query.one_or_none()
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return session
+
+
+def _upload_state(session: UploadSession) -> dict:
+    return {
+        "upload_id": session.id,
+        "filename": session.filename,
+        "size_bytes": session.size_bytes,
+        "chunk_size": session.chunk_size,
+        "received_bytes": session.received_bytes,
+        "next_offset": session.received_bytes,
+        "status": session.status,
+        "document_id": session.document_id,
+    }
+
+
+@router.post("/{deal_id}/uploads", status_code=201)
+def create_upload(deal_id: str, payload: UploadSessionCreate, request: Request, db: Session = Depends(get_db)):
     _get_deal(db, deal_id)
+    _document_suffix(payload.filename)
+    if payload.size_bytes > settings.upload_max_bytes:
+        raise HTTPException(status_code=400, detail=f"File too large (max {settings.upload_max_bytes} bytes)")
+
+    chunk_size = settings.upload_chunk_size_bytes
+    session = UploadSession(
+        deal_id=deal_id,
+        filename=payload.filename,
+        content_type=payload.content_type,
+        size_bytes=payload.size_bytes,
+        chunk_size=chunk_size,
+        received_bytes=0,
+        expected_sha256=payload.sha256.lower() if payload.sha256 else None,
+        storage_state=_storage().begin_upload(chunk_size),
+        status="open",
+    )
+    db.add(session)
+    db.commit()
+    return _upload_state(session)
 
-    docs = db.query(Document).filter(Document.deal_id == deal_id).all()
-    if not docs:
-        raise HTTPException(status_code=400, detail="No documents uploaded")
 
-    combined = "\n\n".join([f"--- {d.filename} ---\n{d.extracted_text}" for d in docs])
-    combined = sanitize_text(combined)
+@router.get("/{deal_id}/uploads/{upload_id}")
+def upload_progress(deal_id: str, upload_id: str, db: Session = Depends(get_db)):
+    return _upload_state(_get_upload(db, deal_id, upload_id))
 
-    prompt_name = "extract_terms"
-    prompt_version = "v1"
-    template = load_prompt_template(prompt_name, prompt_version)
-    prompt = template.format(deal_text=combined)
 
-    llm = get_llm_client()
+async def _read_body(request: Request, *, limit: int) -> bytes:
+    """The request body, or 413 as soon as it is known to exceed ``limit`` bytes."""
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        raise HTTPException(status_code=413, detail=f"Chunk larger than {limit} bytes")
+    body = bytearray()
+    async for piece in request.stream():
+        body += piece
+        if len(body) > limit:
+            raise HTTPException(status_code=413, detail=f"Chunk larger than {limit} bytes")
+    return bytes(body)
+
+
+@router.put("/{deal_id}/uploads/{upload_id}")
+async def upload_chunk(
+    deal_id: str,
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    db: Session = Depends(get_db),
+):
+    chunk_size = (
+        db.query(UploadSession.chunk_size)
+        .filter(UploadSession.id == upload_id, UploadSession.deal_id == deal_id)
+        .scalar()
+    )
+    if chunk_size is None:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    # Hold no transaction (or pooled connection) while a slow client sends the chunk.
+    db.rollback()
+    data = await _read_body(request, limit=chunk_size)
+
+    session = _get_upload(db, deal_id, upload_id, for_update=True)
+    if session.status != "open":
+        raise HTTPException(status_code=409, detail=f"Upload is {session.status}")
+
+    end = offset + len(data)
+    if offset < session.received_bytes and end <= session.received_bytes:
+        # A retried chunk we already have (the response to the first attempt was lost).
+        return _upload_state(session)
+    if offset != session.received_bytes:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Unexpected offset", "expected_offset": session.received_bytes},
+        )
+    if not data or end > session.size_bytes:
+        raise HTTPException(status_code=400, detail="Chunk is empty or runs past the declared size")
+    if end < session.size_bytes and len(data) != session.chunk_size:
+        raise HTTPException(status_code=400, detail=f"Chunks must be {session.chunk_size} bytes except the last")
 
-    # Redaction before LLM call (already redacted docs, but keep the belt-and-suspenders approach)
-    prompt_for_llm = redact(prompt)
+    storage = _storage()
 
-    output = await llm.complete_json(prompt=prompt_for_llm, schema_name="ExtractedTerms")
+    def _write() -> dict:
+        state = storage.upload_part(dict(session.storage_state), offset, data)
+        RUNNING_HASHES.update(session.id, offset, data)
+        return state
 
-    # Validate and redact output before persistence
-    parsed = ExtractedTerms.model_validate(output)
-    redacted_output = redact_obj(parsed.model_dump())
+    session.storage_state = await run_in_threadpool(_write)
+    session.received_bytes = end
+    session.updated_at = now_utc()
+    db.commit()
+    publish(
+        deal_id,
+        "upload",
+        upload_id=session.id,
+        filename=session.filename,
+        received_bytes=session.received_bytes,
+        size_bytes=session.size_bytes,
+    )
+    return _upload_state(session)
+
+
+@router.post("/{deal_id}/uploads/{upload_id}/complete")
+async def complete_upload(deal_id: str, upload_id: str, request: Request, db: Session = Depends(get_db)):
+    session = _get_upload(db, deal_id, upload_id, for_update=True)
+    if session.status == "completed" and session.document_id is not None:
+        doc = db.get(Document, session.document_id)
+        if doc:
+            return _document_response(doc)
+    if session.status != "open":
+        raise HTTPException(status_code=409, detail=f"Upload is {session.status}")
+    if session.received_bytes != session.size_bytes:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Upload incomplete", "expected_offset": session.received_bytes},
+        )
+
+    storage = _storage()
+    suffix = _document_suffix(session.filename)
+    digest = RUNNING_HASHES.digest(session.id, session.size_bytes)
+    with stage("upload_document", "storage"):
+        path, sha256 = await run_in_threadpool(
+            storage.complete_upload, dict(session.storage_state), deal_id, session.filename, digest
+        )
+    RUNNING_HASHES.discard(session.id)
+
+    if session.expected_sha256 and sha256 != session.expected_sha256:
+        storage.release(path)
+        session.status = "aborted"
+        session.updated_at = now_utc()
+        db.commit()
+        raise HTTPException(status_code=422, detail="sha256 mismatch; upload discarded")
 
-    pv = ensure_prompt_version(db, name=prompt_name, version=prompt_version, content=template)
+    def _mark_completed(doc: Document) -> None:
+        # Same transaction as the document row, so a retried complete finds it.
+        session.status = "completed"
+        session.document_id = doc.id
+        session.updated_at = now_utc()
 
-    existing = db.query(DealTerms).filter(DealTerms.deal_id == deal_id).one_or_none()
-    if existing:
-        existing.terms_json = redacted_output
-        existing.citations_json = redacted_output.get("citations", {})
-    else:
-        db.add(
-            DealTerms(
+    try:
+        # Up to UPLOAD_MAX_BYTES: the extraction worker reads the file from disk rather
+        # than this process loading it (object stores stream it to a temp file first).
+        with ExitStack() as stack:
+            with stage("upload_document", "read"):
+                local = await run_in_threadpool(stack.enter_context, storage.local_copy(path))
+            doc = await _ingest_document(
+                db,
+                request,
+                storage=storage,
                 deal_id=deal_id,
-                terms_json=redacted_output,
-                citations_json=redacted_output.get("citations", {}),
-                confirmed_fields_json={},
+                filename=session.filename,
+                content_type=session.content_type,
+                suffix=suffix,
+                raw=local,
+                sha256=sha256,
+                path=path,
+                audit_extra={"upload_id": session.id},
+                before_commit=_mark_completed,
             )
+    except Exception:
+        # The staged parts were consumed by complete_upload; the client must start over.
+        session = _get_upload(db, deal_id, upload_id)
+        session.status = "aborted"
+        session.updated_at = now_utc()
+        db.commit()
+        raise
+
+    return _document_response(doc)
+
+
+@router.delete("/{deal_id}/uploads/{upload_id}", status_code=204)
+def abort_upload(deal_id: str, upload_id: str, db: Session = Depends(get_db)):
+    session = _get_upload(db, deal_id, upload_id, for_update=True)
+    if session.status == "open":
+        _storage().abort_upload(dict(session.storage_state))
+        RUNNING_HASHES.discard(session.id)
+        session.status = "aborted"
+        session.updated_at = now_utc()
+        db.commit()
+    return Response(status_code=204)
+
+
+def _citation_spans(docs: list[Document], citations: dict | None) -> dict:
+    """Resolve citation snippets to document/page/offset spans within the docs' segments."""
+    for doc in docs:
+        ensure_prompt_segment(doc)
+    return resolve_citations(docs, citations or {})
+
+
+async def _run_stage(deal_id: str, name: str, run: Callable[[], Awaitable[tuple[T, StageOutcome]]]) -> tuple[T, StageOutcome]:
+    """Run one pipeline stage and publish how it ended on the deal's event stream."""
+    try:
+        result, outcome = await run()
+    except HTTPException as exc:
+        publish(deal_id, "stage", stage=name, status=BLOCKED, reason=str(exc.detail))
+        raise
+    except Exception as exc:
+        publish(deal_id, "stage", stage=name, status="failed", reason=type(exc).__name__)
+        raise
+    publish(deal_id, "stage", **outcome.as_dict())
+    return result, outcome
+
+
+async def _extract_document(
+    llm, template: str, doc: Document, priority: Priority
+) -> tuple[str, dict, dict, LLMCall | None]:
+    """One document through the extraction prompt: (prompt, redacted output, assembly stats, call)."""
+    # Whatever the template itself takes is not available to the deal text.
+    budget = prompt_budget("ExtractedTerms") - count_tokens(render_prompt(template, deal_text=""))
+    text, assembly = assemble_deal_text([doc], max_tokens=budget)
+    prompt = render_prompt(template, deal_text=text)
+    output = await llm.complete_json(
+        prompt=prompt,
+        schema_name="ExtractedTerms",
+        on_progress=token_progress(doc.deal_id, "extract", document_id=doc.id),
+        priority=priority,
+    )
+    # Validate and redact output before persistence
+    parsed = ExtractedTerms.model_validate(output)
+    return prompt, redact_obj(parsed.model_dump()), assembly, last_call()
+
+
+def _usage_columns(call: LLMCall | None, prompt: str, output: dict) -> dict:
+    """LLMRun backend/token columns; local counts stand in for usage the provider did not report."""
+    prompt_tokens = call.prompt_tokens if call else None
+    completion_tokens = call.completion_tokens if call else None
+    return {
+        "backend": call.backend if call else None,
+        "prompt_tokens": prompt_tokens if prompt_tokens is not None else count_tokens(prompt) + MESSAGE_OVERHEAD_TOKENS,
+        "completion_tokens": completion_tokens if completion_tokens is not None else count_tokens(json.dumps(output)),
+    }
+
+
+async def _run_extract(
+    db: Session, request: Request, deal_id: str, *, force: bool = False, priority: Priority = Priority.interactive
+) -> tuple[dict, StageOutcome]:
+    with stage("extract_terms", "load"):
+        _get_deal(db, deal_id)
+        docs = (
+            db.query(Document)
+            .options(undefer_group(PROMPT_COLUMNS))
+            .filter(Document.deal_id == deal_id)
+            .order_by(Document.created_at, Document.id)
+            .all()
         )
+    if not docs:
+        raise HTTPException(status_code=400, detail="No documents uploaded")
 
-    db.add(
-        LLMRun(
-            deal_id=deal_id,
+    prompt_name = "extract_terms"
+    prompt_version = "v1"
+    template = load_prompt_template(prompt_name, prompt_version)
+    model = settings.llm_model
+
+    with stage("extract_terms", "assemble"):
+        # Segments are sanitized and redacted at ingestion under REDACTION_RULES_VERSION;
+        # only those built under older rules (or never built) are re-redacted here.
+        for doc in docs:
+            ensure_prompt_segment(doc)
+        input_hash = extract_input_hash(docs, prompt=f"{prompt_name}:{prompt_version}:{sha256_text(template)}", model=model)
+
+        existing = db.query(DealTerms).filter(DealTerms.deal_id == deal_id).one_or_none()
+        if not force and existing is not None and existing.input_hash == input_hash:
+            # Same documents, prompt and model as the stored terms: nothing to do. Persist
+            # any lazily rebuilt segments, but write no terms, runs or audit rows.
+            db.commit()
+            return existing.terms_json, StageOutcome("extract", SKIPPED, input_hash, "inputs unchanged")
+
+    key = (deal_id, "extract", input_hash, force)
+
+    def recheck() -> tuple[dict, StageOutcome] | None:
+        # Another worker may have finished the same extraction while we waited.
+        if force:
+            return None
+        # Column query: reads the committed row rather than this session's cached copy.
+        row = db.query(DealTerms.input_hash, DealTerms.terms_json).filter(DealTerms.deal_id == deal_id).one_or_none()
+        if row is not None and row.input_hash == input_hash:
+            return row.terms_json, StageOutcome("extract", SKIPPED, input_hash, "completed by a concurrent request")
+        return None
+
+    return await coalesce(
+        db,
+        key,
+        lambda: _extract_and_store(
+            db,
+            request,
+            deal_id,
+            docs,
             prompt_name=prompt_name,
             prompt_version=prompt_version,
-            model=settings.llm_model,
-            temperature=settings.llm_temperature,
-            input_hash=sha256_text(prompt_for_llm),
-            output_json=redacted_output,
+            template=template,
+            input_hash=input_hash,
+            force=force,
+            priority=priority,
+        ),
+        recheck=recheck,
+        on_shared=lambda result: (result[0], StageOutcome("extract", SKIPPED, input_hash, "coalesced with an in-flight request")),
+    )
+
+
+async def _extract_and_store(
+    db: Session,
+    request: Request,
+    deal_id: str,
+    docs: list[Document],
+    *,
+    prompt_name: str,
+    prompt_version: str,
+    template: str,
+    input_hash: str,
+    force: bool,
+    priority: Priority,
+) -> tuple[dict, StageOutcome]:
+    """The LLM half of extract: send uncached documents, merge, and store the terms."""
+    model = settings.llm_model
+
+    with stage("extract_terms", "assemble"):
+        # Per-document results are cached by segment hash + prompt + model, so only new
+        # or changed documents are sent to the LLM.
+        cached: dict[str, dict] = {}
+        if not force:
+            rows = (
+                db.query(DocumentExtraction)
+                .filter(
+                    DocumentExtraction.segment_sha256.in_({d.segment_sha256 for d in docs}),
+                    DocumentExtraction.prompt_name == prompt_name,
+                    DocumentExtraction.prompt_version == prompt_version,
+                    DocumentExtraction.model == model,
+                )
+                .all()
+            )
+            cached = {row.segment_sha256: row.output_json for row in rows}
+        pending = list({d.segment_sha256: d for d in docs if d.segment_sha256 not in cached}.values())
+        tracing.set_attribute("extract.documents_pending", len(pending))
+
+    publish(deal_id, "stage", stage="extract", status="started", documents=len(pending))
+    llm = get_llm_client()
+    limit = asyncio.Semaphore(max(1, settings.extract_concurrency))
+    done = 0
+
+    async def run(doc: Document) -> tuple[str, dict, dict, LLMCall | None]:
+        nonlocal done
+        async with limit:
+            result = await _extract_document(llm, template, doc, priority)
+        done += 1
+        publish(deal_id, "llm", stage="extract", document_id=doc.id, completed=done, total=len(pending))
+        return result
+
+    with stage("extract_terms", "llm"):
+        outcomes = await asyncio.gather(*(run(d) for d in pending), return_exceptions=True)
+    failures = [o for o in outcomes if isinstance(o, BaseException)]
+    results = [o for o in outcomes if not isinstance(o, BaseException)]
+
+    with stage("extract_terms", "merge"):
+        ensure_prompt_version(db, name=prompt_name, version=prompt_version, content=template)
+        for doc, outcome in zip(pending, outcomes):
+            if isinstance(outcome, BaseException):
+                continue
+            prompt, output, _, call = outcome
+            # The cache is shared across deals, so another deal may be writing the same key.
+            upsert(
+                db,
+                DocumentExtraction,
+                key={
+                    "segment_sha256": doc.segment_sha256,
+                    "prompt_name": prompt_name,
+                    "prompt_version": prompt_version,
+                    "model": model,
+                },
+                values={"output_json": output},
+                insert_only={"document_sha256": doc.sha256},
+            )
+            db.add(
+                LLMRun(
+                    deal_id=deal_id,
+                    prompt_name=prompt_name,
+                    prompt_version=prompt_version,
+                    model=model,
+                    temperature=settings.llm_temperature,
+                    input_hash=sha256_text(prompt),
+                    output_json=output,
+                    **_usage_columns(call, prompt, output),
+                )
+            )
+            cached[doc.segment_sha256] = output
+
+        if failures:
+            # Every successful call was paid for: keep those results for the retry, then
+            # fail the stage with the first error.
+            db.commit()
+            raise failures[0]
+
+        existing = db.query(DealTerms).filter(DealTerms.deal_id == deal_id).one_or_none()
+        redacted_output = merge_terms(
+            [cached[d.segment_sha256] for d in docs],
+            existing=existing.terms_json if existing else None,
+            confirmed=existing.confirmed_fields_json if existing else None,
         )
+
+    with stage("extract_terms", "cite"):
+        citation_spans = _citation_spans(docs, redacted_output.get("citations", {}))
+
+    # Confirmations are left as stored, including any made while the LLM was running.
+    upsert(
+        db,
+        DealTerms,
+        key={"deal_id": deal_id},
+        values={
+            "terms_json": redacted_output,
+            "citations_json": redacted_output.get("citations", {}),
+            "citation_spans_json": citation_spans,
+            "input_hash": input_hash,
+        },
+        insert_only={"confirmed_fields_json": {}},
+    )
+
+    deal_text_chars = sum(assembly["deal_text_chars"] for _, _, assembly, _ in results)
+    tracing.set_attribute("prompt.deal_text_chars", deal_text_chars)
+    audit(
+        db,
+        actor=_actor(request),
+        action="extract",
+        deal_id=deal_id,
+        metadata={
+            "prompt": f"{prompt_name}:{prompt_version}",
+            "documents": len(docs),
+            "extracted_document_ids": [d.id for d in pending],
+            "cached_documents": len(docs) - len(pending),
+            "deal_text": {"deal_text_chars": deal_text_chars, "modes": sorted({a["mode"] for _, _, a, _ in results})},
+            "dropped_passages": sum(a.get("dropped_passages", 0) for _, _, a, _ in results),
+        },
     )
 
-    audit(db, actor=_actor(request), action="extract", deal_id=deal_id, metadata={"prompt": f"{prompt_name}:{prompt_version}"})
+    with stage("extract_terms", "db_commit"):
+        db.commit()
+
+    return redacted_output, StageOutcome("extract", RAN, input_hash)
 
-    db.commit()
 
-    return redacted_output
+@router.post("/{deal_id}/extract")
+async def extract_terms(
+    deal_id: str,
+    request: Request,
+    response: Response,
+    force: bool = Query(False, description="Ignore cached per-document results"),
+    priority: Priority = Query(Priority.interactive, description="LLM scheduling lane; bulk jobs pass 'batch'"),
+    db: Session = Depends(get_db),
+):
+    terms, outcome = await _run_stage(
+        deal_id, "extract", lambda: _run_extract(db, request, deal_id, force=force, priority=priority)
+    )
+    response.headers[STAGE_STATUS_HEADER] = outcome.status
+    return terms
 
 
 @router.put("/{deal_id}/terms")
 def update_terms(deal_id: str, payload: TermsUpdate, request: Request, db: Session = Depends(get_db)):
     _get_deal(db, deal_id)
 
-    existing = db.query(DealTerms).filter(DealTerms.deal_id == deal_id).one_or_none()
-    if not existing:
-        existing = DealTerms(deal_id=deal_id, terms_json={}, citations_json={}, confirmed_fields_json={})
-        db.add(existing)
-
-    terms_dump = payload.terms.model_dump()
-    existing.terms_json = redact_obj(terms_dump)
-    existing.citations_json = redact_obj(payload.terms.citations)
-    existing.confirmed_fields_json = payload.confirmed_fields
+    citations = redact_obj(payload.terms.citations)
+    upsert(
+        db,
+        DealTerms,
+        key={"deal_id": deal_id},
+        values={
+            "terms_json": redact_obj(payload.terms.model_dump()),
+            "citations_json": citations,
+            "citation_spans_json": _citation_spans(
+                db.query(Document).options(undefer_group(PROMPT_COLUMNS)).filter(Document.deal_id == deal_id).all(),
+                citations,
+            ),
+            "confirmed_fields_json": payload.confirmed_fields,
+            # input_hash is left alone: it covers the documents, prompt and model, none of
+            # which an edit changes, so the next pipeline run keeps the edited terms.
+        },
+    )
 
     audit(db, actor=_actor(request), action="edit_terms", deal_id=deal_id, metadata={"confirmed_fields": payload.confirmed_fields})
 
@@ -271,45 +1059,63 @@ def update_terms(deal_id: str, payload: TermsUpdate, request: Request, db: Sessi
     return {"status": "ok"}
 
 
-@router.post("/{deal_id}/analyze", response_model=AnalysisResponse)
-def analyze_deal(deal_id: str, request: Request, db: Session = Depends(get_db)):
+def _analysis_response(row: DealAnalysis) -> AnalysisResponse:
+    return AnalysisResponse(
+        metrics=row.metrics_json,
+        overall_triage=row.overall_triage,
+        risk_flags=row.risk_flags_json,
+        diligence_questions=row.diligence_questions_json,
+    )
+
+
+def _run_analyze(db: Session, request: Request, deal_id: str) -> tuple[AnalysisResponse, StageOutcome]:
     _get_deal(db, deal_id)
 
     terms_row = db.query(DealTerms).filter(DealTerms.deal_id == deal_id).one_or_none()
     if not terms_row:
         raise HTTPException(status_code=400, detail="No extracted/confirmed terms")
 
+    input_hash = analysis_input_hash(terms_row.terms_json)
+    existing = db.query(DealAnalysis).filter(DealAnalysis.deal_id == deal_id).one_or_none()
+    if existing is not None and existing.input_hash == input_hash:
+        return _analysis_response(existing), StageOutcome("analyze", SKIPPED, input_hash, "terms unchanged")
+
+    publish(deal_id, "stage", stage="analyze", status="started")
     terms = ExtractedTerms.model_validate(terms_row.terms_json)
 
     res = analyze(terms)
 
-    existing = db.query(DealAnalysis).filter(DealAnalysis.deal_id == deal_id).one_or_none()
-    if existing:
-        existing.metrics_json = res.metrics
-        existing.risk_flags_json = [f.model_dump() for f in res.risk_flags]
-        existing.diligence_questions_json = res.diligence_questions
-        existing.overall_triage = res.overall_triage
-    else:
-        db.add(
-            DealAnalysis(
-                deal_id=deal_id,
-                metrics_json=res.metrics,
-                risk_flags_json=[f.model_dump() for f in res.risk_flags],
-                diligence_questions_json=res.diligence_questions,
-                overall_triage=res.overall_triage,
-            )
-        )
+    upsert(
+        db,
+        DealAnalysis,
+        key={"deal_id": deal_id},
+        values={
+            "metrics_json": res.metrics,
+            "risk_flags_json": [f.model_dump() for f in res.risk_flags],
+            "diligence_questions_json": res.diligence_questions,
+            "overall_triage": res.overall_triage,
+            "input_hash": input_hash,
+        },
+    )
 
     audit(db, actor=_actor(request), action="analyze", deal_id=deal_id, metadata={"overall_triage": res.overall_triage})
 
     db.commit()
 
-    return AnalysisResponse(
+    response = AnalysisResponse(
         metrics=res.metrics,
         overall_triage=res.overall_triage,
         risk_flags=res.risk_flags,
         diligence_questions=res.diligence_questions,
     )
+    return response, StageOutcome("analyze", RAN, input_hash)
+
+
+@router.post("/{deal_id}/analyze", response_model=AnalysisResponse)
+async def analyze_deal(deal_id: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    result, outcome = await _run_stage(deal_id, "analyze", lambda: run_in_threadpool(_run_analyze, db, request, deal_id))
+    response.headers[STAGE_STATUS_HEADER] = outcome.status
+    return result
 
 
 def _draft_allowed(terms: ExtractedTerms, confirmed: dict[str, bool]) -> tuple[bool, str | None]:
@@ -324,15 +1130,17 @@ def _draft_allowed(terms: ExtractedTerms, confirmed: dict[str, bool]) -> tuple[b
     return True, None
 
 
-@router.post("/{deal_id}/draft", response_model=ICDraft)
-async def draft_ic(deal_id: str, request: Request, db: Session = Depends(get_db)):
-    _get_deal(db, deal_id)
+async def _run_draft(
+    db: Session, request: Request, deal_id: str, *, priority: Priority = Priority.interactive
+) -> tuple[ICDraft, StageOutcome]:
+    with stage("draft_ic", "load"):
+        _get_deal(db, deal_id)
+        terms_row = db.query(DealTerms).filter(DealTerms.deal_id == deal_id).one_or_none()
+        analysis_row = db.query(DealAnalysis).filter(DealAnalysis.deal_id == deal_id).one_or_none()
 
-    terms_row = db.query(DealTerms).filter(DealTerms.deal_id == deal_id).one_or_none()
     if not terms_row:
         raise HTTPException(status_code=400, detail="No extracted/confirmed terms")
 
-    analysis_row = db.query(DealAnalysis).filter(DealAnalysis.deal_id == deal_id).one_or_none()
     if not analysis_row:
         raise HTTPException(status_code=400, detail="Run analysis first")
 
@@ -355,31 +1163,86 @@ async def draft_ic(deal_id: str, request: Request, db: Session = Depends(get_db)
         },
     }
 
-    prompt = template.format(input_json=input_obj)
-    prompt_for_llm = redact(prompt)
+    with stage("draft_ic", "redact"):
+        prompt = render_prompt(template, input_json=input_obj)
+        prompt_for_llm = redact(prompt)
+
+    # Fail now rather than after a long call the provider rejects or truncates.
+    prompt_tokens = count_tokens(prompt_for_llm) + MESSAGE_OVERHEAD_TOKENS
+    limit = prompt_budget("ICDraft")
+    if prompt_tokens > limit:
+        raise HTTPException(status_code=400, detail=f"IC draft prompt is {prompt_tokens} tokens; the model allows {limit}")
+
+    input_hash = draft_input_hash(prompt_for_llm, model=settings.llm_model)
+    existing = db.query(DealDraft).filter(DealDraft.deal_id == deal_id).one_or_none()
+    if existing is not None and existing.input_hash == input_hash:
+        return ICDraft.model_validate(existing.draft_json), StageOutcome("draft", SKIPPED, input_hash, "prompt unchanged")
+
+    def recheck() -> tuple[ICDraft, StageOutcome] | None:
+        row = db.query(DealDraft.input_hash, DealDraft.draft_json).filter(DealDraft.deal_id == deal_id).one_or_none()
+        if row is not None and row.input_hash == input_hash:
+            return ICDraft.model_validate(row.draft_json), StageOutcome("draft", SKIPPED, input_hash, "completed by a concurrent request")
+        return None
+
+    return await coalesce(
+        db,
+        (deal_id, "draft", input_hash),
+        lambda: _draft_and_store(
+            db,
+            request,
+            deal_id,
+            prompt_name=prompt_name,
+            prompt_version=prompt_version,
+            template=template,
+            prompt_for_llm=prompt_for_llm,
+            input_hash=input_hash,
+            priority=priority,
+        ),
+        recheck=recheck,
+        on_shared=lambda result: (result[0], StageOutcome("draft", SKIPPED, input_hash, "coalesced with an in-flight request")),
+    )
+
 
+async def _draft_and_store(
+    db: Session,
+    request: Request,
+    deal_id: str,
+    *,
+    prompt_name: str,
+    prompt_version: str,
+    template: str,
+    prompt_for_llm: str,
+    input_hash: str,
+    priority: Priority,
+) -> tuple[ICDraft, StageOutcome]:
+    publish(deal_id, "stage", stage="draft", status="started")
     llm = get_llm_client()
-    output = await llm.complete_json(prompt=prompt_for_llm, schema_name="ICDraft")
+    with stage("draft_ic", "llm"):
+        output = await llm.complete_json(
+            prompt=prompt_for_llm,
+            schema_name="ICDraft",
+            on_progress=token_progress(deal_id, "draft"),
+            priority=priority,
+        )
+        call = last_call()
 
-    parsed = ICDraft.model_validate(output)
-    redacted_output = redact_obj(parsed.model_dump())
+    with stage("draft_ic", "validate"):
+        parsed = ICDraft.model_validate(output)
+        redacted_output = redact_obj(parsed.model_dump())
 
     ensure_prompt_version(db, name=prompt_name, version=prompt_version, content=template)
 
-    existing = db.query(DealDraft).filter(DealDraft.deal_id == deal_id).one_or_none()
-    if existing:
-        existing.draft_json = redacted_output
-        existing.prompt_name = prompt_name
-        existing.prompt_version = prompt_version
-    else:
-        db.add(
-            DealDraft(
-                deal_id=deal_id,
-                draft_json=redacted_output,
-                prompt_name=prompt_name,
-                prompt_version=prompt_version,
-            )
-        )
+    upsert(
+        db,
+        DealDraft,
+        key={"deal_id": deal_id},
+        values={
+            "draft_json": redacted_output,
+            "prompt_name": prompt_name,
+            "prompt_version": prompt_version,
+            "input_hash": input_hash,
+        },
+    )
 
     db.add(
         LLMRun(
@@ -390,39 +1253,103 @@ async def draft_ic(deal_id: str, request: Request, db: Session = Depends(get_db)
             temperature=settings.llm_temperature,
             input_hash=sha256_text(prompt_for_llm),
             output_json=redacted_output,
+            **_usage_columns(call, prompt_for_llm, redacted_output),
         )
     )
 
     audit(db, actor=_actor(request), action="draft", deal_id=deal_id, metadata={"prompt": f"{prompt_name}:{prompt_version}"})
 
-    db.commit()
+    with stage("draft_ic", "db_commit"):
+        db.commit()
 
-    return ICDraft.model_validate(redacted_output)
+    return ICDraft.model_validate(redacted_output), StageOutcome("draft", RAN, input_hash)
 
 
-@router.get("/{deal_id}/export")
-def export_pdf(deal_id: str, request: Request, db: Session = Depends(get_db)):
-    deal = _get_deal(db, deal_id)
+@router.post("/{deal_id}/draft", response_model=ICDraft)
+async def draft_ic(
+    deal_id: str,
+    request: Request,
+    response: Response,
+    priority: Priority = Query(Priority.interactive, description="LLM scheduling lane; bulk jobs pass 'batch'"),
+    db: Session = Depends(get_db),
+):
+    draft, outcome = await _run_stage(deal_id, "draft", lambda: _run_draft(db, request, deal_id, priority=priority))
+    response.headers[STAGE_STATUS_HEADER] = outcome.status
+    return draft
 
-    terms_row = db.query(DealTerms).filter(DealTerms.deal_id == deal_id).one_or_none()
-    analysis_row = db.query(DealAnalysis).filter(DealAnalysis.deal_id == deal_id).one_or_none()
-    draft_row = db.query(DealDraft).filter(DealDraft.deal_id == deal_id).one_or_none()
 
-    pdf_bytes = build_export_pdf(
-        deal={"id": deal.id, "name": deal.name, "created_at": deal.created_at.isoformat()},
-        terms=terms_row.terms_json if terms_row else None,
-        analysis={
+@router.post("/{deal_id}/pipeline")
+async def run_pipeline(
+    deal_id: str,
+    request: Request,
+    priority: Priority = Query(Priority.interactive, description="LLM scheduling lane; bulk jobs pass 'batch'"),
+    db: Session = Depends(get_db),
+):
+    """Run extract -> analyze -> draft, skipping every stage whose inputs are unchanged.
+
+    Each stage hashes its inputs and compares them with the hash stored on its output row,
+    so an unchanged stage makes no LLM call and no writes. A stage that cannot run (no
+    documents, unconfirmed fields) is reported as blocked and ends the run.
+    """
+    _get_deal(db, deal_id)
+    runners = {
+        "extract": lambda: _run_extract(db, request, deal_id, priority=priority),
+        "analyze": lambda: run_in_threadpool(_run_analyze, db, request, deal_id),
+        "draft": lambda: _run_draft(db, request, deal_id, priority=priority),
+    }
+
+    outcomes: list[StageOutcome] = []
+    for name in STAGES:
+        try:
+            with tracing.span(f"pipeline.{name}"):
+                _, outcome = await _run_stage(deal_id, name, runners[name])
+        except HTTPException as exc:
+            db.rollback()
+            outcomes.append(StageOutcome(name, BLOCKED, reason=str(exc.detail)))
+            break
+        outcomes.append(outcome)
+
+    publish(deal_id, "pipeline", stages=[o.as_dict() for o in outcomes])
+    return {
+        "stages": [o.as_dict() for o in outcomes],
+        "ran": [o.stage for o in outcomes if o.status == RAN],
+        "skipped": [o.stage for o in outcomes if o.status == SKIPPED],
+    }
+
+
+@router.get("/{deal_id}/export")
+def export_pdf(deal_id: str, request: Request, db: Session = Depends(get_db)):
+    with stage("export_pdf", "load"):
+        deal = _get_deal(db, deal_id)
+        terms_row = db.query(DealTerms).filter(DealTerms.deal_id == deal_id).one_or_none()
+        analysis_row = db.query(DealAnalysis).filter(DealAnalysis.deal_id == deal_id).one_or_none()
+        draft_row = db.query(DealDraft).filter(DealDraft.deal_id == deal_id).one_or_none()
+
+    deal_obj = {"id": deal.id, "name": deal.name, "created_at": deal.created_at.isoformat()}
+    terms = terms_row.terms_json if terms_row else None
+    analysis_obj = (
+        {
             "metrics": analysis_row.metrics_json,
             "overall_triage": analysis_row.overall_triage,
             "risk_flags": analysis_row.risk_flags_json,
             "diligence_questions": analysis_row.diligence_questions_json,
         }
         if analysis_row
-        else None,
-        draft=draft_row.draft_json if draft_row else None,
+        else None
     )
+    draft = draft_row.draft_json if draft_row else None
+
+    # The PDF is a pure function of these inputs; a client holding the current one
+    # gets a 304 without a re-render.
+    etag = f'"{export_input_hash(deal_obj, terms, analysis_obj, draft)}"'
+    if etag in [t.strip() for t in (request.headers.get("if-none-match") or "").split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    with stage("export_pdf", "render"):
+        pdf_bytes = build_export_pdf(deal=deal_obj, terms=terms, analysis=analysis_obj, draft=draft)
 
     audit(db, actor=_actor(request), action="export", deal_id=deal_id, metadata={"bytes": len(pdf_bytes)})
-    db.commit()
+    with stage("export_pdf", "db_commit"):
+        db.commit()
 
-    return Response(content=pdf_bytes, media_type="application/pdf")
+    return Response(content=pdf_bytes, media_type="application/pdf", headers={"ETag": etag})
@@ -0,0 +1,7 @@
+"""Benchmark suite for the triage hot paths.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.run --out backend/benchmarks/results/latest.json
+    python -m backend.benchmarks.compare old.json new.json
+"""
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+
+def _load(path: Path) -> dict[str, dict]:
+    return json.loads(path.read_text(encoding="utf-8"))["results"]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--metric", default="median_ms", choices=["min_ms", "median_ms", "mean_ms", "p95_ms"])
+    parser.add_argument("--threshold", type=float, default=1.10, help="Ratio above which a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    old = _load(args.baseline)
+    new = _load(args.candidate)
+
+    names = sorted(set(old) | set(new))
+    width = max(len(n) for n in names)
+    regressions = 0
+
+    for name in names:
+        if name not in old or name not in new:
+            status = "added" if name in new else "removed"
+            print(f"{name:{width}s}  {status}")
+            continue
+        before = old[name][args.metric]
+        after = new[name][args.metric]
+        ratio = after / before if before else float("inf")
+        mark = ""
+        if ratio > args.threshold:
+            mark = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 / args.threshold:
+            mark = "  faster"
+        print(f"{name:{width}s}  {before:10.3f} -> {after:10.3f} ms  x{ratio:5.2f}{mark}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
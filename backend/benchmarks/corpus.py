@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import io
+import random
+from dataclasses import dataclass
+
+from docx import Document as DocxDocument
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+# Approximate pages of term-sheet text per corpus size.
+SIZES: dict[str, int] = {
+    "small": 2,
+    "medium": 20,
+    "large": 120,
+}
+
+_FIRST_NAMES = ["Olivia", "James", "Charlotte", "William", "Amelia", "Henry", "Isla", "Jack", "Mia", "Lucas"]
+_LAST_NAMES = ["Nguyen", "Smith", "Williams", "Brown", "Taylor", "Wilson", "Martin", "Anderson", "Thompson", "Walker"]
+_COLLATERAL = ["residential development site", "completed office building", "industrial warehouse", "retail strata lots"]
+_JURISDICTIONS = ["New South Wales", "Victoria", "Queensland", "Western Australia"]
+_LIENS = ["first ranking", "second ranking"]
+_CLAUSES = [
+    "The Borrower must not create or permit to subsist any Security Interest over the Secured Property other than Permitted Security.",
+    "Each Obligor represents and warrants that no Event of Default is continuing or would result from the drawdown.",
+    "The Lender may, by notice to the Borrower, declare all outstanding amounts immediately due and payable.",
+    "All payments must be made in immediately available funds without set-off, counterclaim or withholding.",
+    "The Borrower must deliver quarterly management accounts within 45 days after the end of each quarter.",
+    "Insurance over the Secured Property must be maintained with a reputable insurer noting the Lender's interest.",
+    "Any valuation relied upon must be addressed to the Lender and be no older than three months at drawdown.",
+    "Default interest accrues at the Interest Rate plus 4.00% per annum on any overdue amount.",
+]
+
+
+@dataclass(frozen=True)
+class TermSheet:
+    text: str
+    # Table rows (label, value) mirrored into DOCX tables.
+    schedule: list[tuple[str, str]]
+
+
+def _person(rng: random.Random) -> str:
+    return f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+
+
+def generate_term_sheet(pages: int, seed: int = 0) -> TermSheet:
+    """Build a deterministic, realistic-looking term sheet of roughly ``pages`` pages."""
+    rng = random.Random(seed)
+
+    loan = rng.randrange(2_000_000, 40_000_000, 50_000)
+    appraised = int(loan / rng.uniform(0.5, 0.8))
+    stressed = int(appraised * rng.uniform(0.7, 0.9))
+    contact = _person(rng)
+
+    schedule = [
+        ("Facility Amount", f"${loan:,} AUD"),
+        ("Interest", f"{rng.uniform(8.5, 14.5):.2f}% per annum"),
+        ("Term", f"{rng.choice([6, 9, 12, 18, 24])} months"),
+        ("Collateral", rng.choice(_COLLATERAL)),
+        ("Appraised Value", f"${appraised:,}"),
+        ("Stressed Value", f"${stressed:,}"),
+        ("Lien Position", rng.choice(_LIENS)),
+        ("Jurisdiction", rng.choice(_JURISDICTIONS)),
+        ("Establishment Fee", f"{rng.uniform(1.0, 2.5):.2f}%"),
+        ("Repayment", "sale of completed lots or refinance"),
+    ]
+
+    lines = ["INDICATIVE TERM SHEET", "STRICTLY PRIVATE AND CONFIDENTIAL", ""]
+    lines += [f"{label}: {value}" for label, value in schedule]
+    lines += [
+        "",
+        f"Borrower contact: {contact}, {contact.split()[0].lower()}@borrower.example.com, +61 2 9{rng.randrange(1000000, 9999999)}",
+        f"Account: {rng.randrange(10**9, 10**10)}",
+        "",
+    ]
+
+    # ~3,000 characters per page of clause text.
+    target = pages * 3000
+    size = sum(len(line) + 1 for line in lines)
+    clause_no = 1
+    while size < target:
+        clause = f"{clause_no}. {rng.choice(_CLAUSES)}"
+        if clause_no % 17 == 0:
+            clause += f" Notices to {_person(rng)} on 04{rng.randrange(10000000, 99999999)}."
+        lines.append(clause)
+        size += len(clause) + 1
+        clause_no += 1
+
+    return TermSheet(text="\n".join(lines), schedule=schedule)
+
+
+def to_txt(sheet: TermSheet) -> bytes:
+    return sheet.text.encode("utf-8")
+
+
+def to_docx(sheet: TermSheet) -> bytes:
+    doc = DocxDocument()
+    table = doc.add_table(rows=0, cols=2)
+    for label, value in sheet.schedule:
+        row = table.add_row().cells
+        row[0].text = label
+        row[1].text = value
+    for line in sheet.text.splitlines():
+        doc.add_paragraph(line)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def to_pdf(sheet: TermSheet) -> bytes:
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=A4)
+    _, height = A4
+    y = height - 50
+    for line in sheet.text.splitlines():
+        # Wrap long clauses to keep text on the page.
+        for i in range(0, max(len(line), 1), 110):
+            c.drawString(40, y, line[i : i + 110])
+            y -= 12
+            if y < 50:
+                c.showPage()
+                y = height - 50
+    c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+RENDERERS = {
+    "txt": to_txt,
+    "docx": to_docx,
+    "pdf": to_pdf,
+}
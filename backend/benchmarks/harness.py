@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable
+
+
+def measure(fn: Callable[[], Any], *, repeat: int = 5, warmup: int = 1) -> dict[str, float]:
+    """Time ``fn`` ``repeat`` times (after ``warmup`` runs) and summarise in milliseconds."""
+    for _ in range(warmup):
+        fn()
+
+    samples: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+
+    return summarise(samples)
+
+
+def measure_async(fn: Callable[[], Any], *, repeat: int = 5, warmup: int = 1) -> dict[str, float]:
+    return measure(lambda: asyncio.run(fn()), repeat=repeat, warmup=warmup)
+
+
+def peak_memory_kib(fn: Callable[[], Any]) -> float:
+    """Peak Python heap allocated while running ``fn`` once, in KiB."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024.0
+    finally:
+        tracemalloc.stop()
+
+
+def summarise(samples_ms: list[float]) -> dict[str, float]:
+    ordered = sorted(samples_ms)
+    p95_idx = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "n": len(ordered),
+        "min_ms": ordered[0],
+        "median_ms": statistics.median(ordered),
+        "mean_ms": statistics.fmean(ordered),
+        "p95_ms": ordered[p95_idx],
+        "max_ms": ordered[-1],
+    }
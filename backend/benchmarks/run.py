@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from docx import Document as DocxDocument
+
+from backend.benchmarks.corpus import RENDERERS, SIZES, generate_term_sheet
+from backend.benchmarks.harness import measure, measure_async, peak_memory_kib, summarise
+from backend.llm.stub import StubLLMClient
+from backend.schemas.extracted_terms import ExtractedTerms
+from backend.services.analysis import analyze
+from backend.services.export_pdf import build_export_pdf
+from backend.models import Document
+from backend.services.citations import resolve_citations
+from backend.services.prompts import assemble_deal_text, load_prompt_template, render_prompt, set_prompt_segment
+from backend.services.redaction import redact, redact_obj
+from backend.services.text_extraction import extract_text
+from backend.tests.conftest import app_client
+from backend.utils.sanitize import sanitize_text
+
+DEFAULT_OUT = Path(__file__).parent / "results" / "latest.json"
+
+_CONFIRMED = {
+    "loan_amount": True,
+    "lien_position": True,
+    "repayment_source": True,
+    "collateral_value_appraised": True,
+}
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _sample_terms() -> ExtractedTerms:
+    return ExtractedTerms(
+        loan_amount=12_500_000,
+        term_months=12,
+        interest_rate_pct=11.5,
+        collateral_type="residential development site",
+        collateral_value_appraised=18_000_000,
+        collateral_value_stressed=14_000_000,
+        lien_position="first",
+        jurisdiction="New South Wales",
+        repayment_source="sale of completed lots",
+        repayment_timeline_months=10,
+    )
+
+
+def _python_docx_text(path: Path) -> str:
+    doc = DocxDocument(path)
+    return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+
+
+def bench_units(sizes: list[str], repeat: int, workdir: Path) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    template = load_prompt_template("extract_terms", "v1")
+    stub = StubLLMClient()
+
+    for size in sizes:
+        sheet = generate_term_sheet(SIZES[size], seed=len(size))
+        text = sheet.text
+
+        for fmt, render in RENDERERS.items():
+            path = workdir / f"{size}.{fmt}"
+            path.write_bytes(render(sheet))
+            results[f"extract_text.{fmt}.{size}"] = {
+                **measure(lambda p=path: extract_text(p), repeat=repeat),
+                "peak_kib": peak_memory_kib(lambda p=path: extract_text(p)),
+            }
+        # Baseline for the streaming DOCX extractor: the python-docx object model.
+        docx_path = workdir / f"{size}.docx"
+        results[f"extract_text.docx_python_docx.{size}"] = {
+            **measure(lambda: _python_docx_text(docx_path), repeat=repeat),
+            "peak_kib": peak_memory_kib(lambda: _python_docx_text(docx_path)),
+        }
+
+        obj = {"lines": text.splitlines(), "meta": {"summary": text[:2000], "nested": [{"s": line} for line in text.splitlines()[:200]]}}
+        results[f"redact.{size}"] = measure(lambda: redact(text), repeat=repeat)
+        results[f"redact_obj.{size}"] = measure(lambda: redact_obj(obj), repeat=repeat)
+        results[f"sanitize_text.{size}"] = measure(lambda: sanitize_text(text), repeat=repeat)
+
+        prompt = render_prompt(template, deal_text=text)
+
+        # Passage retrieval: assembly time and how much of the corpus reaches the prompt.
+        docs = [Document(filename=f"doc{i}.txt", extracted_text=text) for i in range(3)]
+        for doc in docs:
+            set_prompt_segment(doc, text)
+        _, assembly = assemble_deal_text(docs)
+        results[f"assemble_deal_text.{size}"] = {
+            **measure(lambda: assemble_deal_text(docs), repeat=repeat),
+            "corpus_chars": assembly["corpus_chars"],
+            "deal_text_chars": assembly["deal_text_chars"],
+        }
+
+        # Citation resolution against indexed segments (index build is at ingestion).
+        stub_output = asyncio.run(stub.complete_json(prompt=prompt, schema_name="ExtractedTerms"))
+        citations = redact_obj(stub_output.get("citations", {}))
+        for i, doc in enumerate(docs):
+            doc.id = i + 1
+        results[f"resolve_citations.{size}"] = {
+            **measure(lambda: resolve_citations(docs, citations), repeat=repeat),
+            "snippets": sum(len(v or []) for v in citations.values()),
+        }
+        results[f"stub.complete_json.{size}"] = measure_async(
+            lambda: stub.complete_json(prompt=prompt, schema_name="ExtractedTerms"), repeat=repeat
+        )
+
+    terms = _sample_terms()
+    results["analyze"] = measure(lambda: [analyze(terms) for _ in range(1000)], repeat=repeat)
+
+    res = analyze(terms)
+    analysis = {
+        "metrics": res.metrics,
+        "overall_triage": res.overall_triage,
+        "risk_flags": [f.model_dump() for f in res.risk_flags],
+        "diligence_questions": res.diligence_questions,
+    }
+    draft = {
+        "banner": "Decision support only. Not investment advice.",
+        "ic_summary_3_lines": "Senior secured development facility.",
+        "top_risks_ranked": ["Sales risk"],
+        "mitigants_or_conditions": ["Presales cover"],
+        "diligence_questions": res.diligence_questions,
+        "what_changes_my_mind": "Weaker presales.",
+    }
+    deal = {"id": "bench", "name": "Benchmark Deal", "created_at": "2025-01-01T00:00:00+00:00"}
+    results["build_export_pdf"] = measure(
+        lambda: build_export_pdf(deal=deal, terms=terms.model_dump(), analysis=analysis, draft=draft), repeat=repeat
+    )
+
+    return results
+
+
+def bench_e2e(sizes: list[str], repeat: int, workdir: Path) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    terms_payload = {"terms": _sample_terms().model_dump(mode="json"), "confirmed_fields": _CONFIRMED}
+
+    with app_client(workdir / "storage") as client:
+        for size in sizes:
+            sheet = generate_term_sheet(SIZES[size], seed=len(size))
+            for fmt, render in RENDERERS.items():
+                payload = render(sheet)
+                samples: dict[str, list[float]] = {}
+
+                def step(name: str, call: Callable[[], object]) -> None:
+                    start = time.perf_counter()
+                    resp = call()
+                    elapsed = (time.perf_counter() - start) * 1000.0
+                    resp.raise_for_status()
+                    samples.setdefault(name, []).append(elapsed)
+
+                for i in range(repeat):
+                    deal_id = client.post("/deals", json={"name": f"bench-{size}-{fmt}-{i}"}).json()["id"]
+                    base = f"/deals/{deal_id}"
+                    step("upload", lambda: client.post(f"{base}/documents", files={"file": (f"term_sheet.{fmt}", payload)}))
+                    step("extract", lambda: client.post(f"{base}/extract"))
+                    step("update_terms", lambda: client.put(f"{base}/terms", json=terms_payload))
+                    step("analyze", lambda: client.post(f"{base}/analyze"))
+                    step("draft", lambda: client.post(f"{base}/draft"))
+                    step("export", lambda: client.get(f"{base}/export"))
+                    step("detail", lambda: client.get(base))
+
+                for name, values in samples.items():
+                    results[f"e2e.{name}.{fmt}.{size}"] = summarise(values)
+
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the deal triage benchmark suite.")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="Where to write the JSON results")
+    parser.add_argument("--sizes", nargs="+", choices=sorted(SIZES), default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-e2e", action="store_true", help="Only run the unit-level benchmarks")
+    args = parser.parse_args(argv)
+
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="dealtriage-bench-") as tmp:
+        workdir = Path(tmp)
+        results.update(bench_units(args.sizes, args.repeat, workdir))
+        if not args.skip_e2e:
+            results.update(bench_e2e(args.sizes, args.repeat, workdir))
+
+    report = {
+        "meta": {
+            "created_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "sizes": {s: SIZES[s] for s in args.sizes},
+        },
+        "results": results,
+    }
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+
+    width = max(len(k) for k in results)
+    for name in sorted(results):
+        r = results[name]
+        print(f"{name:{width}s}  median={r['median_ms']:10.3f} ms  p95={r['p95_ms']:10.3f} ms")
+    print(f"\nWrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
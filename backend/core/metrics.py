@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from backend.core import tracing
+from backend.core.config import settings
+
+# Stage latencies span sub-millisecond parsing up to multi-second LLM calls.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+def _fmt_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_float(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels[n]) for n in self.labels)
+        return self._values.get(key, 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_fmt_labels(self.labels, k)} {_fmt_float(v)}" for k, v in items]
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is a bisect plus two adds under a lock."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., +Inf count], sum
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[key] = series
+            series[0][idx] += 1
+            series[1][0] += value
+
+    def count(self, **labels: str) -> int:
+        key = tuple(str(labels[n]) for n in self.labels)
+        series = self._series.get(key)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, (list(c), s[0])) for k, (c, s) in self._series.items())
+
+        out: list[str] = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = 'le="' + _fmt_float(bound) + '"'
+                out.append(f"{self.name}_bucket{_fmt_labels(self.labels, key, le)} {cumulative}")
+            out.append(f"{self.name}_sum{_fmt_labels(self.labels, key)} {_fmt_float(total)}")
+            out.append(f"{self.name}_count{_fmt_labels(self.labels, key)} {cumulative}")
+        return out
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def histogram(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "dealtriage_stage_seconds",
+    "Wall-clock time spent in each pipeline stage.",
+    labels=("pipeline", "stage"),
+)
+LLM_TOKENS = REGISTRY.counter(
+    "dealtriage_llm_tokens_total",
+    "LLM tokens consumed, as reported by the provider (stub: estimated).",
+    labels=("provider", "schema", "kind"),
+)
+LLM_CALLS = REGISTRY.counter(
+    "dealtriage_llm_calls_total",
+    "LLM calls by provider, schema and outcome.",
+    labels=("provider", "schema", "outcome"),
+)
+LLM_BACKEND_EJECTIONS = REGISTRY.counter(
+    "dealtriage_llm_backend_ejections_total",
+    "LLM backends taken out of rotation, by backend and reason (errors|latency).",
+    labels=("backend", "reason"),
+)
+LLM_QUEUE_SECONDS = REGISTRY.histogram(
+    "dealtriage_llm_queue_seconds",
+    "Time LLM calls waited in the scheduler before being sent, by priority lane.",
+    labels=("priority",),
+)
+AUDIT_ENTRIES = REGISTRY.counter(
+    "dealtriage_audit_entries_total",
+    "Audit entries by write path (sync|wal|memory|overflow).",
+    labels=("path",),
+)
+AUDIT_FLUSH_SECONDS = REGISTRY.histogram(
+    "dealtriage_audit_flush_seconds",
+    "Time to write one batch of buffered audit entries.",
+)
+DB_POOL_CHECKOUT_SECONDS = REGISTRY.histogram(
+    "dealtriage_db_pool_checkout_seconds",
+    "Time spent waiting for a pooled DB connection.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+@contextmanager
+def stage(pipeline: str, name: str) -> Iterator[None]:
+    """Record the duration of one pipeline stage (also on error) and trace it as a span."""
+    with tracing.span(f"{pipeline}.{name}"):
+        if not settings.metrics_enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            STAGE_SECONDS.observe(time.perf_counter() - start, pipeline=pipeline, stage=name)
+
+
+def record_llm_call(*, provider: str, schema_name: str, outcome: str) -> None:
+    if not settings.metrics_enabled:
+        return
+    LLM_CALLS.inc(provider=provider, schema=schema_name, outcome=outcome)
+
+
+def record_llm_usage(*, provider: str, schema_name: str, prompt_tokens: int | None, completion_tokens: int | None) -> None:
+    if not settings.metrics_enabled:
+        return
+    if prompt_tokens is not None:
+        LLM_TOKENS.inc(prompt_tokens, provider=provider, schema=schema_name, kind="prompt")
+    if completion_tokens is not None:
+        LLM_TOKENS.inc(completion_tokens, provider=provider, schema=schema_name, kind="completion")
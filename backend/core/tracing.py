@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from backend.core.config import settings
+
+# Bound per-request memory; a pathological request must not hold unbounded spans.
+MAX_SPANS_PER_TRACE = 2000
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+@dataclass
+class Trace:
+    trace_id: str
+    sampled: bool
+    # Request-level attributes (actor, deal_id) copied onto every exported span.
+    attributes: dict[str, Any] = field(default_factory=dict)
+    spans: list[Span] = field(default_factory=list)
+    dropped: int = 0
+
+    def add(self, span: Span) -> None:
+        if len(self.spans) >= MAX_SPANS_PER_TRACE:
+            self.dropped += 1
+            return
+        self.spans.append(span)
+
+
+_current_trace: ContextVar[Trace | None] = ContextVar("dealtriage_trace", default=None)
+_current_span: ContextVar[Span | None] = ContextVar("dealtriage_span", default=None)
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+def current_trace() -> Trace | None:
+    return _current_trace.get()
+
+
+def set_attribute(key: str, value: Any) -> None:
+    """Attach a request-level attribute (e.g. actor, deal_id) to the active trace."""
+    trace = _current_trace.get()
+    if trace is not None and value is not None:
+        trace.attributes[key] = value
+
+
+def open_span(name: str, **attributes: Any) -> Span | None:
+    """Start a detached span (caller must ``close_span``); used by event hooks."""
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    parent = _current_span.get()
+    return Span(
+        trace_id=trace.trace_id,
+        span_id=_new_id(8),
+        parent_id=parent.span_id if parent else None,
+        name=name,
+        start_ns=time.time_ns(),
+        attributes=attributes,
+    )
+
+
+def close_span(s: Span | None, error: BaseException | None = None) -> None:
+    if s is None:
+        return
+    s.end_ns = time.time_ns()
+    if error is not None:
+        s.error = f"{type(error).__name__}: {error}"[:500]
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(s)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    s = open_span(name, **attributes)
+    if s is None:
+        yield None
+        return
+
+    token = _current_span.set(s)
+    try:
+        yield s
+    except BaseException as exc:
+        close_span(s, exc)
+        raise
+    else:
+        close_span(s)
+    finally:
+        _current_span.reset(token)
+
+
+def traced(name: str, **attributes: Any) -> Callable:
+    """Decorator form of ``span`` for sync and async callables."""
+
+    def decorator(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name, **attributes):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, **attributes):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Open a root span. On exit the trace is exported if head-sampled or slower than the threshold."""
+    if not settings.tracing_enabled:
+        yield None
+        return
+
+    trace = Trace(trace_id=_new_id(16), sampled=random.random() < settings.tracing_sample_rate)
+    trace_token = _current_trace.set(trace)
+    root = open_span(name, **attributes)
+    span_token = _current_span.set(root)
+    error: BaseException | None = None
+    try:
+        yield root
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        _current_span.reset(span_token)
+        close_span(root, error)
+        _current_trace.reset(trace_token)
+
+        slow = root.duration_ms >= settings.tracing_slow_threshold_ms
+        failed = root.error is not None or int(root.attributes.get("http.status_code", 0)) >= 500
+        if trace.sampled or slow or failed:
+            get_exporter().export(trace)
+
+
+class FileExporter:
+    """Append finished traces to a local file from a background thread.
+
+    ``jsonl`` writes one flat span per line; ``otlp`` writes one OTLP/JSON
+    ``ExportTraceServiceRequest`` per line (the OpenTelemetry file-exporter layout),
+    so either can be inspected with jq or replayed into a collector later.
+    """
+
+    def __init__(self, path: str, fmt: str = "jsonl"):
+        if fmt not in {"jsonl", "otlp"}:
+            raise ValueError(f"Unsupported trace export format: {fmt}")
+        self.path = Path(path)
+        self.fmt = fmt
+        self._queue: queue.SimpleQueue[Trace | threading.Event] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Trace) -> None:
+        self._queue.put(trace)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until everything queued so far has been written."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _run(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            item = self._queue.get()
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            try:
+                lines = self._encode(item)
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write("".join(line + "\n" for line in lines))
+            except Exception:  # pragma: no cover - never let tracing take the process down
+                pass
+
+    def _encode(self, trace: Trace) -> list[str]:
+        if self.fmt == "jsonl":
+            return [
+                json.dumps(
+                    {
+                        "trace_id": s.trace_id,
+                        "span_id": s.span_id,
+                        "parent_id": s.parent_id,
+                        "name": s.name,
+                        "start_unix_nano": s.start_ns,
+                        "duration_ms": round(s.duration_ms, 3),
+                        "attributes": {**trace.attributes, **s.attributes},
+                        "error": s.error,
+                    },
+                    default=str,
+                )
+                for s in trace.spans
+            ]
+
+        def attrs(d: dict[str, Any]) -> list[dict]:
+            return [{"key": k, "value": {"stringValue": str(v)}} for k, v in d.items()]
+
+        spans = [
+            {
+                "traceId": s.trace_id,
+                "spanId": s.span_id,
+                "parentSpanId": s.parent_id or "",
+                "name": s.name,
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns),
+                "attributes": attrs({**trace.attributes, **s.attributes}),
+                "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+            }
+            for s in trace.spans
+        ]
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": attrs({"service.name": "dealtriage-backend"})},
+                    "scopeSpans": [{"scope": {"name": "backend.core.tracing"}, "spans": spans}],
+                }
+            ]
+        }
+        return [json.dumps(request, default=str)]
+
+
+_exporter: FileExporter | None = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter() -> FileExporter:
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = FileExporter(settings.tracing_export_path, settings.tracing_export_format)
+    return _exporter
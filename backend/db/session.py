@@ -1,17 +1,46 @@
 from __future__ import annotations
 
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
+from backend.core import tracing
 from backend.core.config import settings
+from backend.core.metrics import DB_POOL_CHECKOUT_SECONDS
 
 engine = create_engine(settings.database_url, pool_pre_ping=True)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 
+# Query spans. Registered on Engine so every engine (incl. test/benchmark ones) is traced.
+# Only the statement text is recorded; bound parameters may carry deal data.
+@event.listens_for(Engine, "before_cursor_execute")
+def _trace_query_start(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._trace_span = tracing.open_span("db.query", statement=statement[:300])
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _trace_query_end(conn, cursor, statement, parameters, context, executemany):
+    tracing.close_span(getattr(context, "_trace_span", None))
+
+
+@event.listens_for(Engine, "handle_error")
+def _trace_query_error(exception_context):
+    ctx = exception_context.execution_context
+    tracing.close_span(getattr(ctx, "_trace_span", None), exception_context.original_exception)
+
+
 def get_db():
     db = SessionLocal()
     try:
+        if settings.metrics_enabled:
+            # Check out eagerly so pool waits are measured rather than hidden in the first query.
+            start = time.perf_counter()
+            db.connection()
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start)
         yield db
     finally:
         db.close()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Any, TypeVar
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.utils.time import now_utc
+
+T = TypeVar("T")
+
+_ON_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def upsert(
+    db: Session,
+    model: type[T],
+    *,
+    key: dict[str, Any],
+    values: dict[str, Any],
+    insert_only: dict[str, Any] | None = None,
+) -> T:
+    """Insert the ``model`` row identified by ``key``, or update it if it exists.
+
+    ``values`` are written either way and ``insert_only`` only on insert. ``updated_at``,
+    if the model has one, is set to now. ``key`` must match a unique constraint.
+
+    Postgres and SQLite run a single ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING``,
+    so concurrent writers neither lose an update nor hit a unique violation. Other
+    dialects lock and update the row, or insert it, in a savepoint, retrying once if a
+    concurrent insert wins. The returned instance is the session's copy, refreshed.
+    """
+    updates = dict(values)
+    if "updated_at" in model.__table__.c:
+        updates["updated_at"] = now_utc()
+    row = {**(insert_only or {}), **updates, **key}
+
+    insert = _ON_CONFLICT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is not None:
+        stmt = insert(model).values(row)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={name: stmt.excluded[name] for name in updates},
+        ).returning(model)
+        return db.scalars(stmt, execution_options={"populate_existing": True}).one()
+
+    try:
+        return _write_locked(db, model, key, row, updates)
+    except IntegrityError:
+        # A concurrent insert won; the row exists now, so this attempt updates it.
+        return _write_locked(db, model, key, row, updates)
+
+
+def _write_locked(db: Session, model: type[T], key: dict, row: dict, updates: dict) -> T:
+    with db.begin_nested():
+        obj = db.query(model).filter_by(**key).with_for_update().populate_existing().one_or_none()
+        if obj is None:
+            obj = model(**row)
+            db.add(obj)
+        else:
+            for name, value in updates.items():
+                setattr(obj, name, value)
+    return obj
@@ -1,4 +1,16 @@
-from .base import LLMClient
-from .factory import get_llm_client
+from .base import LLMCall, LLMClient, Priority, last_call
+from .factory import get_llm_client, get_llm_provider
+from .registry import LLMRegistry
+from .scheduler import LLMScheduler, get_llm_scheduler
 
-__all__ = ["LLMClient", "get_llm_client"]
+__all__ = [
+    "LLMCall",
+    "LLMClient",
+    "LLMRegistry",
+    "LLMScheduler",
+    "Priority",
+    "get_llm_client",
+    "get_llm_provider",
+    "get_llm_scheduler",
+    "last_call",
+]
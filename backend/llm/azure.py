@@ -1,9 +1,23 @@
 from __future__ import annotations
 
+import json
+from typing import Callable
+
 import httpx
 
+from backend.core import tracing
 from backend.core.config import settings
-from backend.llm.base import LLMClient
+from backend.core.metrics import record_llm_call, record_llm_usage
+from backend.llm.base import LLMClient, Priority
+
+# First api-version that accepts ``stream_options`` (usage on the final streamed chunk);
+# earlier versions reject the field with a 400.
+_STREAM_USAGE_API_VERSION = "2024-09-01"
+
+
+def _supports_stream_usage(api_version: str) -> bool:
+    # api-versions are "YYYY-MM-DD" with an optional "-preview" suffix.
+    return api_version[:10] >= _STREAM_USAGE_API_VERSION
 
 
 class AzureOpenAIClient(LLMClient):
@@ -12,21 +26,40 @@ class AzureOpenAIClient(LLMClient):
     No external calls are made unless required env vars are present.
     """
 
-    def __init__(self):
-        if not settings.azure_openai_endpoint or not settings.azure_openai_deployment:
+    def __init__(
+        self,
+        *,
+        name: str | None = None,
+        endpoint: str | None = None,
+        deployment: str | None = None,
+        api_key: str | None = None,
+        api_version: str | None = None,
+    ):
+        # Unset arguments fall back to the single-deployment AZURE_OPENAI_* settings.
+        self.endpoint = endpoint or settings.azure_openai_endpoint
+        self.deployment = deployment or settings.azure_openai_deployment
+        self.api_key = api_key or settings.azure_openai_api_key
+        self.api_version = api_version or settings.azure_openai_api_version
+        if not self.endpoint or not self.deployment:
             raise RuntimeError("Azure OpenAI endpoint/deployment not configured")
-        if not settings.azure_openai_api_key:
+        if not self.api_key:
             raise RuntimeError("Azure OpenAI API key missing")
+        self.name = name or self.deployment
 
-    async def complete_json(self, *, prompt: str, schema_name: str) -> dict:
+    @tracing.traced("llm.complete_json", provider="azure")
+    async def complete_json(
+        self,
+        *,
+        prompt: str,
+        schema_name: str,
+        on_progress: Callable[[int], None] | None = None,
+        priority: Priority = Priority.interactive,
+    ) -> dict:
         # Azure OpenAI chat completions: /openai/deployments/{deployment}/chat/completions?api-version=...
-        url = (
-            f"{settings.azure_openai_endpoint.rstrip('/')}/openai/deployments/"
-            f"{settings.azure_openai_deployment}/chat/completions"
-        )
-        params = {"api-version": settings.azure_openai_api_version}
+        url = f"{self.endpoint.rstrip('/')}/openai/deployments/{self.deployment}/chat/completions"
+        params = {"api-version": self.api_version}
         headers = {
-            "api-key": settings.azure_openai_api_key,
+            "api-key": self.api_key,
             "Content-Type": "application/json",
         }
 
@@ -40,13 +73,66 @@ class AzureOpenAIClient(LLMClient):
             "response_format": {"type": "json_object"},
         }
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.post(url, params=params, headers=headers, json=payload)
-            resp.raise_for_status()
-            data = resp.json()
+        try:
+            async with httpx.AsyncClient(timeout=60.0) as client:
+                if on_progress is None:
+                    resp = await client.post(url, params=params, headers=headers, json=payload)
+                    resp.raise_for_status()
+                    data = resp.json()
+                    content = data["choices"][0]["message"]["content"]
+                    usage = data.get("usage") or {}
+                else:
+                    body = {**payload, "stream": True}
+                    if _supports_stream_usage(self.api_version):
+                        body["stream_options"] = {"include_usage": True}
+                    content, usage = await self._stream(client, url, params, headers, body, on_progress)
+        except Exception:
+            record_llm_call(provider="azure", schema_name=schema_name, outcome="error")
+            raise
+
+        record_llm_call(provider="azure", schema_name=schema_name, outcome="ok")
+        record_llm_usage(
+            provider="azure",
+            schema_name=schema_name,
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+        )
 
         # Azure returns content string; parse as JSON
-        content = data["choices"][0]["message"]["content"]
-        import json
+        out = json.loads(content)
+        self._record_call(prompt_tokens=usage.get("prompt_tokens"), completion_tokens=usage.get("completion_tokens"))
+        return out
+
+    @staticmethod
+    async def _stream(
+        client: httpx.AsyncClient,
+        url: str,
+        params: dict,
+        headers: dict,
+        body: dict,
+        on_progress: Callable[[int], None],
+    ) -> tuple[str, dict]:
+        """Streamed completion; each content delta is counted as one token.
 
-        return json.loads(content)
+        Without usage in the stream (older api-versions), the delta count stands in for
+        completion tokens and prompt tokens are left unreported.
+        """
+        pieces: list[str] = []
+        usage: dict = {}
+        async with client.stream("POST", url, params=params, headers=headers, json=body) as resp:
+            if resp.status_code >= 400:
+                await resp.aread()
+                resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line.startswith("data: ") or line == "data: [DONE]":
+                    continue
+                chunk = json.loads(line[6:])
+                usage = chunk.get("usage") or usage
+                for choice in chunk.get("choices") or []:
+                    piece = (choice.get("delta") or {}).get("content")
+                    if piece:
+                        pieces.append(piece)
+                        on_progress(len(pieces))
+        if not usage:
+            usage = {"completion_tokens": len(pieces)}
+        return "".join(pieces), usage
@@ -1,6 +1,34 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class LLMCall:
+    """What the provider reported for one ``complete_json`` call."""
+
+    backend: str
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+
+
+_last_call: ContextVar[LLMCall | None] = ContextVar("llm_last_call", default=None)
+
+
+def last_call() -> LLMCall | None:
+    """The last ``complete_json`` call that succeeded in this task."""
+    return _last_call.get()
+
+
+class Priority(str, Enum):
+    """Scheduling class of an LLM call (see ``backend.llm.scheduler``)."""
+
+    interactive = "interactive"  # an analyst is waiting on the response
+    batch = "batch"  # bulk re-extraction, portfolio drafting, scripts
 
 
 class LLMClient(ABC):
@@ -10,12 +38,25 @@ class LLMClient(ABC):
     All calculations (e.g. LVR) and triage decisions must remain deterministic.
     """
 
+    # Recorded on LLMRun.backend; provider clients call _record_call() on success.
+    name: str = "llm"
+
+    def _record_call(self, *, prompt_tokens: int | None = None, completion_tokens: int | None = None) -> None:
+        _last_call.set(LLMCall(self.name, prompt_tokens, completion_tokens))
+
     @abstractmethod
     async def complete_json(
         self,
         *,
         prompt: str,
         schema_name: str,
+        on_progress: Callable[[int], None] | None = None,
+        priority: Priority = Priority.interactive,
     ) -> dict:
-        """Return a JSON object matching the requested schema."""
+        """Return a JSON object matching the requested schema.
+
+        ``on_progress`` is called with the number of completion tokens received so far,
+        for clients that can report it while the response is being generated.
+        ``priority`` is used by the scheduler wrapper; provider clients ignore it.
+        """
         raise NotImplementedError
@@ -1,12 +1,25 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
 from backend.core.config import settings
 from backend.llm.azure import AzureOpenAIClient
 from backend.llm.base import LLMClient
+from backend.llm.registry import registry_from_settings
+from backend.llm.scheduler import ScheduledLLMClient, get_llm_scheduler
 from backend.llm.stub import StubLLMClient
 
 
-def get_llm_client() -> LLMClient:
+@lru_cache(maxsize=1)
+def get_llm_provider() -> LLMClient:
+    """Process-wide provider client; a registry keeps backend health across requests."""
     if settings.llm_provider == "azure":
+        if settings.llm_backends:
+            return registry_from_settings()
         return AzureOpenAIClient()
     return StubLLMClient()
+
+
+def get_llm_client() -> LLMClient:
+    """Provider client behind this worker's priority scheduler."""
+    return ScheduledLLMClient(get_llm_provider(), get_llm_scheduler())
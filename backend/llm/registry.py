@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Any, Callable
+
+import httpx
+
+from backend.core import tracing
+from backend.core.config import settings
+from backend.core.logging import log
+from backend.core.metrics import LLM_BACKEND_EJECTIONS
+from backend.llm.azure import AzureOpenAIClient
+from backend.llm.base import LLMClient, Priority
+
+# Weight of the newest sample in a backend's latency average.
+_LATENCY_ALPHA = 0.3
+# Latency ejection needs this many samples, so one slow call does not eject a backend.
+_MIN_LATENCY_SAMPLES = 3
+
+
+class Backend:
+    """One deployment in the registry plus the health state used to route to it."""
+
+    def __init__(self, client: LLMClient, *, weight: float = 1.0):
+        self.client = client
+        self.name = client.name
+        self.weight = max(weight, 0.01)
+        self.in_flight = 0
+        self.consecutive_errors = 0
+        self.latency: float | None = None
+        self.samples = 0
+        self.ejected_until = 0.0
+        self.ejections = 0  # consecutive; drives the backoff, reset by a successful call
+        self.probing = False
+
+    @property
+    def load(self) -> float:
+        return (self.in_flight + 1) / self.weight
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "weight": self.weight,
+            "in_flight": self.in_flight,
+            "latency_seconds": self.latency,
+            "consecutive_errors": self.consecutive_errors,
+            "ejected_for_seconds": max(0.0, self.ejected_until - now),
+        }
+
+
+def is_backend_failure(exc: BaseException) -> bool:
+    """Errors that say something about the deployment rather than the request."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError))
+
+
+class LLMRegistry(LLMClient):
+    """Routes each call to the least-loaded healthy backend, weighted.
+
+    Load is in-flight calls divided by weight, so a deployment with twice the quota takes
+    twice the concurrent calls. A backend is ejected for ``eject_seconds`` after
+    ``max_errors`` consecutive failures (429, 5xx, connection errors), or when its
+    latency average exceeds ``max_latency_seconds``. When that time is up it takes one
+    probe call. If the probe succeeds the backend is back in rotation. If it fails, the
+    backend is ejected again for twice as long, up to ``max_eject_seconds``.
+
+    A failed call is retried once on another backend. If every backend is ejected, calls
+    go to the one that is due back soonest rather than failing outright.
+    """
+
+    name = "registry"
+
+    def __init__(
+        self,
+        backends: list[Backend],
+        *,
+        max_errors: int = 3,
+        max_latency_seconds: float = 60.0,
+        eject_seconds: float = 30.0,
+        max_eject_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not backends:
+            raise ValueError("LLMRegistry needs at least one backend")
+        names = [b.name for b in backends]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate LLM backend names: {names}")
+        self.backends = backends
+        self.max_errors = max(1, max_errors)
+        self.max_latency_seconds = max_latency_seconds
+        self.eject_seconds = eject_seconds
+        self.max_eject_seconds = max_eject_seconds
+        self._clock = clock
+
+    def status(self) -> list[dict[str, Any]]:
+        now = self._clock()
+        return [b.as_dict(now) for b in self.backends]
+
+    def pick(self, exclude: frozenset[str] = frozenset()) -> Backend:
+        now = self._clock()
+        pool = [b for b in self.backends if b.name not in exclude] or self.backends
+        # A recovering backend (ejection expired) takes one probe call at a time.
+        healthy = [b for b in pool if b.ejected_until <= now and not b.probing]
+        if not healthy:
+            return min(pool, key=lambda b: (b.ejected_until, b.load))
+        return min(healthy, key=lambda b: (b.load, random.random()))
+
+    async def complete_json(
+        self,
+        *,
+        prompt: str,
+        schema_name: str,
+        on_progress: Callable[[int], None] | None = None,
+        priority: Priority = Priority.interactive,
+    ) -> dict:
+        tried: set[str] = set()
+        while True:
+            backend = self.pick(frozenset(tried))
+            tried.add(backend.name)
+            tracing.set_attribute("llm.backend", backend.name)
+            try:
+                return await self._call(backend, prompt=prompt, schema_name=schema_name, on_progress=on_progress)
+            except Exception as exc:
+                if not is_backend_failure(exc) or len(tried) >= min(2, len(self.backends)):
+                    raise
+                log("warning", "LLM backend failed; retrying on another", backend=backend.name, error=type(exc).__name__)
+
+    async def _call(self, backend: Backend, **kwargs: Any) -> dict:
+        probe = backend.ejections > 0 and backend.ejected_until <= self._clock()
+        backend.in_flight += 1
+        backend.probing = backend.probing or probe
+        start = self._clock()
+        try:
+            out = await backend.client.complete_json(**kwargs)
+        except Exception as exc:
+            if is_backend_failure(exc):
+                self._record_failure(backend, probe=probe)
+            raise
+        else:
+            self._record_success(backend, self._clock() - start, probe=probe)
+            return out
+        finally:
+            backend.in_flight -= 1
+            if probe:
+                backend.probing = False
+
+    def _record_success(self, backend: Backend, seconds: float, *, probe: bool = False) -> None:
+        if backend.ejections and not probe:
+            # Started before the ejection (or routed here while every backend was out):
+            # only the probe decides whether the backend is back.
+            return
+        backend.consecutive_errors = 0
+        backend.samples += 1
+        if backend.latency is None:
+            backend.latency = seconds
+        else:
+            backend.latency += _LATENCY_ALPHA * (seconds - backend.latency)
+        if (
+            self.max_latency_seconds > 0
+            and backend.samples >= _MIN_LATENCY_SAMPLES
+            and backend.latency > self.max_latency_seconds
+        ):
+            self._eject(backend, "latency")
+        elif probe:
+            log("info", "LLM backend back in rotation", backend=backend.name)
+            backend.ejections = 0
+
+    def _record_failure(self, backend: Backend, *, probe: bool) -> None:
+        backend.consecutive_errors += 1
+        # A failed probe goes straight back out; otherwise wait for max_errors in a row.
+        if probe or backend.consecutive_errors >= self.max_errors:
+            self._eject(backend, "errors")
+
+    def _eject(self, backend: Backend, reason: str) -> None:
+        seconds = min(self.eject_seconds * 2**backend.ejections, self.max_eject_seconds)
+        backend.ejections += 1
+        backend.ejected_until = self._clock() + seconds
+        backend.consecutive_errors = 0
+        # Start the next latency average afresh once the backend is probed back in.
+        backend.latency = None
+        backend.samples = 0
+        if settings.metrics_enabled:
+            LLM_BACKEND_EJECTIONS.inc(backend=backend.name, reason=reason)
+        log("warning", "LLM backend ejected", backend=backend.name, reason=reason, seconds=seconds)
+
+
+def registry_from_settings() -> LLMRegistry:
+    backends = []
+    for spec in settings.llm_backends:
+        client = AzureOpenAIClient(
+            name=spec.get("name"),
+            endpoint=spec.get("endpoint"),
+            deployment=spec.get("deployment"),
+            api_key=spec.get("api_key"),
+            api_version=spec.get("api_version"),
+        )
+        backends.append(Backend(client, weight=float(spec.get("weight", 1.0))))
+    return LLMRegistry(
+        backends,
+        max_errors=settings.llm_eject_after_errors,
+        max_latency_seconds=settings.llm_eject_latency_seconds,
+        eject_seconds=settings.llm_eject_seconds,
+        max_eject_seconds=settings.llm_max_eject_seconds,
+    )
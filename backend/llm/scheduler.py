@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Callable
+
+from backend.core import tracing
+from backend.core.config import settings
+from backend.core.metrics import LLM_QUEUE_SECONDS
+from backend.llm.base import LLMClient, Priority
+
+
+class _Waiter:
+    __slots__ = ("priority", "enqueued", "future")
+
+    def __init__(self, priority: Priority, future: asyncio.Future):
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.future = future
+
+
+class LLMScheduler:
+    """Admission control for LLM calls with an interactive and a batch lane.
+
+    At most ``max_concurrency`` calls run at once. Batch calls may use all but
+    ``interactive_reserved`` of those slots, so a bulk job never fills every one.
+
+    When a slot frees, queued interactive calls go ahead of queued batch calls, with
+    two exceptions that keep batch work moving:
+    * weighted share: after ``interactive_weight`` interactive grants in a row, the
+      oldest batch call is admitted;
+    * starvation: a batch call queued longer than ``max_batch_wait_seconds`` is
+      admitted next.
+
+    Running calls are never interrupted; "preemption" means interactive requests jump
+    the batch queue.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        *,
+        interactive_reserved: int = 2,
+        interactive_weight: int = 4,
+        max_batch_wait_seconds: float = 30.0,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_limit = max(1, self.max_concurrency - max(0, interactive_reserved))
+        self.interactive_weight = max(1, interactive_weight)
+        self.max_batch_wait_seconds = max_batch_wait_seconds
+        self._running = {Priority.interactive: 0, Priority.batch: 0}
+        self._queues: dict[Priority, deque[_Waiter]] = {p: deque() for p in Priority}
+        self._interactive_streak = 0
+
+    @property
+    def running(self) -> int:
+        return sum(self._running.values())
+
+    def queued(self, priority: Priority) -> int:
+        return len(self._queues[priority])
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority) -> AsyncIterator[None]:
+        start = time.monotonic()
+        await self._acquire(priority)
+        waited = time.monotonic() - start
+        if settings.metrics_enabled:
+            LLM_QUEUE_SECONDS.observe(waited, priority=priority.value)
+        tracing.set_attribute("llm.queue_ms", round(waited * 1000.0, 1))
+        try:
+            yield
+        finally:
+            self._running[priority] -= 1
+            self._dispatch()
+
+    async def _acquire(self, priority: Priority) -> None:
+        waiter = _Waiter(priority, asyncio.get_running_loop().create_future())
+        self._queues[priority].append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just as we were cancelled: hand the slot back.
+                self._running[priority] -= 1
+                self._dispatch()
+            else:
+                self._queues[priority].remove(waiter)
+            raise
+
+    def _dispatch(self) -> None:
+        while self.running < self.max_concurrency:
+            priority = self._next()
+            if priority is None:
+                return
+            waiter = self._queues[priority].popleft()
+            self._running[priority] += 1
+            if priority is Priority.batch:
+                self._interactive_streak = 0
+            else:
+                self._interactive_streak += 1
+            waiter.future.set_result(None)
+
+    def _next(self) -> Priority | None:
+        interactive = self._queues[Priority.interactive]
+        batch = self._queues[Priority.batch]
+        batch_ok = bool(batch) and self._running[Priority.batch] < self.batch_limit
+
+        if batch_ok and (
+            not interactive
+            or self._interactive_streak >= self.interactive_weight
+            or time.monotonic() - batch[0].enqueued >= self.max_batch_wait_seconds
+        ):
+            return Priority.batch
+        if interactive:
+            return Priority.interactive
+        return None
+
+
+class ScheduledLLMClient(LLMClient):
+    """Wraps a provider client so every call is admitted by the scheduler."""
+
+    def __init__(self, inner: LLMClient, scheduler: LLMScheduler):
+        self.inner = inner
+        self.scheduler = scheduler
+
+    async def complete_json(
+        self,
+        *,
+        prompt: str,
+        schema_name: str,
+        on_progress: Callable[[int], None] | None = None,
+        priority: Priority = Priority.interactive,
+    ) -> dict:
+        async with self.scheduler.slot(priority):
+            return await self.inner.complete_json(prompt=prompt, schema_name=schema_name, on_progress=on_progress)
+
+
+@lru_cache(maxsize=1)
+def get_llm_scheduler() -> LLMScheduler:
+    """Process-wide scheduler; its limits apply across all requests on this worker."""
+    return LLMScheduler(
+        settings.llm_max_concurrency,
+        interactive_reserved=settings.llm_interactive_reserved,
+        interactive_weight=settings.llm_interactive_weight,
+        max_batch_wait_seconds=settings.llm_max_batch_wait_seconds,
+    )
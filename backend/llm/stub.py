@@ -1,71 +1,190 @@
 from __future__ import annotations
 
+import json
 import re
-
-from backend.llm.base import LLMClient
-from backend.utils.sanitize import sanitize_text
+from typing import Callable
+
+from backend.core import tracing
+from backend.core.metrics import record_llm_call, record_llm_usage
+from backend.llm.base import LLMClient, Priority
+from backend.llm.tokens import MESSAGE_OVERHEAD_TOKENS, count_tokens
+
+
+# All heuristics live in one precompiled alternation so the deal text is scanned once.
+# Keyword alternatives are gated on a word boundary plus their possible first letters;
+# that cheap test rejects most positions before any alternative is tried.
+_MONEY = r"\$?\s*(?P<{name}>\d[\d,]*(?:\.\d+)?)\s*(?P<{name}_mult>m|mn|million|k)?\b"
+_KEYWORD_INITIALS = "acfgijlmpstuv12"
+_KEYWORD_ALTERNATIVES = [
+    r"(?:loan amount|facility amount|facility limit|principal)\b[^\n\r$\d]{0,60}"
+    + _MONEY.format(name="loan")
+    + r"(?:\s*(?P<loan_ccy>AUD|USD|NZD))?",
+    r"(?:interest(?: rate)?|coupon)\s*[:=]?\s*(?P<interest>\d+(?:\.\d+)?)\s*%",
+    r"term\s*[:=]?\s*(?P<term>\d{1,3})\s*(?:months|month|mos|mo)\b",
+    r"collateral\s*[:=]\s*(?P<collateral>[A-Za-z][A-Za-z /-]{2,59})",
+    r"(?:appraised|market|valuation) value\b[^\n\r$\d]{0,40}" + _MONEY.format(name="appraised"),
+    r"as[- ]is value\b[^\n\r$\d]{0,40}" + _MONEY.format(name="as_is"),
+    r"(?:stressed|forced sale|fire sale) value\b[^\n\r$\d]{0,40}" + _MONEY.format(name="stressed"),
+    r"(?P<lien>first|1st|second|2nd)[- ](?:ranking|lien|mortgage|registered)\b",
+    r"lien position\s*[:=]?\s*(?P<lien_label>first|1st|second|2nd|unsecured)\b",
+    r"(?P<unsecured>unsecured)[- ](?:facility|loan|note)\b",
+    r"(?:jurisdiction|governing law)\s*[:=]\s*(?P<jurisdiction>[A-Z][A-Za-z ]{2,39}?)\s*(?:[\n\r.,;(]|$)",
+    r"laws of (?:the State of )?(?P<jurisdiction_of>[A-Z][A-Za-z]+(?: [A-Z][A-Za-z]+){0,3})",
+]
+_SCAN_RE = re.compile(
+    r"\b(?=[" + _KEYWORD_INITIALS + r"])(?:" + "|".join(_KEYWORD_ALTERNATIVES) + r")"
+    # Unlabelled dollar amount: only used when no labelled loan amount exists.
+    + r"|\$\s*(?P<money>\d[\d,]*(?:\.\d+)?)\s*(?P<money_mult>m|mn|million|k)?\b",
+    re.IGNORECASE,
+)
+_WS_RE = re.compile(r"\s+")
+
+_MULTIPLIERS = {"k": 1_000.0, "m": 1_000_000.0, "mn": 1_000_000.0, "million": 1_000_000.0}
+_LIEN = {"first": "first", "1st": "first", "second": "second", "2nd": "second", "unsecured": "unsecured"}
+
+# (field, regex group) in priority order; the first match of each wins.
+_FIELDS = (
+    ("loan_amount", "loan"),
+    ("interest_rate_pct", "interest"),
+    ("term_months", "term"),
+    ("collateral_type", "collateral"),
+    ("collateral_value_appraised", "appraised"),
+    ("collateral_value_as_is", "as_is"),
+    ("collateral_value_stressed", "stressed"),
+    ("lien_position", "lien_label"),
+    ("lien_position", "lien"),
+    ("lien_position", "unsecured"),
+    ("jurisdiction", "jurisdiction"),
+    ("jurisdiction", "jurisdiction_of"),
+    ("_money", "money"),
+)
+_DEAL_TEXT_MARKER = "DEAL TEXT"
 
 
 def _snippet(text: str, start: int, end: int, max_len: int = 200) -> str:
     s = text[max(0, start - 80) : min(len(text), end + 80)].strip()
-    s = re.sub(r"\s+", " ", s)
+    s = _WS_RE.sub(" ", s)
     return s[:max_len]
 
 
-class StubLLMClient(LLMClient):
-    """Working local stub.
-
-    Uses light regex heuristics so the app can be exercised without external calls.
-    """
+def _money(raw: str, mult: str | None) -> float | None:
+    try:
+        value = float(raw.replace(",", ""))
+    except ValueError:
+        return None
+    return value * _MULTIPLIERS.get((mult or "").lower(), 1.0)
 
-    async def complete_json(self, *, prompt: str, schema_name: str) -> dict:
-        # The prompt contains the redacted deal text; heuristically extract a few obvious fields.
-        text = sanitize_text(prompt)
 
-        def find_money(label: str) -> tuple[float | None, str | None]:
-            m = re.search(rf"{label}[^\n\r]*?(\$?\s*[0-9][0-9,\.]*)(?:\s*(AUD|USD|NZD))?", text, re.IGNORECASE)
-            if not m:
-                m = re.search(r"\$\s*([0-9][0-9,\.]+)", text)
-            if not m:
-                return None, None
-            raw = m.group(1)
-            amount = float(raw.replace(",", "")) if raw else None
-            return amount, _snippet(text, m.start(), m.end())
+def scan_deal_text(text: str) -> dict[str, tuple[object, str]]:
+    """Single pass over ``text``: field -> (value, citation snippet), first occurrence wins.
 
-        loan_amount, loan_amount_snip = find_money("loan amount|facility amount|principal")
+    Linear in the input: each alternative is anchored on a literal keyword and only uses
+    bounded repetition, and the scan stops as soon as every field has been seen.
+    """
+    found: dict[str, tuple[object, str]] = {}
+    remaining = {field for field, _ in _FIELDS}
+
+    for m in _SCAN_RE.finditer(text):
+        groups = m.groupdict()
+        for field, group in _FIELDS:
+            raw = groups[group]
+            if raw is None or field in found:
+                continue
+            if group in {"loan", "appraised", "as_is", "stressed", "money"}:
+                value: object = _money(raw, groups[f"{group}_mult"])
+            elif group == "interest":
+                value = float(raw)
+            elif group == "term":
+                value = int(raw)
+            elif group in {"lien", "lien_label", "unsecured"}:
+                value = _LIEN[raw.lower()]
+            else:
+                value = raw.strip()
+            if value is None:
+                continue
+            found[field] = (value, _snippet(text, m.start(), m.end()))
+            if group == "loan" and groups["loan_ccy"]:
+                found["currency"] = (groups["loan_ccy"].upper(), found[field][1])
+            remaining.discard(field)
+        if not remaining:
+            break
+
+    if "loan_amount" not in found and "_money" in found:
+        found["loan_amount"] = found["_money"]
+    found.pop("_money", None)
+    return found
 
-        ir_m = re.search(r"\b(?:interest|coupon)\s*[:=]?\s*([0-9]+(?:\.[0-9]+)?)\s*%", text, re.IGNORECASE)
-        interest_rate_pct = float(ir_m.group(1)) if ir_m else None
-        interest_snip = _snippet(text, ir_m.start(), ir_m.end()) if ir_m else None
 
-        term_m = re.search(r"\bterm\s*[:=]?\s*([0-9]{1,3})\s*(months|month|mos|mo)\b", text, re.IGNORECASE)
-        term_months = int(term_m.group(1)) if term_m else None
-        term_snip = _snippet(text, term_m.start(), term_m.end()) if term_m else None
+class StubLLMClient(LLMClient):
+    """Working local stub.
 
-        collateral_m = re.search(r"\bcollateral\s*[:=]?\s*([A-Za-z /-]{3,60})", text)
-        collateral_type = collateral_m.group(1).strip() if collateral_m else "unknown"
-        collateral_snip = _snippet(text, collateral_m.start(), collateral_m.end()) if collateral_m else None
+    Uses light regex heuristics (see ``scan_deal_text``) so the app can be exercised without external calls.
+    """
 
-        # Build a schema-shaped response.
+    name = "stub"
+
+    @tracing.traced("llm.complete_json", provider="stub")
+    async def complete_json(
+        self,
+        *,
+        prompt: str,
+        schema_name: str,
+        on_progress: Callable[[int], None] | None = None,
+        priority: Priority = Priority.interactive,
+    ) -> dict:
+        out = self.respond(prompt=prompt, schema_name=schema_name)
+        # No provider usage to report; local counts keep load-test dashboards meaningful.
+        prompt_tokens = count_tokens(prompt) + MESSAGE_OVERHEAD_TOKENS
+        completion_tokens = count_tokens(json.dumps(out))
+        if on_progress is not None:
+            on_progress(completion_tokens)
+
+        record_llm_call(provider="stub", schema_name=schema_name, outcome="ok")
+        record_llm_usage(
+            provider="stub",
+            schema_name=schema_name,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+        )
+        self._record_call(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        return out
+
+    def respond(self, *, prompt: str, schema_name: str) -> dict:
+        """The stub's answer to ``prompt``, without metrics or tracing (the fake LLM server serves it)."""
         if schema_name == "ExtractedTerms":
-            citations = {
-                "loan_amount": [loan_amount_snip] if loan_amount_snip else None,
-                "interest_rate_pct": [interest_snip] if interest_snip else None,
-                "term_months": [term_snip] if term_snip else None,
-                "collateral_type": [collateral_snip] if collateral_snip else None,
-            }
+            # Prompts are assembled from sanitized, redacted text; scan only the deal text section.
+            marker = prompt.rfind(_DEAL_TEXT_MARKER)
+            text = prompt[marker + len(_DEAL_TEXT_MARKER) :] if marker >= 0 else prompt
+            found = scan_deal_text(text)
+
+            def value(field: str, default: object = None) -> object:
+                return found[field][0] if field in found else default
+
+            cited = (
+                "loan_amount",
+                "currency",
+                "term_months",
+                "interest_rate_pct",
+                "collateral_type",
+                "collateral_value_appraised",
+                "collateral_value_as_is",
+                "collateral_value_stressed",
+                "lien_position",
+                "jurisdiction",
+            )
+            citations = {f: [found[f][1]] if f in found else None for f in cited}
             return {
-                "loan_amount": loan_amount,
-                "currency": "AUD",
-                "term_months": term_months,
-                "interest_rate_pct": interest_rate_pct,
+                "loan_amount": value("loan_amount"),
+                "currency": value("currency", "AUD"),
+                "term_months": value("term_months"),
+                "interest_rate_pct": value("interest_rate_pct"),
                 "fees": [],
-                "collateral_type": collateral_type,
-                "collateral_value_appraised": None,
-                "collateral_value_as_is": None,
-                "collateral_value_stressed": None,
-                "lien_position": "unknown",
-                "jurisdiction": None,
+                "collateral_type": value("collateral_type", "unknown"),
+                "collateral_value_appraised": value("collateral_value_appraised"),
+                "collateral_value_as_is": value("collateral_value_as_is"),
+                "collateral_value_stressed": value("collateral_value_stressed"),
+                "lien_position": value("lien_position", "unknown"),
+                "jurisdiction": value("jurisdiction"),
                 "enforcement_timeline_months": None,
                 "repayment_source": None,
                 "repayment_timeline_months": None,
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import math
+import re
+from functools import lru_cache
+
+from backend.core.config import settings
+
+try:
+    import tiktoken
+except ImportError:  # optional: the local estimator below is used without it
+    tiktoken = None
+
+# Context windows by model-name prefix (longest match wins).
+_CONTEXT_WINDOWS = {
+    "gpt-4o": 128_000,
+    "gpt-4.1": 1_047_576,
+    "gpt-4-turbo": 128_000,
+    "gpt-4-32k": 32_768,
+    "gpt-4": 8_192,
+    "gpt-35-turbo": 16_385,
+    "gpt-3.5-turbo": 16_385,
+    "o1": 200_000,
+    "o3": 200_000,
+    "o4-mini": 200_000,
+}
+_DEFAULT_CONTEXT_WINDOW = 128_000
+
+# Completion tokens reserved per output schema; generous, since a cut-off JSON object fails
+# validation and wastes the whole call.
+_COMPLETION_RESERVE = {"ExtractedTerms": 2_000, "ICDraft": 4_000}
+_DEFAULT_COMPLETION_RESERVE = 2_000
+
+# System message, role markers and reply priming added around every prompt.
+MESSAGE_OVERHEAD_TOKENS = 24
+
+# Approximates the cl100k/o200k pre-tokenizer: contractions, words with their leading
+# space, digits in groups of up to three, punctuation runs, whitespace.
+_PIECE_RE = re.compile(r"'(?:[sdmt]|ll|ve|re)| ?[A-Za-z]+| ?\d{1,3}| ?[^\sA-Za-z\d]+|\s+")
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def _estimate(text: str) -> int:
+    """BPE token count estimate that errs high for English, numbers and markup."""
+    total = 0
+    for match in _PIECE_RE.finditer(text):
+        piece = match.group()
+        word = piece.lstrip(" ")
+        if not word or word.isspace():
+            total += 1
+        elif word.isascii() and word.isalpha():
+            # Common words are one token; long or unusual ones split into ~4-char pieces.
+            total += 1 if len(word) <= 6 else math.ceil(len(word) / 4)
+        elif word.isdigit():
+            total += 1
+        elif word.isascii():
+            total += math.ceil(len(word) / 2)
+        else:
+            # Non-ASCII: at worst one token per character.
+            total += len(word)
+    return total
+
+
+def count_tokens(text: str, model: str | None = None) -> int:
+    """Tokens in ``text`` for ``model``: exact with tiktoken installed, else an estimate."""
+    if not text:
+        return 0
+    if tiktoken is not None:
+        return len(_encoding(model or settings.llm_model).encode(text, disallowed_special=()))
+    return _estimate(text)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str | None = None) -> str:
+    """Longest prefix of ``text`` with at most ``max_tokens`` tokens."""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(text[:mid], model) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo]
+
+
+def context_window(model: str | None = None) -> int:
+    if settings.llm_context_window_tokens > 0:
+        return settings.llm_context_window_tokens
+    model = (model or settings.llm_model).lower()
+    matches = [prefix for prefix in _CONTEXT_WINDOWS if model.startswith(prefix)]
+    return _CONTEXT_WINDOWS[max(matches, key=len)] if matches else _DEFAULT_CONTEXT_WINDOW
+
+
+def completion_reserve(schema_name: str) -> int:
+    return _COMPLETION_RESERVE.get(schema_name, _DEFAULT_COMPLETION_RESERVE)
+
+
+def prompt_budget(schema_name: str, model: str | None = None) -> int:
+    """Largest prompt, in tokens, that leaves room for the ``schema_name`` completion."""
+    return context_window(model) - completion_reserve(schema_name) - MESSAGE_OVERHEAD_TOKENS
+
+
+def token_cost_usd(prompt_tokens: int, completion_tokens: int) -> float:
+    """Cost at the configured LLM_*_PRICE_PER_MILLION rates."""
+    return round(
+        (prompt_tokens * settings.llm_prompt_price_per_million + completion_tokens * settings.llm_completion_price_per_million)
+        / 1_000_000,
+        6,
+    )
@@ -0,0 +1,7 @@
+"""Load-testing tools.
+
+- ``fake_llm``: Azure chat-completions stand-in with configurable latency, streaming,
+  injected errors and rate limits.
+- ``loadgen``: drives upload -> extract -> analyze -> draft against a running backend.
+- ``fake_s3``: in-memory S3 stand-in (an ``httpx`` transport) for the S3 storage adapter.
+"""
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from contextlib import ExitStack
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from backend.llm.stub import StubLLMClient
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """Response latency in seconds.
+
+    Specs: ``fixed:S``, ``uniform:LO,HI``, ``lognormal:MEDIAN,SIGMA`` (optionally ``,MAX``).
+    """
+
+    kind: str
+    params: tuple[float, ...]
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        kind, _, raw = spec.partition(":")
+        params = tuple(float(p) for p in raw.split(",") if p)
+        expected = {"fixed": (1,), "uniform": (2,), "lognormal": (2, 3)}
+        if kind not in expected or len(params) not in expected[kind]:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+        return cls(kind, params)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return rng.uniform(self.params[0], self.params[1])
+        median, sigma = self.params[0], self.params[1]
+        value = rng.lognormvariate(math.log(median), sigma)
+        return min(value, self.params[2]) if len(self.params) == 3 else value
+
+
+@dataclass
+class FakeLLMConfig:
+    latency: LatencyModel = LatencyModel("fixed", (0.0,))
+    error_rate_429: float = 0.0
+    error_rate_500: float = 0.0
+    # 0 disables the limit.
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    # Streamed chunks are spread over the sampled latency.
+    stream_chunk_chars: int = 16
+    seed: int | None = None
+
+
+class _Bucket:
+    """Token bucket refilled continuously at ``per_minute`` / 60 per second."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self, amount: float) -> float:
+        """Seconds until ``amount`` fits (0 if it fits now). Call with ``lock`` held.
+
+        ``amount`` is capped at the capacity, so a request larger than the bucket waits for
+        a full bucket instead of being refused forever.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return max(0.0, (min(amount, self.capacity) - self.tokens) / self.rate)
+
+    def consume(self, amount: float) -> None:
+        """Take ``amount`` once ``wait`` has returned 0. Call with ``lock`` held."""
+        self.tokens -= min(amount, self.capacity)
+
+
+def _take_all(limits: list[tuple[_Bucket, float, str]]) -> tuple[float, str] | None:
+    """Take from every bucket, or from none if any is short.
+
+    Returns None on success, else the longest wait and the name of that limit, so a
+    request refused for tokens does not still use up a request slot.
+    """
+    with ExitStack() as stack:
+        # Always locked in the same (rpm, tpm) order.
+        for bucket, _, _ in limits:
+            stack.enter_context(bucket.lock)
+        waits = [(bucket.wait(amount), reason) for bucket, amount, reason in limits]
+        longest = max(waits, default=(0.0, ""))
+        if longest[0] > 0:
+            return longest
+        for bucket, amount, _ in limits:
+            bucket.consume(amount)
+    return None
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _schema_for(prompt: str) -> str:
+    return "ICDraft" if "ic_summary_3_lines" in prompt else "ExtractedTerms"
+
+
+def create_fake_llm_app(config: FakeLLMConfig | None = None) -> FastAPI:
+    cfg = config or FakeLLMConfig()
+    rng = random.Random(cfg.seed)
+    stub = StubLLMClient()
+    rpm = _Bucket(cfg.requests_per_minute) if cfg.requests_per_minute else None
+    tpm = _Bucket(cfg.tokens_per_minute) if cfg.tokens_per_minute else None
+
+    app = FastAPI(title="Fake Azure OpenAI")
+    app.state.config = cfg
+    app.state.stats = {"requests": 0, "ok": 0, "429": 0, "500": 0}
+
+    def _too_many(retry_after: float, reason: str) -> JSONResponse:
+        app.state.stats["429"] += 1
+        return JSONResponse(
+            status_code=429,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            content={"error": {"code": "429", "message": f"Rate limit exceeded ({reason})."}},
+        )
+
+    @app.post("/openai/deployments/{deployment}/chat/completions")
+    async def chat_completions(
+        deployment: str,
+        request: Request,
+        api_key: str | None = Header(default=None, alias="api-key"),
+    ):
+        app.state.stats["requests"] += 1
+        if not api_key:
+            raise HTTPException(status_code=401, detail="Missing api-key header")
+        if "api-version" not in request.query_params:
+            raise HTTPException(status_code=400, detail="Missing api-version")
+
+        body = await request.json()
+        messages = body.get("messages") or []
+        prompt = "\n".join(m.get("content", "") for m in messages if m.get("role") == "user")
+        prompt_tokens = _estimate_tokens("".join(m.get("content", "") for m in messages))
+
+        limits = [(rpm, 1, "requests per minute"), (tpm, prompt_tokens, "tokens per minute")]
+        if refused := _take_all([limit for limit in limits if limit[0] is not None]):
+            return _too_many(*refused)
+
+        roll = rng.random()
+        if roll < cfg.error_rate_429:
+            return _too_many(rng.uniform(1, 10), "injected")
+        if roll < cfg.error_rate_429 + cfg.error_rate_500:
+            app.state.stats["500"] += 1
+            return JSONResponse(status_code=500, content={"error": {"code": "InternalServerError", "message": "Injected failure."}})
+
+        content = json.dumps(stub.respond(prompt=prompt, schema_name=_schema_for(prompt)))
+        completion_tokens = _estimate_tokens(content)
+        latency = cfg.latency.sample(rng)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        app.state.stats["ok"] += 1
+
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+        if body.get("stream"):
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            chunks = [content[i : i + cfg.stream_chunk_chars] for i in range(0, len(content), cfg.stream_chunk_chars)]
+            # Roughly a third of the latency is time-to-first-token.
+            first_token = latency / 3
+            per_chunk = (latency - first_token) / max(1, len(chunks))
+
+            async def events():
+                await asyncio.sleep(first_token)
+                for i, piece in enumerate(chunks):
+                    delta = {"content": piece} if i else {"role": "assistant", "content": piece}
+                    event = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": deployment,
+                        "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+                    }
+                    yield f"data: {json.dumps(event)}\n\n"
+                    await asyncio.sleep(per_chunk)
+                done = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": deployment,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+                yield f"data: {json.dumps(done)}\n\n"
+                if include_usage:
+                    # As Azure does with stream_options.include_usage: no choices, just usage.
+                    final = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": deployment,
+                        "choices": [],
+                        "usage": usage,
+                    }
+                    yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await asyncio.sleep(latency)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": deployment,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage,
+        }
+
+    @app.get("/stats")
+    def stats():
+        return app.state.stats
+
+    return app
+
+
+def main(argv: list[str] | None = None) -> int:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake Azure OpenAI chat-completions server for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", default="lognormal:8,0.5,30", help="fixed:S | uniform:LO,HI | lognormal:MEDIAN,SIGMA[,MAX]")
+    parser.add_argument("--error-rate-429", type=float, default=0.0)
+    parser.add_argument("--error-rate-500", type=float, default=0.0)
+    parser.add_argument("--rpm", type=int, default=0, help="Requests per minute limit (0 = unlimited)")
+    parser.add_argument("--tpm", type=int, default=0, help="Prompt tokens per minute limit (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = FakeLLMConfig(
+        latency=LatencyModel.parse(args.latency),
+        error_rate_429=args.error_rate_429,
+        error_rate_500=args.error_rate_500,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        seed=args.seed,
+    )
+    uvicorn.run(create_fake_llm_app(config), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from urllib.parse import unquote
+
+import httpx
+
+
+@dataclass
+class _Upload:
+    key: str
+    parts: dict[int, bytes] = field(default_factory=dict)
+
+
+class FakeS3:
+    """In-memory S3 stand-in served through ``httpx.MockTransport``.
+
+    Covers what ``S3Storage`` uses: path-style PUT (including server-side copy), GET
+    (with ``Range``), HEAD and DELETE, and the multipart create/upload-part/complete/abort
+    calls. Requests must carry a SigV4 ``Authorization`` header and an
+    ``x-amz-content-sha256`` that matches the body.
+    ``part_delay`` slows UploadPart so tests can observe parallel transfers.
+    """
+
+    def __init__(self, bucket: str, *, part_delay: float = 0.0):
+        self.bucket = bucket
+        self.part_delay = part_delay
+        self.objects: dict[str, bytes] = {}
+        self.uploads: dict[str, _Upload] = {}
+        self.calls: list[tuple[str, str]] = []
+        self.max_parallel_parts = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        bucket, _, key = unquote(request.url.path).lstrip("/").partition("/")
+        if bucket != self.bucket:
+            return _error(404, "NoSuchBucket", bucket)
+        if not request.headers.get("authorization", "").startswith("AWS4-HMAC-SHA256 Credential="):
+            return _error(403, "AccessDenied", "Missing SigV4 signature")
+        body = request.read()
+        if request.headers.get("x-amz-content-sha256") != hashlib.sha256(body).hexdigest():
+            return _error(400, "XAmzContentSHA256Mismatch", key)
+
+        params = request.url.params
+        op = _operation(request.method, params)
+        with self._lock:
+            self.calls.append((op, key))
+        return getattr(self, f"_{op}")(key, body, params, request.headers)
+
+    def _put_object(self, key, body, params, headers):
+        source = headers.get("x-amz-copy-source")
+        if source:
+            src_bucket, _, src_key = unquote(source).lstrip("/").partition("/")
+            if src_bucket != self.bucket or src_key not in self.objects:
+                return _error(404, "NoSuchKey", source)
+            body = self.objects[src_key]
+        with self._lock:
+            self.objects[key] = body
+        return httpx.Response(200, headers={"etag": _etag(body)})
+
+    def _get_object(self, key, body, params, headers):
+        data = self.objects.get(key)
+        if data is None:
+            return _error(404, "NoSuchKey", key)
+        byte_range = headers.get("range")
+        if not byte_range:
+            return httpx.Response(200, content=data, headers={"etag": _etag(data)})
+        first, _, last = byte_range.removeprefix("bytes=").partition("-")
+        start = int(first)
+        end = min(int(last) + 1 if last else len(data), len(data))
+        if start >= len(data):
+            return _error(416, "InvalidRange", byte_range)
+        return httpx.Response(206, content=data[start:end], headers={"content-range": f"bytes {start}-{end - 1}/{len(data)}"})
+
+    def _head_object(self, key, body, params, headers):
+        data = self.objects.get(key)
+        if data is None:
+            return httpx.Response(404)
+        return httpx.Response(200, headers={"content-length": str(len(data)), "etag": _etag(data)})
+
+    def _create_multipart(self, key, body, params, headers):
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self.uploads[upload_id] = _Upload(key)
+        return _xml(200, f"<InitiateMultipartUploadResult><Key>{key}</Key><UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>")
+
+    def _upload_part(self, key, body, params, headers):
+        upload = self.uploads.get(params["uploadId"])
+        if upload is None:
+            return _error(404, "NoSuchUpload", params["uploadId"])
+        with self._lock:
+            self._in_flight += 1
+            self.max_parallel_parts = max(self.max_parallel_parts, self._in_flight)
+        try:
+            time.sleep(self.part_delay)
+            upload.parts[int(params["partNumber"])] = body
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        return httpx.Response(200, headers={"etag": _etag(body)})
+
+    def _complete_multipart(self, key, body, params, headers):
+        upload = self.uploads.pop(params["uploadId"], None)
+        if upload is None:
+            return _error(404, "NoSuchUpload", params["uploadId"])
+        data = b"".join(upload.parts[n] for n in sorted(upload.parts))
+        with self._lock:
+            self.objects[key] = data
+        return _xml(200, f"<CompleteMultipartUploadResult><Key>{key}</Key></CompleteMultipartUploadResult>")
+
+    def _delete_object(self, key, body, params, headers):
+        with self._lock:
+            self.objects.pop(key, None)
+        return httpx.Response(204)
+
+    def _abort_multipart(self, key, body, params, headers):
+        self.uploads.pop(params["uploadId"], None)
+        return httpx.Response(204)
+
+
+def _operation(method: str, params: httpx.QueryParams) -> str:
+    if method == "POST" and "uploads" in params:
+        return "create_multipart"
+    if method == "POST" and "uploadId" in params:
+        return "complete_multipart"
+    if method == "PUT" and "uploadId" in params:
+        return "upload_part"
+    if method == "DELETE" and "uploadId" in params:
+        return "abort_multipart"
+    return {"PUT": "put_object", "GET": "get_object", "HEAD": "head_object", "DELETE": "delete_object"}[method]
+
+
+def _etag(data: bytes) -> str:
+    return f'"{hashlib.md5(data).hexdigest()}"'
+
+
+def _xml(status: int, body: str) -> httpx.Response:
+    return httpx.Response(status, content=body.encode(), headers={"content-type": "application/xml"})
+
+
+def _error(status: int, code: str, message: str) -> httpx.Response:
+    return _xml(status, f"<Error><Code>{code}</Code><Message>{message}</Message></Error>")
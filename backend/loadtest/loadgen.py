@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+from backend.benchmarks.corpus import RENDERERS, SIZES, generate_term_sheet
+
+STEPS = ("create", "upload", "extract", "confirm", "analyze", "draft")
+
+_CONFIRMED = {
+    "loan_amount": True,
+    "lien_position": True,
+    "repayment_source": True,
+    "collateral_value_appraised": True,
+}
+
+
+@dataclass
+class StepStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def record(self, elapsed_ms: float, status: int | str) -> None:
+        if isinstance(status, int) and status < 400:
+            self.latencies_ms.append(elapsed_ms)
+        else:
+            self.errors[str(status)] = self.errors.get(str(status), 0) + 1
+
+
+def percentile(samples: list[float], pct: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+async def _timed(stats: StepStats, coro) -> httpx.Response | None:
+    start = time.perf_counter()
+    try:
+        resp = await coro
+    except httpx.HTTPError as exc:
+        stats.record((time.perf_counter() - start) * 1000.0, type(exc).__name__)
+        return None
+    stats.record((time.perf_counter() - start) * 1000.0, resp.status_code)
+    return resp if resp.status_code < 400 else None
+
+
+async def run_deal(client: httpx.AsyncClient, n: int, doc: tuple[str, bytes], stats: dict[str, StepStats]) -> bool:
+    resp = await _timed(stats["create"], client.post("/deals", json={"name": f"loadgen-{n}"}))
+    if resp is None:
+        return False
+    base = f"/deals/{resp.json()['id']}"
+
+    if await _timed(stats["upload"], client.post(f"{base}/documents", files={"file": doc})) is None:
+        return False
+
+    resp = await _timed(stats["extract"], client.post(f"{base}/extract"))
+    if resp is None:
+        return False
+
+    # Confirm what the model extracted, filling the fields drafting requires.
+    terms = resp.json()
+    terms["lien_position"] = terms.get("lien_position") or "first"
+    terms["repayment_source"] = terms.get("repayment_source") or "sale"
+    terms["collateral_value_appraised"] = terms.get("collateral_value_appraised") or 1_000_000
+    confirm = client.put(f"{base}/terms", json={"terms": terms, "confirmed_fields": _CONFIRMED})
+    if await _timed(stats["confirm"], confirm) is None:
+        return False
+
+    if await _timed(stats["analyze"], client.post(f"{base}/analyze")) is None:
+        return False
+    return await _timed(stats["draft"], client.post(f"{base}/draft")) is not None
+
+
+async def run(base_url: str, deals: int, concurrency: int, doc: tuple[str, bytes], timeout: float) -> dict:
+    stats = {step: StepStats() for step in STEPS}
+    sem = asyncio.Semaphore(concurrency)
+    completed = 0
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits, headers={"x-dev-actor": "loadgen@local"}) as client:
+
+        async def one(n: int) -> None:
+            nonlocal completed
+            async with sem:
+                if await run_deal(client, n, doc, stats):
+                    completed += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(n) for n in range(deals)))
+        wall_s = time.perf_counter() - start
+
+    report: dict = {
+        "deals": deals,
+        "completed": completed,
+        "concurrency": concurrency,
+        "wall_seconds": wall_s,
+        "deals_per_second": completed / wall_s if wall_s else None,
+        "steps": {},
+    }
+    for step, s in stats.items():
+        report["steps"][step] = {
+            "ok": len(s.latencies_ms),
+            "errors": s.errors,
+            "throughput_rps": len(s.latencies_ms) / wall_s if wall_s else None,
+            **{f"p{p}_ms": percentile(s.latencies_ms, p) for p in (50, 90, 95, 99)},
+            "max_ms": max(s.latencies_ms) if s.latencies_ms else None,
+        }
+    return report
+
+
+def _print(report: dict) -> None:
+    print(
+        f"deals={report['deals']} completed={report['completed']} concurrency={report['concurrency']} "
+        f"wall={report['wall_seconds']:.1f}s throughput={report['deals_per_second'] or 0:.2f} deals/s"
+    )
+    print(f"{'step':8s} {'ok':>5s} {'err':>5s} {'rps':>7s} {'p50':>9s} {'p90':>9s} {'p95':>9s} {'p99':>9s}")
+    for step, s in report["steps"].items():
+        pct = [f"{s[k]:9.1f}" if s[k] is not None else f"{'-':>9s}" for k in ("p50_ms", "p90_ms", "p95_ms", "p99_ms")]
+        print(f"{step:8s} {s['ok']:5d} {sum(s['errors'].values()):5d} {s['throughput_rps'] or 0:7.2f} {' '.join(pct)}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Drive upload -> extract -> analyze -> draft against a running backend.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--deals", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--size", choices=sorted(SIZES), default="small")
+    parser.add_argument("--format", choices=sorted(RENDERERS), default="txt")
+    parser.add_argument("--file", type=Path, help="Upload this file instead of a generated term sheet")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--out", type=Path, help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.file:
+        doc = (args.file.name, args.file.read_bytes())
+    else:
+        sheet = generate_term_sheet(SIZES[args.size])
+        doc = (f"term_sheet.{args.format}", RENDERERS[args.format](sheet))
+
+    report = asyncio.run(run(args.base_url, args.deals, args.concurrency, doc, args.timeout))
+    _print(report)
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0 if report["completed"] == report["deals"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,17 +1,30 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from backend.api import deals_router, health_router
+from backend.api import audit_router, deals_router, health_router, metrics_router
 from backend.core.config import settings
 from backend.middleware.dev_auth import DevAuthMiddleware
+from backend.middleware.tracing import TracingMiddleware
+from backend.services.audit import close_audit_writers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Write out buffered audit entries before the process exits.
+    close_audit_writers()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Deal Triage", version="0.1.0")
+    app = FastAPI(title="Deal Triage", version="0.1.0", lifespan=lifespan)
 
     app.add_middleware(DevAuthMiddleware)
+    # Added after DevAuth so it runs outside it and sees the resolved actor.
+    app.add_middleware(TracingMiddleware)
 
     app.add_middleware(
         CORSMiddleware,
@@ -26,6 +39,8 @@ def create_app() -> FastAPI:
 
     app.include_router(health_router)
     app.include_router(deals_router)
+    app.include_router(metrics_router)
+    app.include_router(audit_router)
 
     return app
 
@@ -6,6 +6,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
+from backend.core import tracing
 from backend.core.config import settings
 
 
@@ -17,10 +18,11 @@ class DevAuthMiddleware(BaseHTTPMiddleware):
     """
 
     async def dispatch(self, request: Request, call_next: Callable[[Request], Response]) -> Response:
-        if not settings.dev_auth_enabled:
-            request.state.actor = "anonymous"
-            return await call_next(request)
-
-        actor = request.headers.get("x-dev-actor") or settings.dev_auth_default_actor
-        request.state.actor = actor
+        with tracing.span("middleware.dev_auth"):
+            if not settings.dev_auth_enabled:
+                actor = "anonymous"
+            else:
+                actor = request.headers.get("x-dev-actor") or settings.dev_auth_default_actor
+            request.state.actor = actor
+            tracing.set_attribute("actor", actor)
         return await call_next(request)
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from backend.core import tracing
+
+
+class TracingMiddleware(BaseHTTPMiddleware):
+    """Opens the root span for each request.
+
+    Must wrap DevAuthMiddleware so the actor it resolves lands on the trace.
+    """
+
+    async def dispatch(self, request: Request, call_next: Callable[[Request], Response]) -> Response:
+        with tracing.start_trace("http.request", **{"http.method": request.method, "http.path": request.url.path}) as root:
+            response = await call_next(request)
+            if root is not None:
+                root.attributes["http.status_code"] = response.status_code
+                route = request.scope.get("route")
+                if route is not None:
+                    root.attributes["http.route"] = getattr(route, "path", None)
+                tracing.set_attribute("deal_id", request.path_params.get("deal_id"))
+            return response
@@ -6,8 +6,10 @@ from .deal_analysis import DealAnalysis
 from .deal_draft import DealDraft
 from .deal_terms import DealTerms
 from .document import Document
+from .document_extraction import DocumentExtraction
 from .llm_run import LLMRun
 from .prompt_version import PromptVersion
+from .upload_session import UploadSession
 
 __all__ = [
     "AuditLog",
@@ -16,6 +18,8 @@ __all__ = [
     "DealDraft",
     "DealTerms",
     "Document",
+    "DocumentExtraction",
     "LLMRun",
     "PromptVersion",
+    "UploadSession",
 ]
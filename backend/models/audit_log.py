@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import datetime as dt
 
-from sqlalchemy import DateTime, Integer, String
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -11,15 +11,29 @@ from backend.utils.time import now_utc
 
 
 class AuditLog(Base):
+    """Append-only audit trail.
+
+    On Postgres the table is range-partitioned by month on ``created_at``; its primary key
+    there is ``(id, created_at)`` (see migration 0013 and services/audit_partitions.py).
+    Indexes follow the read paths of ``GET /audit``: newest first within a deal, actor or
+    action, plus BRIN on ``created_at`` for time-range scans.
+    """
+
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_deal_id_created_at", "deal_id", "created_at", "id"),
+        Index("ix_audit_logs_actor_created_at", "actor", "created_at", "id"),
+        Index("ix_audit_logs_action_created_at", "action", "created_at", "id"),
+        Index("ix_audit_logs_created_at_brin", "created_at", postgresql_using="brin"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
 
-    actor: Mapped[str] = mapped_column(String(256), index=True)
-    action: Mapped[str] = mapped_column(String(128), index=True)
+    actor: Mapped[str] = mapped_column(String(256))
+    action: Mapped[str] = mapped_column(String(128))
 
-    deal_id: Mapped[str | None] = mapped_column(String(36), index=True, nullable=True)
+    deal_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
 
     metadata_json: Mapped[dict] = mapped_column(JSONB)
 
-    created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=now_utc, nullable=False)
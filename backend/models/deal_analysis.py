@@ -22,4 +22,8 @@ class DealAnalysis(Base):
     diligence_questions_json: Mapped[list] = mapped_column(JSONB)
     overall_triage: Mapped[str] = mapped_column(String(32))
 
+    # Hash of the terms_json this analysis was computed from.
+    input_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
     created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
+    updated_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
@@ -21,4 +21,8 @@ class DealDraft(Base):
     prompt_name: Mapped[str] = mapped_column(String(128))
     prompt_version: Mapped[str] = mapped_column(String(64))
 
+    # Hash of the rendered prompt and model this draft came from.
+    input_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
     created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
+    updated_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
@@ -19,9 +19,17 @@ class DealTerms(Base):
 
     terms_json: Mapped[dict] = mapped_column(JSONB)
     citations_json: Mapped[dict] = mapped_column(JSONB)
+    # citations_json resolved to source locations:
+    # { field_name: [{"snippet", "document_id", "page", "start", "end"}] }
+    citation_spans_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
     # { field_name: true/false } – used to gate drafting
     confirmed_fields_json: Mapped[dict] = mapped_column(JSONB, default=dict)
 
+    # Hash of the extraction inputs (document segments, prompt, model) these terms came
+    # from. Hand edits keep it, so the pipeline does not re-extract over them until the
+    # inputs change; None for rows written before the column existed.
+    input_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
     created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
     updated_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
@@ -9,6 +9,9 @@ from sqlalchemy.orm import Mapped, mapped_column
 from backend.db.base import Base
 from backend.utils.time import now_utc
 
+# Deferred column group with the prompt segment and its indexes.
+PROMPT_COLUMNS = "prompt"
+
 
 class Document(Base):
     __tablename__ = "documents"
@@ -24,6 +27,22 @@ class Document(Base):
 
     # NOTE: MVP stores extracted text. TODO: encrypt at rest.
     extracted_text: Mapped[str] = mapped_column(Text)
+    # ok | timeout | memory_limit | error; non-ok documents keep whatever pages finished.
+    extraction_status: Mapped[str] = mapped_column(String(32), nullable=False, default="ok")
+
+    # Prompt-ready text (sanitized + redacted, with a filename header), computed once at
+    # ingestion. redaction_version records the rule set it was redacted under.
+    # The "prompt" group (segment, passages, page offsets) holds each document's full text
+    # and indexes, so it is deferred: extract and citation paths load it with
+    # undefer_group(PROMPT_COLUMNS); listings never do.
+    prompt_segment: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True, deferred_group=PROMPT_COLUMNS)
+    segment_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    redaction_version: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    # BM25 passage index over prompt_segment: [{"start", "end", "len", "tf": {term: n}}].
+    passages_json: Mapped[list | None] = mapped_column(JSONB, nullable=True, deferred=True, deferred_group=PROMPT_COLUMNS)
+    # Start offset of each source page within prompt_segment (a single entry for formats
+    # without pages); citation spans are mapped back to pages with these.
+    page_offsets: Mapped[list | None] = mapped_column(JSONB, nullable=True, deferred=True, deferred_group=PROMPT_COLUMNS)
 
     metadata_json: Mapped[dict] = mapped_column(JSONB, default=dict)
 
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from sqlalchemy import DateTime, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.db.base import Base
+from backend.utils.time import now_utc
+
+
+class DocumentExtraction(Base):
+    """Cached single-document ExtractedTerms output.
+
+    Keyed by the document's prompt segment hash (its bytes as sanitized and redacted under
+    the current rules) and the prompt/model that produced it, so unchanged documents are
+    never re-sent. Not tied to a deal: identical documents share one result.
+    """
+
+    __tablename__ = "document_extractions"
+    __table_args__ = (UniqueConstraint("segment_sha256", "prompt_name", "prompt_version", "model", name="uq_document_extractions_key"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+    segment_sha256: Mapped[str] = mapped_column(String(64))
+    document_sha256: Mapped[str] = mapped_column(String(64), index=True)
+    prompt_name: Mapped[str] = mapped_column(String(128))
+    prompt_version: Mapped[str] = mapped_column(String(64))
+    model: Mapped[str] = mapped_column(String(128))
+
+    # Validated, redacted ExtractedTerms dump for this document alone.
+    output_json: Mapped[dict] = mapped_column(JSONB)
+
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
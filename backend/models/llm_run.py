@@ -22,6 +22,11 @@ class LLMRun(Base):
 
     model: Mapped[str] = mapped_column(String(128))
     temperature: Mapped[float] = mapped_column(Float)
+    # Deployment that served the call (LLM_BACKENDS name, Azure deployment, or "stub").
+    backend: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    # Provider-reported usage, or local counts when the provider reports none.
+    prompt_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    completion_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     input_hash: Mapped[str] = mapped_column(String(64), index=True)
     output_json: Mapped[dict] = mapped_column(JSONB)
@@ -1,5 +1,5 @@
 from .analysis import AnalysisResponse, RiskFlag
-from .deals import DealCreate, DealOut, DocumentOut
+from .deals import DealCreate, DealOut, DocumentOut, UploadSessionCreate
 from .draft import ICDraft
 from .extracted_terms import ExtractedTerms, TermsUpdate
 
@@ -9,6 +9,7 @@ __all__ = [
     "DealCreate",
     "DealOut",
     "DocumentOut",
+    "UploadSessionCreate",
     "ICDraft",
     "ExtractedTerms",
     "TermsUpdate",
@@ -22,4 +22,12 @@ class DocumentOut(BaseSchema):
     content_type: str | None = None
     size_bytes: int | None = None
     sha256: str
+    extraction_status: str = "ok"
     created_at: str
+
+
+class UploadSessionCreate(BaseSchema):
+    filename: str = Field(min_length=1, max_length=512)
+    size_bytes: int = Field(gt=0)
+    content_type: str | None = None
+    sha256: str | None = Field(default=None, pattern=r"^[0-9a-fA-F]{64}$")
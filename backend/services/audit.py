@@ -1,18 +1,283 @@
 from __future__ import annotations
 
+import atexit
+import datetime as dt
+import io
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from enum import Enum
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
+from backend.core.config import settings
+from backend.core.logging import log
+from backend.core.metrics import AUDIT_ENTRIES, AUDIT_FLUSH_SECONDS
 from backend.models.audit_log import AuditLog
 from backend.utils.time import now_utc
 
+_COLUMNS = ("actor", "action", "deal_id", "metadata_json", "created_at")
+
+
+class Durability(str, Enum):
+    sync = "sync"  # row inserted in the caller's transaction
+    wal = "wal"  # fsynced to a local WAL file, then batched to the database
+    memory = "memory"  # buffered in memory only; lost if the process dies first
+
+
+# Read-only actions whose audit rows need not share the request transaction. Everything
+# else is written synchronously with the change it records.
+_READ_ACTIONS = frozenset({"download_doc", "export", "audit_query"})
+
+
+def audit(
+    db: Session,
+    *,
+    actor: str,
+    action: str,
+    deal_id: str | None,
+    metadata: dict,
+    durability: Durability | None = None,
+) -> None:
+    if durability is None:
+        durability = Durability(settings.audit_read_durability) if action in _READ_ACTIONS else Durability.sync
+    entry = {"actor": actor, "action": action, "deal_id": deal_id, "metadata_json": metadata, "created_at": now_utc()}
+    if durability is not Durability.sync:
+        if get_audit_writer(db.get_bind(), durability).submit(entry):
+            AUDIT_ENTRIES.inc(path=durability.value)
+            return
+        # Buffer still full after the back-pressure wait: write in the request instead.
+        AUDIT_ENTRIES.inc(path="overflow")
+    else:
+        AUDIT_ENTRIES.inc(path="sync")
+    db.add(AuditLog(**entry))
+
+
+class AuditWriter:
+    """Buffers audit entries and writes them to ``audit_logs`` in batches.
+
+    A background thread flushes every ``flush_interval`` seconds, or sooner once
+    ``batch_size`` entries are waiting. Postgres gets one COPY per batch; other databases
+    get a multi-row INSERT. A failed flush keeps its batch and retries it on the next tick.
+
+    With ``wal_dir`` set, ``submit`` appends each entry to a per-process WAL file and
+    fsyncs it before returning. Each flush first renames that file aside. The renamed
+    file is deleted once its batch is committed. On startup, files left by dead processes
+    are replayed, so entries survive a crash. Delivery is at least once: a crash between
+    commit and delete replays that batch.
+
+    ``capacity`` bounds the entries that are buffered but not yet written. When it is
+    reached, ``submit`` waits up to ``submit_timeout`` seconds for a flush and then
+    returns False, and the caller writes the entry itself.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        wal_dir: Path | None = None,
+        capacity: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        submit_timeout: float = 0.5,
+    ):
+        self.engine = engine
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.submit_timeout = submit_timeout
+        self._cond = threading.Condition()
+        self._pending: list[dict] = []
+        self._size = 0  # pending + batches not yet committed
+        self._batches: deque[tuple[list[dict], Path | None]] = deque()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        self._wal_dir = wal_dir
+        self._wal: io.TextIOWrapper | None = None
+        self._seq = 0
+        if wal_dir is not None:
+            wal_dir.mkdir(parents=True, exist_ok=True)
+            self._recover()
+            self._wal = open(self._wal_path, "a", encoding="utf-8")
+
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def _wal_path(self) -> Path:
+        return self._wal_dir / f"{os.getpid()}.wal"
+
+    @property
+    def buffered(self) -> int:
+        with self._cond:
+            return self._size
+
+    def submit(self, entry: dict) -> bool:
+        deadline = time.monotonic() + self.submit_timeout
+        with self._cond:
+            while self._size >= self.capacity:
+                self._wake.set()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop.is_set():
+                    return False
+                self._cond.wait(remaining)
+            if self._wal is not None:
+                self._wal.write(json.dumps(entry, default=str) + "\n")
+                self._wal.flush()
+                os.fsync(self._wal.fileno())
+            self._pending.append(entry)
+            self._size += 1
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+        return True
+
+    def flush(self) -> int:
+        """Write everything submitted so far; returns the number of entries written."""
+        written = 0
+        with self._flush_lock:
+            with self._cond:
+                if self._pending:
+                    self._batches.append((self._pending, self._rotate_wal()))
+                    self._pending = []
+            while self._batches:
+                entries, path = self._batches[0]
+                start = time.perf_counter()
+                self._write(entries)
+                AUDIT_FLUSH_SECONDS.observe(time.perf_counter() - start)
+                self._batches.popleft()
+                if path is not None:
+                    path.unlink(missing_ok=True)
+                with self._cond:
+                    self._size -= len(entries)
+                    self._cond.notify_all()
+                written += len(entries)
+        return written
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5.0)
+        try:
+            self.flush()
+        except Exception as exc:
+            # Entries in WAL files are replayed on next start; memory-only ones are lost.
+            log("error", "audit flush failed at shutdown", error=type(exc).__name__, buffered=self.buffered)
+        if self._wal is not None:
+            self._wal.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as exc:
+                log("warning", "audit flush failed; will retry", error=type(exc).__name__, buffered=self.buffered)
+
+    def _write(self, entries: list[dict]) -> None:
+        with self.engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                cursor = conn.connection.driver_connection.cursor()
+                with cursor.copy(f"COPY audit_logs ({', '.join(_COLUMNS)}) FROM STDIN") as copy:
+                    for e in entries:
+                        copy.write_row(
+                            (e["actor"], e["action"], e["deal_id"], json.dumps(e["metadata_json"], default=str), e["created_at"])
+                        )
+            else:
+                conn.execute(insert(AuditLog), entries)
+
+    def _rotate_wal(self) -> Path | None:
+        # Called with _cond held: the renamed file holds exactly the entries being batched.
+        if self._wal is None:
+            return None
+        self._wal.close()
+        self._seq += 1
+        batch_path = self._wal_dir / f"{os.getpid()}.{self._seq}.batch"
+        os.replace(self._wal_path, batch_path)
+        self._wal = open(self._wal_path, "a", encoding="utf-8")
+        return batch_path
+
+    def _recover(self) -> None:
+        """Queue WAL files left by processes that are no longer running."""
+        for path in sorted(self._wal_dir.iterdir()):
+            owner = path.name.split(".", 1)[0]
+            if not owner.isdigit() or (int(owner) != os.getpid() and _pid_alive(int(owner))):
+                continue
+            # Renaming claims the file, so only one starting worker replays it. The name must
+            # not collide with another leftover file: a restarted worker may reuse the dead
+            # process's pid, and os.replace would silently overwrite it.
+            claimed = self._wal_dir / f"{os.getpid()}.claimed-{uuid.uuid4().hex}.batch"
+            try:
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                continue
+            entries = _read_wal(claimed)
+            self._batches.append((entries, claimed))
+            self._size += len(entries)
+            if entries:
+                log("info", "replaying audit WAL", path=str(claimed), entries=len(entries))
+
+
+def _read_wal(path: Path) -> list[dict]:
+    entries = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue  # torn final line from a crash mid-write; it was never acknowledged
+        entry["created_at"] = dt.datetime.fromisoformat(entry["created_at"])
+        entries.append(entry)
+    return entries
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+_writers: dict[tuple[Engine, Durability], AuditWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_audit_writer(engine: Engine, durability: Durability) -> AuditWriter:
+    """Process-wide writer for ``engine`` and ``durability`` (wal or memory), started on first use."""
+    with _writers_lock:
+        writer = _writers.get((engine, durability))
+        if writer is None:
+            wal_dir = None
+            if durability is Durability.wal:
+                wal_dir = Path(settings.audit_wal_dir or Path(settings.storage_root) / ".audit-wal")
+            writer = AuditWriter(
+                engine,
+                wal_dir=wal_dir,
+                capacity=settings.audit_buffer_capacity,
+                batch_size=settings.audit_batch_size,
+                flush_interval=settings.audit_flush_interval_seconds,
+                submit_timeout=settings.audit_submit_timeout_seconds,
+            )
+            _writers[(engine, durability)] = writer
+        return writer
+
+
+def close_audit_writers() -> None:
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
 
-def audit(db: Session, *, actor: str, action: str, deal_id: str | None, metadata: dict) -> None:
-    db.add(
-        AuditLog(
-            actor=actor,
-            action=action,
-            deal_id=deal_id,
-            metadata_json=metadata,
-            created_at=now_utc(),
-        )
-    )
+atexit.register(close_audit_writers)
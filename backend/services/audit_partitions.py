@@ -0,0 +1,185 @@
+"""Monthly partitions of ``audit_logs`` (Postgres): creation ahead of time and retention.
+
+Run daily, e.g. from cron::
+
+    python -m backend.services.audit_partitions --months-ahead 3 --retention-months 84
+
+Rows that arrive for a month with no partition yet land in ``audit_logs_default`` and
+move to the month's partition when this job creates it. Partitions older than the
+retention window are exported to storage as gzipped JSON lines, then detached and dropped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import re
+import zlib
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+
+from backend.core.config import settings
+from backend.core.logging import log
+from backend.storage import StorageClient, get_storage
+from backend.utils.time import now_utc
+
+PARENT = "audit_logs"
+DEFAULT_PARTITION = "audit_logs_default"
+_PARTITION_RE = re.compile(r"^audit_logs_(\d{4})_(\d{2})$")
+# Storage "deal" under which archives are saved.
+ARCHIVE_OWNER = "_audit_archive"
+
+
+def month_start(day: dt.date) -> dt.date:
+    return day.replace(day=1)
+
+
+def add_months(month: dt.date, n: int) -> dt.date:
+    index = month.year * 12 + month.month - 1 + n
+    return dt.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: dt.date) -> str:
+    return f"{PARENT}_{month:%Y_%m}"
+
+
+def existing_partitions(conn: Connection) -> dict[str, dt.date]:
+    """Monthly partitions of ``audit_logs`` by name, with the month each covers."""
+    rows = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent"
+        ),
+        {"parent": PARENT},
+    ).scalars()
+    months = {}
+    for name in rows:
+        match = _PARTITION_RE.match(name)
+        if match:
+            months[name] = dt.date(int(match.group(1)), int(match.group(2)), 1)
+    return months
+
+
+def create_partition(conn: Connection, month: dt.date) -> None:
+    """Create ``month``'s partition, moving any of its rows out of the default partition.
+
+    A range that overlaps rows in the default partition cannot be attached directly, so
+    the table is built standalone, filled, then attached.
+    """
+    name, start, end = partition_name(month), month.isoformat(), add_months(month, 1).isoformat()
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :start AND created_at < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"start": start, "end": end},
+    )
+    conn.execute(text(f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"))
+
+
+def ensure_partitions(conn: Connection, *, months_ahead: int = 3, today: dt.date | None = None) -> list[str]:
+    """Create partitions for the current month and ``months_ahead`` after it."""
+    current = month_start(today or now_utc().date())
+    have = set(existing_partitions(conn))
+    created = []
+    for n in range(months_ahead + 1):
+        month = add_months(current, n)
+        if partition_name(month) not in have:
+            create_partition(conn, month)
+            created.append(partition_name(month))
+    return created
+
+
+def archive_expired(
+    conn: Connection,
+    *,
+    retention_months: int,
+    storage: StorageClient | None = None,
+    today: dt.date | None = None,
+) -> list[dict]:
+    """Export, detach and drop partitions that ended more than ``retention_months`` ago.
+
+    With ``storage`` None, expired partitions are dropped without an archive.
+    """
+    cutoff = add_months(month_start(today or now_utc().date()), -retention_months)
+    archived = []
+    for name, month in sorted(existing_partitions(conn).items(), key=lambda item: item[1]):
+        if add_months(month, 1) > cutoff:
+            continue
+        entry: dict = {"partition": name, "month": month.isoformat()}
+        if storage is not None:
+            # Per statement: Connection.execution_options() modifies the connection in place,
+            # and a streamed (server-side cursor) DETACH/DROP below would be rejected.
+            rows = conn.execute(
+                text(
+                    "SELECT id, actor, action, deal_id, metadata_json, created_at "
+                    f"FROM {name} ORDER BY created_at, id"
+                ),
+                execution_options={"yield_per": 5_000},
+            )
+            # Compressed as rows stream in, so only the (much smaller) gzip output is held.
+            gz = zlib.compressobj(wbits=31)
+            chunks, count = [], 0
+            for row in rows.mappings():
+                chunks.append(gz.compress(json.dumps(dict(row), default=str, separators=(",", ":")).encode() + b"\n"))
+                count += 1
+            chunks.append(gz.flush())
+            path = storage.save(ARCHIVE_OWNER, f"{name}.jsonl.gz", b"".join(chunks))
+            entry.update(rows=count, archive=str(path))
+        conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        conn.execute(text(f"DROP TABLE {name}"))
+        archived.append(entry)
+    return archived
+
+
+def is_partitioned(engine: Engine) -> bool:
+    if engine.dialect.name != "postgresql":
+        return False
+    with engine.connect() as conn:
+        return bool(
+            conn.execute(
+                text("SELECT 1 FROM pg_partitioned_table t JOIN pg_class c ON c.oid = t.partrelid WHERE c.relname = :parent"),
+                {"parent": PARENT},
+            ).first()
+        )
+
+
+def maintain(engine: Engine, *, months_ahead: int, retention_months: int, archive: bool = True) -> dict:
+    """One maintenance pass: upcoming partitions, then retention (0 keeps everything)."""
+    if not is_partitioned(engine):
+        return {"created": [], "archived": []}
+    with engine.begin() as conn:
+        # One maintenance run at a time across workers and cron.
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('audit_logs_partitions'))"))
+        created = ensure_partitions(conn, months_ahead=months_ahead)
+        archived = []
+        if retention_months > 0:
+            archived = archive_expired(conn, retention_months=retention_months, storage=get_storage() if archive else None)
+    for name in created:
+        log("info", "audit partition created", partition=name)
+    for entry in archived:
+        log("info", "audit partition archived", **entry)
+    return {"created": created, "archived": archived}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Create upcoming audit_logs partitions and apply retention.")
+    parser.add_argument("--months-ahead", type=int, default=settings.audit_partition_months_ahead)
+    parser.add_argument("--retention-months", type=int, default=settings.audit_retention_months, help="0 keeps everything")
+    parser.add_argument("--no-archive", action="store_true", help="Drop expired partitions without exporting them")
+    args = parser.parse_args(argv)
+    engine = create_engine(settings.database_url)
+    try:
+        maintain(engine, months_ahead=args.months_ahead, retention_months=args.retention_months, archive=not args.no_archive)
+    finally:
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
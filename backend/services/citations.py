@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+from backend.models.document import Document
+
+_WORD_RE = re.compile(r"\S+")
+_NGRAM = 3
+_CACHE_SIZE = 256
+
+
+class CitationIndex:
+    """Word-trigram index over a document's prompt segment.
+
+    Snippets (from the LLM or the stub) are whitespace-normalised, case may differ, and
+    the first and last words are often cut mid-word. ``resolve`` therefore anchors on
+    the snippet's inner words via the trigram table, verifies the run, and then extends
+    the span over the partial words at either end.
+    """
+
+    def __init__(self, text: str, page_offsets: list[int] | None = None):
+        self.text = text
+        self.page_offsets = page_offsets or [0]
+        self._spans: list[tuple[int, int]] = []
+        self._words: list[str] = []
+        for m in _WORD_RE.finditer(text):
+            self._spans.append(m.span())
+            self._words.append(m.group().lower())
+        self._grams: dict[tuple[str, ...], list[int]] = {}
+        for i in range(len(self._words) - _NGRAM + 1):
+            self._grams.setdefault(tuple(self._words[i : i + _NGRAM]), []).append(i)
+
+    def page_for(self, offset: int) -> int:
+        """1-based page containing ``offset``."""
+        return max(1, bisect.bisect_right(self.page_offsets, offset))
+
+    def resolve(self, snippet: str) -> tuple[int, int] | None:
+        """Character span of ``snippet`` in the text, or None if it does not occur."""
+        words = snippet.lower().split()
+        if not words:
+            return None
+        # Inner words are whole; the edges may be fragments.
+        inner = words[1:-1] if len(words) > _NGRAM + 1 else words
+        if len(inner) < _NGRAM:
+            return self._resolve_short(snippet)
+
+        for i in self._grams.get(tuple(inner[:_NGRAM]), ()):
+            if self._words[i : i + len(inner)] != inner:
+                continue
+            start = self._spans[i][0]
+            end = self._spans[i + len(inner) - 1][1]
+            if inner is not words:
+                first, last = words[0], words[-1]
+                if i > 0 and self._words[i - 1].endswith(first):
+                    start = self._spans[i - 1][1] - len(first)
+                j = i + len(inner)
+                if j < len(self._words) and self._words[j].startswith(last):
+                    end = self._spans[j][0] + len(last)
+            return start, end
+        return None
+
+    def _resolve_short(self, snippet: str) -> tuple[int, int] | None:
+        # Too few words for the trigram table; a direct scan is cheap for these.
+        pattern = r"\s+".join(re.escape(w) for w in snippet.split())
+        m = re.search(pattern, self.text, re.IGNORECASE)
+        return m.span() if m else None
+
+
+_cache: OrderedDict[str, CitationIndex] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_citation_index(doc: Document) -> CitationIndex:
+    """Index for ``doc``'s current segment, from a per-process LRU keyed by segment hash."""
+    key = doc.segment_sha256 or ""
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            return index
+    index = CitationIndex(doc.prompt_segment or "", doc.page_offsets)
+    if key:
+        with _cache_lock:
+            _cache[key] = index
+            while len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+    return index
+
+
+def resolve_citations(docs: Iterable[Document], citations: dict[str, list[str] | None]) -> dict[str, list[dict]]:
+    """Map each field's snippets to ``{document_id, page, start, end}`` spans.
+
+    Offsets are into the document's ``prompt_segment``. Snippets that cannot be located
+    are returned with ``document_id`` None so the UI can still show the text.
+    """
+    indexed = [(doc, get_citation_index(doc)) for doc in docs]
+    out: dict[str, list[dict]] = {}
+    for field, snippets in (citations or {}).items():
+        spans = []
+        for snippet in snippets or []:
+            span = {"snippet": snippet, "document_id": None, "page": None, "start": None, "end": None}
+            for doc, index in indexed:
+                found = index.resolve(snippet)
+                if found:
+                    span.update(document_id=doc.id, page=index.page_for(found[0]), start=found[0], end=found[1])
+                    break
+            spans.append(span)
+        if spans:
+            out[field] = spans
+    return out
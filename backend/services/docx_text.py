@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Iterator
+from xml.etree.ElementTree import iterparse
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BODY = _W + "body"
+_P = _W + "p"
+_T = _W + "t"
+_TAB = _W + "tab"
+_BREAKS = {_W + "br", _W + "cr"}
+_TBL = _W + "tbl"
+_TR = _W + "tr"
+_TC = _W + "tc"
+
+CELL_SEPARATOR = " | "
+
+
+def iter_docx_blocks(source: Path | BinaryIO) -> Iterator[str]:
+    """Yield the text of a DOCX body in document order, one block per paragraph or table row.
+
+    ``word/document.xml`` is parsed incrementally straight out of the zip, and each block
+    is dropped from the tree once emitted, so memory stays flat regardless of page count.
+    Table rows come out as their cells joined by ``" | "`` (a cell's own paragraphs are
+    joined by spaces); a nested table is folded into the cell that contains it.
+    """
+    with zipfile.ZipFile(source) as zf, zf.open("word/document.xml") as xml:
+        body = None
+        # One entry per open table row / cell, innermost last.
+        rows: list[list[str]] = []
+        cells: list[list[str]] = []
+
+        for event, el in iterparse(xml, events=("start", "end")):
+            tag = el.tag
+            if event == "start":
+                if tag == _TR:
+                    rows.append([])
+                elif tag == _TC:
+                    cells.append([])
+                elif tag == _BODY:
+                    body = el
+                continue
+
+            if tag == _P:
+                text = _paragraph_text(el)
+                # Clear so an enclosing paragraph (text boxes) does not repeat this text.
+                el.clear()
+                if cells:
+                    if text.strip():
+                        cells[-1].append(text.strip())
+                elif text.strip():
+                    yield text
+                    if body is not None:
+                        body.clear()
+            elif tag == _TC:
+                rows[-1].append(" ".join(cells.pop()))
+            elif tag == _TR:
+                row = [c for c in rows.pop() if c]
+                if not row:
+                    continue
+                line = CELL_SEPARATOR.join(row)
+                if cells:
+                    cells[-1].append(line)
+                else:
+                    yield line
+            elif tag == _TBL and not rows and body is not None:
+                body.clear()
+
+
+def extract_docx_text(source: Path | BinaryIO) -> str:
+    return "\n".join(iter_docx_blocks(source))
+
+
+def _paragraph_text(p) -> str:
+    parts: list[str] = []
+    for node in p.iter():
+        tag = node.tag
+        if tag == _T:
+            if node.text:
+                parts.append(node.text)
+        elif tag == _TAB:
+            parts.append("\t")
+        elif tag in _BREAKS:
+            parts.append("\n")
+    return "".join(parts)
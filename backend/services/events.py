@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import queue
+import threading
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Callable
+
+from backend.core.config import settings
+from backend.core.logging import log
+
+# Postgres NOTIFY payloads are capped at 8000 bytes.
+_MAX_NOTIFY_BYTES = 7900
+CHANNEL = "deal_events"
+# Internal NOTIFY message listing deals that have subscribers on the sending worker.
+_WATCH = "_watch"
+
+
+class Subscription:
+    """One client's view of a deal's events: a bounded queue fed from any thread."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self._loop = loop
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def _put(self, event: dict) -> None:
+        # Runs on the subscriber's loop. A slow client loses its oldest events rather
+        # than blocking publishers or growing without bound.
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    def deliver(self, event: dict) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # loop closed; the subscription is going away
+
+    async def get(self, timeout: float | None = None) -> dict | None:
+        """Next event, or None after ``timeout`` seconds without one."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InProcessEventBus:
+    """Per-deal fan-out to subscribers in this process.
+
+    ``publish`` is safe from request handlers, threadpool workers and extraction
+    callbacks alike. With several API workers each only sees its own events; use
+    ``PostgresEventBus`` there.
+    """
+
+    def __init__(self, *, queue_size: int = 256):
+        self.queue_size = queue_size
+        self._subs: dict[str, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, deal_id: str, event_type: str, **data: object) -> None:
+        self._deliver({"type": event_type, "deal_id": deal_id, "ts": time.time(), **data})
+
+    def _deliver(self, event: dict) -> None:
+        with self._lock:
+            subs = list(self._subs.get(event["deal_id"], ()))
+        for sub in subs:
+            sub.deliver(event)
+
+    @asynccontextmanager
+    async def subscribe(self, deal_id: str) -> AsyncIterator[Subscription]:
+        sub = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subs.setdefault(deal_id, set()).add(sub)
+        try:
+            yield sub
+        finally:
+            with self._lock:
+                subs = self._subs.get(deal_id)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._subs[deal_id]
+
+    def subscriber_count(self, deal_id: str) -> int:
+        with self._lock:
+            return len(self._subs.get(deal_id, ()))
+
+    def has_subscribers(self, deal_id: str) -> bool:
+        """Whether anyone is watching ``deal_id``; producers skip costly progress otherwise."""
+        return self.subscriber_count(deal_id) > 0
+
+    def close(self) -> None:
+        pass
+
+
+class PostgresEventBus(InProcessEventBus):
+    """Event bus shared by every API worker through Postgres LISTEN/NOTIFY.
+
+    ``publish`` only queues the event; a sender thread that owns the NOTIFY connection
+    sends it, so a slow round-trip never blocks the event loop. One listener thread per
+    process receives every notification, including its own, and fans it out to local
+    subscribers. Events are best-effort, like the in-process bus: a full send queue drops
+    new events, and if the listener connection drops, it reconnects and events sent in
+    the meantime are lost. Clients re-read deal_detail after reconnecting.
+
+    The sender also announces every ``watch_interval`` seconds which deals have local
+    subscribers, so ``has_subscribers`` is true on every worker while anyone is watching.
+    """
+
+    def __init__(self, dsn: str, *, queue_size: int = 256, send_queue_size: int = 10_000, watch_interval: float = 5.0):
+        super().__init__(queue_size=queue_size)
+        import psycopg
+
+        self._psycopg = psycopg
+        # SQLAlchemy URL -> libpq DSN.
+        self._dsn = dsn.replace("postgresql+psycopg://", "postgresql://", 1)
+        self._outbox: queue.Queue[str] = queue.Queue(maxsize=send_queue_size)
+        self.watch_interval = watch_interval
+        # deal_id -> monotonic time another worker last reported a subscriber.
+        self._remote_watch: dict[str, float] = {}
+        self._closed = threading.Event()
+        self._sender = threading.Thread(target=self._send, name="deal-events-sender", daemon=True)
+        self._listener = threading.Thread(target=self._listen, name="deal-events-listener", daemon=True)
+        self._sender.start()
+        self._listener.start()
+
+    def publish(self, deal_id: str, event_type: str, **data: object) -> None:
+        payload = json.dumps({"type": event_type, "deal_id": deal_id, "ts": time.time(), **data}, default=str)
+        if len(payload.encode()) > _MAX_NOTIFY_BYTES:
+            log("warning", "event too large for NOTIFY; dropped", deal_id=deal_id, type=event_type)
+            return
+        try:
+            self._outbox.put_nowait(payload)
+        except queue.Full:
+            log("warning", "event send queue full; dropped", deal_id=deal_id, type=event_type)
+
+    @asynccontextmanager
+    async def subscribe(self, deal_id: str) -> AsyncIterator[Subscription]:
+        async with super().subscribe(deal_id) as sub:
+            # Tell the other workers now rather than at the next periodic announcement.
+            try:
+                self._outbox.put_nowait(self._watch_payloads([deal_id])[0])
+            except queue.Full:
+                pass  # the periodic announcement covers it
+            yield sub
+
+    def has_subscribers(self, deal_id: str) -> bool:
+        if super().has_subscribers(deal_id):
+            return True
+        seen = self._remote_watch.get(deal_id)
+        return seen is not None and time.monotonic() - seen < 3 * self.watch_interval
+
+    @staticmethod
+    def _watch_payloads(deal_ids: list[str]) -> list[str]:
+        # Deal ids are uuids; 150 of them keep a payload well under the NOTIFY limit.
+        return [
+            json.dumps({"type": _WATCH, "deal_ids": deal_ids[i : i + 150]})
+            for i in range(0, len(deal_ids), 150)
+        ]
+
+    def _send(self) -> None:
+        conn = None
+        next_watch = 0.0
+        while not self._closed.is_set():
+            payloads = []
+            if time.monotonic() >= next_watch:
+                with self._lock:
+                    watched = list(self._subs)
+                payloads += self._watch_payloads(watched)
+                next_watch = time.monotonic() + self.watch_interval
+            try:
+                payloads.append(self._outbox.get(timeout=min(1.0, self.watch_interval)))
+            except queue.Empty:
+                pass
+            for payload in payloads:
+                for attempt in range(2):
+                    try:
+                        if conn is None or conn.closed:
+                            conn = self._psycopg.connect(self._dsn, autocommit=True)
+                        conn.execute("SELECT pg_notify(%s, %s)", (CHANNEL, payload))
+                        break
+                    except self._psycopg.OperationalError:
+                        conn = None
+                        if attempt:
+                            log("warning", "event publish failed")
+        if conn is not None:
+            conn.close()
+
+    def _receive(self, event: dict) -> None:
+        if event.get("type") == _WATCH:
+            now = time.monotonic()
+            for deal_id in event["deal_ids"]:
+                self._remote_watch[deal_id] = now
+            # Forget deals nobody has announced for a while.
+            stale = now - 3 * self.watch_interval
+            for deal_id in [d for d, seen in self._remote_watch.items() if seen < stale]:
+                self._remote_watch.pop(deal_id, None)
+            return
+        self._deliver(event)
+
+    def _listen(self) -> None:
+        while not self._closed.is_set():
+            try:
+                with self._psycopg.connect(self._dsn, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {CHANNEL}")
+                    while not self._closed.is_set():
+                        # The timeout lets close() stop the thread.
+                        for notify in conn.notifies(timeout=1.0):
+                            try:
+                                self._receive(json.loads(notify.payload))
+                            except (ValueError, KeyError):
+                                continue
+            except self._psycopg.OperationalError as exc:
+                log("warning", "event listener disconnected; retrying", error=str(exc))
+                self._closed.wait(1.0)
+
+    def close(self) -> None:
+        self._closed.set()
+        self._sender.join(timeout=5.0)
+
+
+@lru_cache(maxsize=1)
+def get_event_bus() -> InProcessEventBus:
+    if settings.event_bus == "postgres":
+        return PostgresEventBus(settings.database_url, queue_size=settings.events_queue_size)
+    return InProcessEventBus(queue_size=settings.events_queue_size)
+
+
+def publish(deal_id: str, event_type: str, **data: object) -> None:
+    get_event_bus().publish(deal_id, event_type, **data)
+
+
+def token_progress(deal_id: str, stage: str, *, every: int = 32, **extra: object) -> Callable[[int], None] | None:
+    """``on_progress`` callback for LLM clients that publishes every ``every`` tokens.
+
+    None when nobody is watching the deal, so clients make a plain (non-streaming) call.
+    """
+    if not get_event_bus().has_subscribers(deal_id):
+        return None
+    last = 0
+
+    def report(tokens: int) -> None:
+        nonlocal last
+        if tokens - last >= every:
+            last = tokens
+            publish(deal_id, "llm", stage=stage, tokens=tokens, **extra)
+
+    return report
+
+
+def format_sse(event: dict, event_id: int) -> str:
+    return f"id: {event_id}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
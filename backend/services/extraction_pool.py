@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Callable, Iterator
+
+from backend.core import tracing
+from backend.core.config import settings
+from backend.core.logging import log
+from backend.services.text_extraction import iter_text_pages
+
+# Document.extraction_status values.
+STATUS_OK = "ok"
+STATUS_TIMEOUT = "timeout"
+STATUS_MEMORY_LIMIT = "memory_limit"
+STATUS_ERROR = "error"
+
+_POLL_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class ExtractionResult:
+    pages: list[str]
+    status: str = STATUS_OK
+    error: str | None = None
+    elapsed_ms: float = 0.0
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.pages)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+
+def _worker_main(conn: Connection, target: Callable[[bytes | Path, str], Iterator[str]]) -> None:
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        data, suffix = job
+        try:
+            for page in target(data, suffix):
+                conn.send(("page", page))
+        except MemoryError:
+            conn.send(("error", (STATUS_MEMORY_LIMIT, "MemoryError")))
+        except Exception as exc:
+            conn.send(("error", (STATUS_ERROR, f"{type(exc).__name__}: {exc}")))
+        else:
+            conn.send(("done", None))
+
+
+def _rss_bytes(pid: int) -> int | None:
+    # Linux only; elsewhere the wall-clock limit is the only guard.
+    try:
+        with open(f"/proc/{pid}/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+class _Worker:
+    def __init__(self, ctx, target: Callable[[bytes | Path, str], Iterator[str]]):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, target), daemon=True, name="extract-worker")
+        self.process.start()
+        child.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+
+class ExtractionPool:
+    """Text extraction in isolated worker processes with per-document limits.
+
+    Parsers (pdfplumber in particular) can spin or balloon on malformed input; running
+    them here keeps that out of the API process. Each document gets a wall-clock budget
+    and an RSS cap; a worker that exceeds either is killed and replaced, and the pages
+    it had already produced are returned with a non-``ok`` status. A worker that fails
+    cleanly (parser exception) is reused. If a replacement cannot be started, the slot
+    is refilled on a later ``extract``; a document that waits more than
+    ``queue_timeout_seconds`` for a free worker fails with status ``error``.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        *,
+        timeout_seconds: float = 60.0,
+        max_rss_bytes: int | None = None,
+        queue_timeout_seconds: float = 300.0,
+        target: Callable[[bytes | Path, str], Iterator[str]] = iter_text_pages,
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.max_rss_bytes = max_rss_bytes
+        self._target = target
+        # spawn: the API process is multi-threaded, so fork is not safe.
+        self._ctx = mp.get_context("spawn")
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._missing = 0  # slots whose replacement worker failed to start
+        for _ in range(max(1, size)):
+            self._idle.put(_Worker(self._ctx, target))
+
+    @tracing.traced("extract_text.sandboxed")
+    def extract(self, data: bytes | Path, suffix: str, *, timeout_seconds: float | None = None) -> ExtractionResult:
+        """Extract ``data`` (bytes, or a local file the worker reads itself); blocks until a
+        worker is free, then for at most the timeout."""
+        self._refill()
+        try:
+            worker = self._idle.get(timeout=self.queue_timeout_seconds)
+        except queue.Empty:
+            tracing.set_attribute("extraction.status", STATUS_ERROR)
+            return ExtractionResult(
+                pages=[], status=STATUS_ERROR, error=f"no extraction worker free within {self.queue_timeout_seconds:g}s"
+            )
+        replace = False
+        start = time.monotonic()
+        try:
+            result, replace = self._run(worker, data, suffix, start + (timeout_seconds or self.timeout_seconds))
+        except (EOFError, OSError) as exc:
+            # The worker died under us (e.g. killed by the OOM killer).
+            replace = True
+            result = ExtractionResult(pages=[], status=STATUS_ERROR, error=f"worker exited: {type(exc).__name__}")
+        finally:
+            if replace or not worker.process.is_alive():
+                worker.kill()
+                worker = self._spawn()
+            if worker is not None:
+                self._release(worker)
+
+        elapsed_ms = (time.monotonic() - start) * 1000.0
+        tracing.set_attribute("extraction.status", result.status)
+        return ExtractionResult(pages=result.pages, status=result.status, error=result.error, elapsed_ms=elapsed_ms)
+
+    def _run(self, worker: _Worker, data: bytes | Path, suffix: str, deadline: float) -> tuple[ExtractionResult, bool]:
+        pages: list[str] = []
+        worker.conn.send((data, suffix))
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return ExtractionResult(pages, STATUS_TIMEOUT, f"exceeded {self.timeout_seconds:g}s"), True
+            if self.max_rss_bytes is not None:
+                rss = _rss_bytes(worker.process.pid)
+                if rss is not None and rss > self.max_rss_bytes:
+                    return ExtractionResult(pages, STATUS_MEMORY_LIMIT, f"worker RSS {rss // (1024 * 1024)} MiB"), True
+            if not worker.conn.poll(min(_POLL_SECONDS, remaining)):
+                continue
+
+            kind, payload = worker.conn.recv()
+            if kind == "page":
+                pages.append(payload)
+            elif kind == "done":
+                return ExtractionResult(pages), False
+            else:
+                status, message = payload
+                # Recycle after MemoryError: the worker heap may be fragmented or huge.
+                return ExtractionResult(pages, status, message), status == STATUS_MEMORY_LIMIT
+
+    def _spawn(self) -> _Worker | None:
+        """Start a replacement worker; on failure the slot is refilled by a later ``extract``."""
+        try:
+            return _Worker(self._ctx, self._target)
+        except Exception as exc:
+            # Often the same memory pressure that got the previous worker killed.
+            with self._lock:
+                self._missing += 1
+            log("warning", "extraction worker failed to start", error=f"{type(exc).__name__}: {exc}")
+            return None
+
+    def _refill(self) -> None:
+        with self._lock:
+            missing, self._missing = self._missing, 0
+        for left in range(missing, 0, -1):
+            worker = self._spawn()
+            if worker is None:
+                # _spawn counted this slot again; the ones not yet tried stay missing too.
+                with self._lock:
+                    self._missing += left - 1
+                return
+            self._release(worker)
+
+    def _release(self, worker: _Worker) -> None:
+        with self._lock:
+            if self._closed:
+                worker.stop()
+                return
+        self._idle.put(worker)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                return
+
+
+@lru_cache(maxsize=1)
+def get_extraction_pool() -> ExtractionPool:
+    """Process-wide extraction pool, started on first use."""
+    return ExtractionPool(
+        settings.extraction_workers,
+        timeout_seconds=settings.extraction_timeout_seconds,
+        max_rss_bytes=settings.extraction_max_rss_mb * 1024 * 1024 if settings.extraction_max_rss_mb else None,
+        queue_timeout_seconds=settings.extraction_queue_timeout_seconds,
+    )
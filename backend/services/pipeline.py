@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from typing import Iterable
+
+from backend.models.document import Document
+from backend.utils.hashing import sha256_text
+
+# Stage order for POST /deals/{id}/pipeline; each consumes the previous stage's output.
+STAGES = ("extract", "analyze", "draft")
+
+# StageOutcome.status values.
+RAN = "ran"
+SKIPPED = "skipped"
+BLOCKED = "blocked"
+
+
+@dataclass(frozen=True)
+class StageOutcome:
+    stage: str
+    status: str
+    input_hash: str | None = None
+    reason: str | None = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def stable_hash(obj: object) -> str:
+    """sha256 of ``obj`` as canonical JSON (sorted keys, no whitespace)."""
+    return sha256_text(json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str))
+
+
+def extract_input_hash(docs: Iterable[Document], *, prompt: str, model: str) -> str:
+    """Inputs of the extract stage: the documents' prompt segments, in merge order."""
+    return stable_hash({"segments": [d.segment_sha256 for d in docs], "prompt": prompt, "model": model})
+
+
+def analysis_input_hash(terms_json: dict) -> str:
+    return stable_hash({"terms": terms_json})
+
+
+def draft_input_hash(prompt_for_llm: str, *, model: str) -> str:
+    # The rendered prompt already contains the terms, the analysis and the template.
+    return stable_hash({"prompt": sha256_text(prompt_for_llm), "model": model})
+
+
+def export_input_hash(deal: dict, terms: dict | None, analysis: dict | None, draft: dict | None) -> str:
+    return stable_hash({"deal": deal, "terms": terms, "analysis": analysis, "draft": draft})
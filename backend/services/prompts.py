@@ -5,8 +5,13 @@ from pathlib import Path
 from sqlalchemy.orm import Session
 
 from backend.core.config import settings
+from backend.llm.tokens import count_tokens, truncate_to_tokens
+from backend.models.document import Document
 from backend.models.prompt_version import PromptVersion
+from backend.services.redaction import REDACTION_RULES_VERSION, redact
+from backend.services.retrieval import Hit, build_deal_text, index_passages, select_passages
 from backend.utils.hashing import sha256_text
+from backend.utils.sanitize import sanitize_text
 
 
 PROMPTS_ROOT = Path(settings.prompts_root)
@@ -19,6 +24,124 @@ def load_prompt_template(name: str, version: str) -> str:
     return path.read_text(encoding="utf-8")
 
 
+def render_prompt(template: str, **values: object) -> str:
+    """Substitute ``{name}`` placeholders.
+
+    Templates embed literal JSON schemas, so ``str.format`` cannot be used on them.
+    """
+    out = template
+    for name, value in values.items():
+        out = out.replace("{" + name + "}", str(value))
+    return out
+
+
+def build_prompt_segment(filename: str, pages: str | list[str]) -> tuple[str, list[int]]:
+    """A document's contribution to the deal text: header + sanitized, redacted body.
+
+    ``pages`` is the extracted text, or its pages when the format has them. Pages are
+    sanitized and redacted one at a time so their start offsets in the segment are
+    known; those offsets are returned alongside the segment (one entry per page).
+    """
+    if isinstance(pages, str):
+        segment = redact(sanitize_text(f"--- {filename} ---\n{pages}"))
+        return segment, [segment.find("\n") + 1]
+
+    header = redact(sanitize_text(f"--- {filename} ---"))
+    parts = [header]
+    offsets: list[int] = []
+    pos = len(header) + 1
+    for page in pages:
+        body = redact(sanitize_text(page))
+        offsets.append(pos)
+        parts.append(body)
+        pos += len(body) + 1
+    return "\n".join(parts), offsets
+
+
+def set_prompt_segment(doc: Document, pages: str | list[str]) -> None:
+    segment, page_offsets = build_prompt_segment(doc.filename, pages)
+    doc.prompt_segment = segment
+    doc.page_offsets = page_offsets
+    doc.segment_sha256 = sha256_text(segment)
+    doc.redaction_version = REDACTION_RULES_VERSION
+    doc.passages_json = index_passages(segment, target_chars=settings.retrieval_passage_chars)
+
+
+def ensure_prompt_segment(doc: Document) -> str:
+    """Return the cached segment, rebuilding it if missing or redacted under older rules.
+
+    Rebuilt segments are written back onto ``doc``; the caller's commit persists them.
+    """
+    if doc.prompt_segment is None or doc.redaction_version != REDACTION_RULES_VERSION:
+        # Page boundaries are not kept on the row, so rebuilt segments are one page.
+        set_prompt_segment(doc, doc.extracted_text)
+    elif doc.passages_json is None:
+        doc.passages_json = index_passages(doc.prompt_segment, target_chars=settings.retrieval_passage_chars)
+    return doc.prompt_segment
+
+
+def join_segments(segments: list[str]) -> str:
+    return "\n\n".join(segments)
+
+
+def assemble_deal_text(docs: list[Document], *, max_tokens: int | None = None) -> tuple[str, dict]:
+    """Deal text for the extraction prompt, plus stats for audit/tracing.
+
+    Small corpora are sent whole. Above ``retrieval_full_text_max_chars`` only the top
+    BM25 passages per ExtractedTerms field group are included. With ``max_tokens``, text
+    that would not fit is cut down to the highest-scoring passages that do.
+    """
+    segments = [ensure_prompt_segment(d) for d in docs]
+    corpus_chars = sum(len(s) for s in segments) + 2 * max(0, len(segments) - 1)
+    docs_passages = [d.passages_json or [] for d in docs]
+    if not settings.retrieval_enabled or corpus_chars <= settings.retrieval_full_text_max_chars:
+        text = join_segments(segments)
+        stats = {"mode": "full", "corpus_chars": corpus_chars, "deal_text_chars": corpus_chars}
+        if max_tokens is None:
+            return text, stats
+        tokens = count_tokens(text)
+        if tokens <= max_tokens:
+            return text, {**stats, "deal_text_tokens": tokens}
+        # Too large for the model's window: rank every passage instead of sending it whole.
+        top_k = sum(len(p) for p in docs_passages)
+    else:
+        top_k = settings.retrieval_top_k
+
+    hits = select_passages(docs_passages, top_k=top_k)
+    text = build_deal_text(segments, hits)
+    stats = {"mode": "retrieval", "corpus_chars": corpus_chars, "passages": len(hits)}
+    if max_tokens is not None:
+        tokens = count_tokens(text)
+        if tokens > max_tokens:
+            text, kept = fit_passages(segments, hits, max_tokens)
+            tokens = count_tokens(text)
+            stats.update(mode="budget", passages=kept, dropped_passages=len(hits) - kept)
+        stats["deal_text_tokens"] = tokens
+    return text, {**stats, "deal_text_chars": len(text)}
+
+
+def fit_passages(segments: list[str], hits: list[Hit], max_tokens: int) -> tuple[str, int]:
+    """Deal text from the best-scoring ``hits`` that fit in ``max_tokens``, and how many.
+
+    With no passage small enough, the documents are cut off at ``max_tokens`` instead.
+    """
+    ranked = sorted(hits, key=lambda h: h.score, reverse=True)
+
+    def text_for(k: int) -> str:
+        return build_deal_text(segments, sorted(ranked[:k], key=lambda h: (h.doc_index, h.start)))
+
+    lo, hi = 0, len(ranked)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(text_for(mid)) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    if lo == 0:
+        return truncate_to_tokens(join_segments(segments), max_tokens), 0
+    return text_for(lo), lo
+
+
 def ensure_prompt_version(db: Session, *, name: str, version: str, content: str) -> PromptVersion:
     content_hash = sha256_text(content)
 
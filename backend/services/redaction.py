@@ -3,6 +3,9 @@ from __future__ import annotations
 import re
 from typing import Any
 
+from backend.core import tracing
+from backend.utils.hashing import sha256_text
+
 _EMAIL_RE = re.compile(r"\b[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}\b", re.IGNORECASE)
 
 # Simple phone heuristic: +country / leading 0, spaced/dashed blocks
@@ -14,7 +17,17 @@ _LONG_DIGITS_RE = re.compile(r"\b\d{9,}\b")
 # Very simple 'Person Name' heuristic: 2-3 capitalised words (avoid sentence-start false positives a bit)
 _NAME_RE = re.compile(r"\b([A-Z][a-z]{2,})(\s+[A-Z][a-z]{2,}){1,2}\b")
 
+# Minimum digits for a phone-like match to be masked (see _mask_phone).
+_PHONE_MIN_DIGITS = 9
+
+# Identifies the rule set. Text stamped with this version was redacted by exactly these
+# rules and needs no second pass; any edit to a pattern changes it.
+REDACTION_RULES_VERSION = sha256_text(
+    "\n".join(p.pattern for p in (_EMAIL_RE, _PHONE_RE, _LONG_DIGITS_RE, _NAME_RE)) + f"\nphone_min_digits={_PHONE_MIN_DIGITS}"
+)[:16]
+
 
+@tracing.traced("redact")
 def redact(text: str) -> str:
     """Mask obvious PII patterns.
 
@@ -22,7 +35,10 @@ def redact(text: str) -> str:
     - This is MVP-grade heuristic redaction, not a privacy guarantee.
     - Applied before sending to LLM and before persisting LLM outputs.
     """
+    return _redact(text)
 
+
+def _redact(text: str) -> str:
     if not text:
         return text
 
@@ -34,7 +50,7 @@ def redact(text: str) -> str:
     def _mask_phone(m: re.Match[str]) -> str:
         s = m.group(0)
         digits = re.sub(r"\D", "", s)
-        if len(digits) < 9:
+        if len(digits) < _PHONE_MIN_DIGITS:
             return s
         return "[REDACTED_PHONE]"
 
@@ -46,14 +62,20 @@ def redact(text: str) -> str:
     return redacted
 
 
+@tracing.traced("redact_obj")
 def redact_obj(obj: Any) -> Any:
     """Recursively redact strings in JSON-like objects."""
+    return _redact_obj(obj)
+
+
+def _redact_obj(obj: Any) -> Any:
+    # One span for the whole walk; per-string spans would swamp the trace.
     if obj is None:
         return None
     if isinstance(obj, str):
-        return redact(obj)
+        return _redact(obj)
     if isinstance(obj, list):
-        return [redact_obj(v) for v in obj]
+        return [_redact_obj(v) for v in obj]
     if isinstance(obj, dict):
-        return {k: redact_obj(v) for k, v in obj.items()}
+        return {k: _redact_obj(v) for k, v in obj.items()}
     return obj
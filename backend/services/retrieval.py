@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable
+
+# Field groups of ExtractedTerms and the vocabulary that tends to surround them in term
+# sheets and facility agreements. Each group is one BM25 query.
+FIELD_GROUPS: dict[str, str] = {
+    "amounts": (
+        "loan amount facility limit principal commitment advance interest rate coupon margin "
+        "per annum fee fees establishment line exit term months currency aud usd nzd"
+    ),
+    "collateral": (
+        "collateral security secured property site land asset valuation valuer appraised "
+        "market value as is stressed forced sale lvr loan to value"
+    ),
+    "lien": "first second ranking lien mortgage registered charge priority subordinated unsecured security",
+    "repayment": (
+        "repayment repay source exit refinance refinancing sale settlement proceeds "
+        "maturity timeline months bullet amortisation"
+    ),
+    "enforcement": (
+        "enforcement default event remedies receiver possession jurisdiction governing law "
+        "laws courts timeline months"
+    ),
+}
+
+_TOKEN_RE = re.compile(r"[a-z]+|\d+(?:[.,]\d+)*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def chunk_passages(text: str, *, target_chars: int = 1200) -> list[tuple[int, int]]:
+    """Split ``text`` into ``(start, end)`` spans of roughly ``target_chars``.
+
+    Spans break on line boundaries where possible so clauses and table rows stay whole;
+    a single line longer than the target is cut at the nearest space.
+    """
+    spans: list[tuple[int, int]] = []
+    start = 0
+    n = len(text)
+    while start < n:
+        end = min(n, start + target_chars)
+        if end < n:
+            cut = text.rfind("\n", start + target_chars // 2, end)
+            if cut == -1:
+                cut = text.rfind(" ", start + target_chars // 2, end)
+            if cut != -1:
+                end = cut + 1
+        if text[start:end].strip():
+            spans.append((start, end))
+        start = end
+    return spans
+
+
+def index_passages(text: str, *, target_chars: int = 1200) -> list[dict]:
+    """Chunk ``text`` and precompute term frequencies; stored on the Document row."""
+    passages = []
+    for start, end in chunk_passages(text, target_chars=target_chars):
+        tokens = tokenize(text[start:end])
+        passages.append({"start": start, "end": end, "len": len(tokens), "tf": dict(Counter(tokens))})
+    return passages
+
+
+@dataclass(frozen=True)
+class Hit:
+    doc_index: int
+    start: int
+    end: int
+    score: float
+
+
+class BM25Index:
+    """Okapi BM25 over the passages of a deal's documents (built per request; it is small)."""
+
+    def __init__(self, docs_passages: Iterable[list[dict]]):
+        self._entries: list[tuple[int, dict]] = [
+            (doc_index, p) for doc_index, passages in enumerate(docs_passages) for p in passages
+        ]
+        n = len(self._entries)
+        self._avg_len = (sum(p["len"] for _, p in self._entries) / n) if n else 0.0
+        df: Counter[str] = Counter()
+        for _, p in self._entries:
+            df.update(p["tf"].keys())
+        self._idf = {term: math.log(1 + (n - f + 0.5) / (f + 0.5)) for term, f in df.items()}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def search(self, query: str, k: int) -> list[Hit]:
+        terms = [t for t in set(tokenize(query)) if t in self._idf]
+        if not terms:
+            return []
+        scored: list[Hit] = []
+        for doc_index, p in self._entries:
+            tf = p["tf"]
+            norm = _K1 * (1 - _B + _B * p["len"] / self._avg_len) if self._avg_len else _K1
+            score = 0.0
+            for term in terms:
+                f = tf.get(term)
+                if f:
+                    score += self._idf[term] * f * (_K1 + 1) / (f + norm)
+            if score > 0:
+                scored.append(Hit(doc_index, p["start"], p["end"], score))
+        scored.sort(key=lambda h: h.score, reverse=True)
+        return scored[:k]
+
+
+def select_passages(docs_passages: list[list[dict]], *, top_k: int) -> list[Hit]:
+    """Top ``top_k`` passages for each field group, deduplicated, in document order."""
+    index = BM25Index(docs_passages)
+    chosen: dict[tuple[int, int], Hit] = {}
+    for query in FIELD_GROUPS.values():
+        for hit in index.search(query, top_k):
+            chosen.setdefault((hit.doc_index, hit.start), hit)
+    return sorted(chosen.values(), key=lambda h: (h.doc_index, h.start))
+
+
+def build_deal_text(segments: list[str], hits: list[Hit]) -> str:
+    """Deal text from the selected passages, keeping each document's header line.
+
+    Passages are verbatim slices of the segments, so citation snippets quoted from them
+    still match the stored text. Gaps between passages are marked with ``[...]``.
+    """
+    by_doc: dict[int, list[Hit]] = {}
+    for hit in hits:
+        by_doc.setdefault(hit.doc_index, []).append(hit)
+
+    parts: list[str] = []
+    for doc_index, doc_hits in sorted(by_doc.items()):
+        segment = segments[doc_index]
+        header_end = segment.find("\n") + 1
+        pieces = [segment[:header_end].rstrip("\n")]
+        last_end = header_end
+        for hit in doc_hits:
+            start = max(hit.start, header_end)
+            if start > last_end:
+                pieces.append("[...]")
+            pieces.append(segment[start : hit.end].strip("\n"))
+            last_end = hit.end
+        if last_end < len(segment):
+            pieces.append("[...]")
+        parts.append("\n".join(pieces))
+    return "\n\n".join(parts)
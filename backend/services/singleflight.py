@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.core import tracing
+from backend.core.config import settings
+from backend.core.logging import log
+
+T = TypeVar("T")
+
+# key -> future of the leader's result, for callers on this process's event loop.
+_in_flight: dict[tuple, asyncio.Future] = {}
+
+
+def _lock_id(key: tuple) -> int:
+    # Advisory lock ids are signed bigints.
+    digest = hashlib.sha256(repr(key).encode()).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+def _advisory_xact_lock(db: Session, key: tuple) -> bool:
+    """Take a Postgres transaction advisory lock for ``key`` on the request's connection.
+
+    The lock is released when the session's transaction ends, i.e. when the leader
+    commits its result. Returns False without locking on other databases, or if the lock
+    is not granted within ``single_flight_lock_timeout_seconds``. Callers then just go
+    ahead.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    timeout_ms = int(settings.single_flight_lock_timeout_seconds * 1000)
+    try:
+        # A savepoint, so a lock timeout does not abort the request's transaction.
+        with db.begin_nested():
+            previous = db.execute(text("SELECT current_setting('lock_timeout')")).scalar_one()
+            # is_local=true: the timeout ends with this transaction and never leaks into
+            # the pooled connection; it is restored right after for the leader's own work.
+            db.execute(text("SELECT set_config('lock_timeout', :t, true)"), {"t": f"{timeout_ms}ms"})
+            db.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": _lock_id(key)})
+            db.execute(text("SELECT set_config('lock_timeout', :t, true)"), {"t": previous})
+    except Exception as exc:  # lock_timeout -> LockNotAvailable
+        log("warning", "single-flight lock not granted; continuing without it", key=repr(key), error=type(exc).__name__)
+        return False
+    return True
+
+
+async def coalesce(
+    db: Session,
+    key: tuple,
+    compute: Callable[[], Awaitable[T]],
+    *,
+    recheck: Callable[[], T | None],
+    on_shared: Callable[[T], T] = lambda result: result,
+) -> T:
+    """Run ``compute`` once for concurrent callers with the same ``key``.
+
+    Within a process, the first caller (the leader) runs ``compute``. Later callers
+    await the leader's future and get its result passed through ``on_shared``, or its
+    exception. Across workers, the leader also takes a Postgres advisory lock on
+    ``key``. Once it holds the lock it calls ``recheck``, which returns the stored
+    result if another worker has already finished the same work, or None.
+    """
+    existing = _in_flight.get(key)
+    if existing is not None:
+        tracing.set_attribute("single_flight", "follower")
+        return on_shared(await asyncio.shield(existing))
+
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    tracing.set_attribute("single_flight", "leader")
+    try:
+        locked = await run_in_threadpool(_advisory_xact_lock, db, key)
+        result = recheck() if locked else None
+        if result is None:
+            result = await compute()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as exc:
+        future.set_exception(exc)
+        # Mark retrieved so an exception nobody else awaited is not logged as lost.
+        future.exception()
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _in_flight.pop(key, None)
@@ -0,0 +1,79 @@
+"""Storage garbage collection: abandoned uploads and unreferenced blobs.
+
+Run periodically, e.g. hourly from cron::
+
+    python -m backend.services.storage_gc
+
+Open upload sessions not written to for ``UPLOAD_SESSION_MAX_AGE_SECONDS`` are aborted,
+which also releases their staged parts (a part file or an S3 multipart upload). On the
+content-addressed store, blobs whose reference count has dropped to zero, stale temp
+files and orphaned staging files are then deleted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+
+from sqlalchemy.orm import Session
+
+from backend.core.config import settings
+from backend.core.logging import log
+from backend.db.session import SessionLocal
+from backend.models import UploadSession
+from backend.services.upload_hashes import RUNNING_HASHES
+from backend.storage import ContentAddressedStorage, StorageClient, get_storage
+from backend.utils.time import now_utc
+
+
+def expire_uploads(db: Session, storage: StorageClient, *, max_age_seconds: float) -> list[str]:
+    """Abort open upload sessions idle for longer than ``max_age_seconds``."""
+    cutoff = now_utc() - dt.timedelta(seconds=max_age_seconds)
+    sessions = (
+        db.query(UploadSession)
+        .filter(UploadSession.status == "open", UploadSession.updated_at < cutoff)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for session in sessions:
+        storage.abort_upload(dict(session.storage_state))
+        RUNNING_HASHES.discard(session.id)
+        session.status = "aborted"
+        session.updated_at = now_utc()
+    db.commit()
+    return [s.id for s in sessions]
+
+
+def collect(
+    db: Session,
+    storage: StorageClient,
+    *,
+    upload_max_age_seconds: float,
+    blob_min_age_seconds: float = 3600.0,
+) -> dict:
+    expired = expire_uploads(db, storage, max_age_seconds=upload_max_age_seconds)
+    removed = []
+    if isinstance(storage, ContentAddressedStorage):
+        # Staging files older than any live session are left over from crashed requests.
+        removed = storage.gc(min_age_seconds=blob_min_age_seconds, staging_max_age_seconds=upload_max_age_seconds)
+    log("info", "storage gc", expired_uploads=len(expired), removed_blobs=len(removed))
+    return {"expired_uploads": expired, "removed_blobs": [str(p) for p in removed]}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Abort abandoned uploads and delete unreferenced blobs.")
+    parser.add_argument("--upload-max-age-seconds", type=float, default=settings.upload_session_max_age_seconds)
+    parser.add_argument("--blob-min-age-seconds", type=float, default=3600.0)
+    args = parser.parse_args(argv)
+    with SessionLocal() as db:
+        collect(
+            db,
+            get_storage(),
+            upload_max_age_seconds=args.upload_max_age_seconds,
+            blob_min_age_seconds=args.blob_min_age_seconds,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from backend.schemas import ExtractedTerms
+
+# Fields whose per-document values are combined rather than chosen.
+_LIST_FIELDS = ("fees", "key_conditions")
+
+
+def _present(value: object) -> bool:
+    # What a single-document extraction reports when it found nothing.
+    return value is not None and value != "" and value != "unknown"
+
+
+def merge_terms(
+    outputs: list[dict],
+    *,
+    existing: dict | None = None,
+    confirmed: dict[str, bool] | None = None,
+) -> dict:
+    """Merge per-document ExtractedTerms dumps into deal-level terms.
+
+    ``outputs`` are ordered oldest document first. The rules are deterministic:
+
+    * scalar fields take the newest document's value, preferring values that came with a
+      citation (so a default such as ``currency="AUD"`` never overrides a quoted one);
+      that document's citations go with it;
+    * ``fees`` and ``key_conditions`` are the ordered union across documents;
+    * fields marked confirmed in ``confirmed`` keep their value and citations from
+      ``existing`` untouched.
+    """
+    merged = ExtractedTerms.model_validate(outputs[0] if outputs else {"collateral_type": "unknown"}).model_dump()
+    citations: dict[str, list[str] | None] = {}
+
+    for field in merged:
+        if field == "citations":
+            continue
+        if field in _LIST_FIELDS:
+            seen: list = []
+            snippets: list[str] = []
+            for out in outputs:
+                for item in out.get(field) or []:
+                    if item not in seen:
+                        seen.append(item)
+                for snippet in (out.get("citations") or {}).get(field) or []:
+                    if snippet not in snippets:
+                        snippets.append(snippet)
+            merged[field] = seen
+            citations[field] = snippets or None
+            continue
+
+        newest = list(reversed(outputs))
+        candidates = [o for o in newest if _present(o.get(field)) and (o.get("citations") or {}).get(field)]
+        candidates += [o for o in newest if _present(o.get(field)) and o not in candidates]
+        if candidates:
+            merged[field] = candidates[0][field]
+            citations[field] = (candidates[0].get("citations") or {}).get(field)
+        else:
+            citations[field] = None
+
+    for field, is_confirmed in (confirmed or {}).items():
+        if is_confirmed and existing and field in existing and field != "citations":
+            merged[field] = existing[field]
+            citations[field] = (existing.get("citations") or {}).get(field)
+
+    merged["citations"] = citations
+    return ExtractedTerms.model_validate(merged).model_dump()
@@ -1,9 +1,14 @@
+import io
 from pathlib import Path
+from typing import BinaryIO, Iterator
 
 import pdfplumber
-from docx import Document as DocxDocument
 
+from backend.core import tracing
+from backend.services.docx_text import extract_docx_text, iter_docx_blocks
 
+
+@tracing.traced("extract_text")
 def extract_text(path: Path) -> str:
     suffix = path.suffix.lower()
 
@@ -17,9 +22,41 @@ def extract_text(path: Path) -> str:
     raise ValueError(f"Unsupported file type: {suffix}")
 
 
-def _extract_pdf(path: Path) -> str:
+def iter_text_pages(data: bytes | Path, suffix: str) -> Iterator[str]:
+    """Yield extracted text incrementally: per page for PDF, per block for DOCX.
+
+    ``data`` is the file's bytes, or a local path to read it from (large uploads are
+    handed over by path so they are never held in memory whole). Used by the sandboxed
+    extraction workers so a document that times out part-way still keeps the pages
+    finished before the deadline.
+    """
+    suffix = "." + suffix.lower().lstrip(".")
+    source = data if isinstance(data, Path) else io.BytesIO(data)
+
+    if suffix == ".pdf":
+        with pdfplumber.open(source) as pdf:
+            for page in pdf.pages:
+                # Blank pages still yield so page numbers line up with the source.
+                yield page.extract_text() or ""
+                # pdfplumber caches parsed layout objects per page; drop them as we go.
+                page.flush_cache()
+        return
+    if suffix == ".docx":
+        yield from iter_docx_blocks(source)
+        return
+    if suffix == ".txt":
+        if isinstance(source, Path):
+            yield source.read_text(encoding="utf-8", errors="ignore")
+        else:
+            yield io.TextIOWrapper(source, encoding="utf-8", errors="ignore").read()
+        return
+
+    raise ValueError(f"Unsupported file type: {suffix}")
+
+
+def _extract_pdf(source: Path | BinaryIO) -> str:
     text = []
-    with pdfplumber.open(path) as pdf:
+    with pdfplumber.open(source) as pdf:
         for page in pdf.pages:
             page_text = page.extract_text()
             if page_text:
@@ -27,6 +64,7 @@ def _extract_pdf(path: Path) -> str:
     return "\n".join(text)
 
 
-def _extract_docx(path: Path) -> str:
-    doc = DocxDocument(path)
-    return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+def _extract_docx(source: Path | BinaryIO) -> str:
+    # Streams word/document.xml rather than building the python-docx object model, and
+    # keeps table rows, which python-docx's ``doc.paragraphs`` skips.
+    return extract_docx_text(source)
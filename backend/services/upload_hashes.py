@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+
+
+class RunningHashes:
+    """In-process sha256 of each upload session, fed chunk by chunk as they arrive.
+
+    Best effort: a session whose chunks were not all seen by this process (restart, or
+    another API node took some chunks) has no digest here, and completion falls back to
+    hashing the staged object.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hashes: dict[str, tuple[int, "hashlib._Hash"]] = {}
+
+    def update(self, session_id: str, offset: int, data: bytes) -> None:
+        with self._lock:
+            covered, hasher = self._hashes.get(session_id, (0, None))
+            if offset == 0:
+                covered, hasher = 0, hashlib.sha256()
+            elif hasher is None or offset != covered:
+                self._hashes.pop(session_id, None)
+                return
+            hasher.update(data)
+            self._hashes[session_id] = (covered + len(data), hasher)
+
+    def digest(self, session_id: str, size: int) -> str | None:
+        with self._lock:
+            covered, hasher = self._hashes.get(session_id, (0, None))
+        if hasher is None or covered != size:
+            return None
+        return hasher.hexdigest()
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._hashes.pop(session_id, None)
+
+
+RUNNING_HASHES = RunningHashes()
@@ -1,10 +1,15 @@
 """Storage abstraction layer.
 
-Local filesystem implementation is used for dev.
-Future adapters: S3, Azure Blob.
+Content-addressed local storage is the default; the flat per-deal layout
+(LocalStorage) remains available via STORAGE_BACKEND=local, and STORAGE_BACKEND=s3
+shares one S3-compatible bucket between API nodes.
+Future adapters: Azure Blob.
 """
 
 from .base import StorageClient
+from .cas import ContentAddressedStorage
+from .factory import get_storage
 from .local import LocalStorage
+from .s3 import S3Error, S3Storage
 
-__all__ = ["StorageClient", "LocalStorage"]
+__all__ = ["StorageClient", "ContentAddressedStorage", "LocalStorage", "S3Error", "S3Storage", "get_storage"]
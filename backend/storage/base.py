@@ -1,12 +1,83 @@
+import os
+import tempfile
 from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager, contextmanager
 from pathlib import Path
+from typing import Iterator
 
 
 class StorageClient(ABC):
+    """Blob store for uploaded documents.
+
+    ``save`` returns the storage path recorded on the Document row: a filesystem path for
+    local stores, an ``s3://bucket/key`` URI for object stores. Callers pass it back as-is.
+    """
+
+    @abstractmethod
+    def save(self, deal_id: str, filename: str, data: bytes) -> Path | str:
+        ...
+
+    @abstractmethod
+    def read(self, path: Path | str) -> bytes:
+        ...
+
     @abstractmethod
-    def save(self, deal_id: str, filename: str, data: bytes) -> Path:
+    def size(self, path: Path | str) -> int:
         ...
 
     @abstractmethod
-    def read(self, path: Path) -> bytes:
+    def iter_range(self, path: Path | str, start: int = 0, end: int | None = None, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        """Yield bytes ``[start, end)`` in chunks; ``end=None`` means end of object."""
         ...
+
+    def read_range(self, path: Path | str, start: int = 0, end: int | None = None) -> bytes:
+        return b"".join(self.iter_range(path, start, end))
+
+    @contextmanager
+    def local_copy(self, path: Path | str) -> Iterator[Path]:
+        """A local file with the object's bytes, for readers that need a path.
+
+        Streamed to a temporary file that is deleted on exit; local-disk stores yield the
+        stored file itself.
+        """
+        fd, tmp = tempfile.mkstemp(suffix=Path(str(path)).suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in self.iter_range(path):
+                    f.write(chunk)
+            yield Path(tmp)
+        finally:
+            os.unlink(tmp)
+
+    def mmap_view(self, path: Path | str) -> AbstractContextManager[memoryview]:
+        """Zero-copy view of a stored object. Only local-disk stores support this."""
+        raise NotImplementedError(f"{type(self).__name__} does not support memory-mapped reads")
+
+    # Staged uploads: a file arrives as sequential parts and is only placed into the store
+    # on completion. ``state`` is JSON-serialisable so it can live on the session row.
+
+    @abstractmethod
+    def begin_upload(self, part_size: int) -> dict:
+        ...
+
+    @abstractmethod
+    def upload_part(self, state: dict, offset: int, data: bytes) -> dict:
+        """Write ``data`` at ``offset`` (a multiple of ``part_size``); returns the new state."""
+        ...
+
+    @abstractmethod
+    def complete_upload(self, state: dict, deal_id: str, filename: str, sha256: str | None = None) -> tuple[Path | str, str]:
+        """Place the staged object and return ``(storage path, sha256)``.
+
+        Pass ``sha256`` when the caller already hashed the parts; otherwise it is computed
+        from the staged bytes.
+        """
+        ...
+
+    @abstractmethod
+    def abort_upload(self, state: dict) -> None:
+        ...
+
+    def release(self, path: Path | str) -> None:
+        """Drop a reference to a stored blob. No-op for stores without reference counting."""
+        return None
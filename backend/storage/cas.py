@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from backend.core import tracing
+
+from .base import StorageClient
+from .filesystem import FilesystemReads, FilesystemUploads
+from .local import LocalStorage
+
+
+class ContentAddressedStorage(FilesystemReads, FilesystemUploads, StorageClient):
+    """Blob store addressed by sha256.
+
+    Layout under ``root``::
+
+        blobs/ab/cd/<sha256><suffix>        immutable content
+        blobs/ab/cd/<sha256><suffix>.refs   reference count (one per saved document)
+        blobs/ab/cd/.lock                   flock guarding the shard's refs files
+        tmp/                                in-flight writes
+        uploads/<id>.part                   staged (chunked) uploads, see FilesystemUploads
+
+    Identical bytes are stored once, whichever deal or filename they arrive under. The
+    original suffix is kept in the blob name because text extraction dispatches on it.
+    Reference counts are updated under a per-shard ``flock`` so several worker processes
+    can share one volume; ``gc`` removes blobs whose count has dropped to zero. The lock
+    file is never deleted: removing a file that others may be waiting to lock would let
+    them update a count nobody reads again.
+    """
+
+    def __init__(self, root: str = "data"):
+        self.root = Path(root)
+        self.blobs = self.root / "blobs"
+        self.tmp = self.root / "tmp"
+        self.blobs.mkdir(parents=True, exist_ok=True)
+        self.tmp.mkdir(parents=True, exist_ok=True)
+
+    def blob_path(self, digest: str, suffix: str = "") -> Path:
+        return self.blobs / digest[:2] / digest[2:4] / f"{digest}{suffix}"
+
+    @tracing.traced("storage.save")
+    def save(self, deal_id: str, filename: str, data: bytes) -> Path:
+        suffix = Path(LocalStorage._safe_filename(filename)).suffix.lower()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest, suffix)
+
+        with self._refs_locked(path) as refs:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._atomic_write(path, data)
+            refs.write(refs.read() + 1)
+
+        return path
+
+    def _commit_staged(self, staging: Path, deal_id: str, filename: str, sha256: str) -> Path:
+        suffix = Path(LocalStorage._safe_filename(filename)).suffix.lower()
+        path = self.blob_path(sha256, suffix)
+        with self._refs_locked(path) as refs:
+            if path.exists():
+                staging.unlink(missing_ok=True)
+            else:
+                os.replace(staging, path)
+                _fsync_dir(path.parent)
+            refs.write(refs.read() + 1)
+        return path
+
+    @tracing.traced("storage.read")
+    def read(self, path: Path) -> bytes:
+        return Path(path).read_bytes()
+
+    def release(self, path: Path) -> None:
+        """Drop one reference to ``path``; the blob is reclaimed by ``gc`` once unreferenced."""
+        path = Path(path)
+        if not self._is_blob(path):
+            return
+        with self._refs_locked(path) as refs:
+            refs.write(max(0, refs.read() - 1))
+
+    def refcount(self, path: Path) -> int:
+        ref_path = self._ref_path(Path(path))
+        try:
+            return int(ref_path.read_text() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def gc(self, *, min_age_seconds: float = 3600.0, staging_max_age_seconds: float | None = None) -> list[Path]:
+        """Delete unreferenced blobs and stale temp files older than ``min_age_seconds``.
+
+        The age guard leaves room for a save that has written its blob but not yet
+        committed the referencing document row. Staged uploads not written to for
+        ``staging_max_age_seconds`` are deleted too (None keeps them).
+        """
+        now = time.time()
+        cutoff = now - min_age_seconds
+        removed: list[Path] = []
+
+        for ref_path in self.blobs.glob("*/*/*.refs"):
+            blob = ref_path.with_suffix("")
+            with self._refs_locked(blob) as refs:
+                if refs.read() > 0:
+                    continue
+                try:
+                    if blob.stat().st_mtime > cutoff:
+                        continue
+                    blob.unlink()
+                except FileNotFoundError:
+                    pass
+                # Safe under the shard lock: a save reopens (and recreates) the refs file
+                # only after taking that lock.
+                ref_path.unlink(missing_ok=True)
+                removed.append(blob)
+
+        _sweep(self.tmp.iterdir(), cutoff)
+        if staging_max_age_seconds is not None:
+            _sweep((self.root / "uploads").glob("*.part"), now - staging_max_age_seconds)
+
+        return removed
+
+    def _atomic_write(self, path: Path, data: bytes) -> None:
+        # Write + fsync a temp file, rename into place, then fsync the directory so the
+        # rename itself survives a crash.
+        tmp_path = self.tmp / f"{path.name}.{uuid.uuid4().hex}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o640)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        try:
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        _fsync_dir(path.parent)
+
+    def _is_blob(self, path: Path) -> bool:
+        try:
+            path.resolve().relative_to(self.blobs.resolve())
+        except ValueError:
+            return False
+        return True
+
+    @staticmethod
+    def _ref_path(blob: Path) -> Path:
+        return blob.with_name(blob.name + ".refs")
+
+    @contextmanager
+    def _refs_locked(self, blob: Path) -> Iterator["_RefFile"]:
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        lock_fd = os.open(blob.parent / ".lock", os.O_RDWR | os.O_CREAT, 0o640)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            # Opened only while holding the lock, so it is never a file gc has unlinked.
+            fd = os.open(self._ref_path(blob), os.O_RDWR | os.O_CREAT, 0o640)
+            try:
+                yield _RefFile(fd)
+            finally:
+                os.close(fd)
+        finally:
+            os.close(lock_fd)  # releases the flock
+
+
+class _RefFile:
+    def __init__(self, fd: int):
+        self.fd = fd
+
+    def read(self) -> int:
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        raw = os.read(self.fd, 32)
+        try:
+            return int(raw or 0)
+        except ValueError:
+            return 0
+
+    def write(self, value: int) -> None:
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        os.ftruncate(self.fd, 0)
+        os.write(self.fd, str(value).encode())
+        os.fsync(self.fd)
+
+
+def _sweep(paths: Iterator[Path], cutoff: float) -> None:
+    for stale in paths:
+        try:
+            if stale.stat().st_mtime < cutoff:
+                stale.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+from backend.core.config import settings
+from backend.storage.base import StorageClient
+from backend.storage.cas import ContentAddressedStorage
+from backend.storage.local import LocalStorage
+from backend.storage.s3 import S3Storage
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> StorageClient:
+    """Process-wide storage client (created once, not per request)."""
+    if settings.storage_backend == "local":
+        return LocalStorage(root=settings.storage_root)
+    if settings.storage_backend == "s3":
+        if not (settings.s3_bucket and settings.s3_access_key_id and settings.s3_secret_access_key):
+            raise RuntimeError("S3 storage is not configured (S3_BUCKET, S3_ACCESS_KEY_ID, S3_SECRET_ACCESS_KEY)")
+        return S3Storage(
+            bucket=settings.s3_bucket,
+            endpoint_url=settings.s3_endpoint_url,
+            access_key_id=settings.s3_access_key_id,
+            secret_access_key=settings.s3_secret_access_key,
+            region=settings.s3_region,
+            prefix=settings.s3_prefix,
+            multipart_threshold=settings.s3_multipart_threshold_bytes,
+            part_size=settings.s3_part_size_bytes,
+            max_concurrency=settings.s3_max_concurrency,
+        )
+    return ContentAddressedStorage(root=settings.storage_root)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from backend.core import tracing
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class FilesystemReads:
+    """Streaming and memory-mapped reads shared by the local-disk storage clients."""
+
+    def size(self, path: Path) -> int:
+        return os.stat(path).st_size
+
+    def iter_range(
+        self, path: Path, start: int = 0, end: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Yield bytes ``[start, end)`` in ``chunk_size`` pieces without loading the whole file."""
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = (end if end is not None else os.fstat(f.fileno()).st_size) - start
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    @tracing.traced("storage.read_range")
+    def read_range(self, path: Path, start: int = 0, end: int | None = None) -> bytes:
+        with open(path, "rb") as f:
+            f.seek(start)
+            return f.read() if end is None else f.read(max(0, end - start))
+
+    @contextmanager
+    def local_copy(self, path: Path) -> Iterator[Path]:
+        yield Path(path)
+
+    @contextmanager
+    def mmap_view(self, path: Path) -> Iterator[memoryview]:
+        """Read-only memoryview over the file; pages are faulted in lazily by the OS."""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mm)
+            try:
+                yield view
+            finally:
+                view.release()
+                mm.close()
+
+
+class FilesystemUploads(ABC):
+    """Staged uploads for the local-disk stores.
+
+    Parts are written in place into ``<root>/uploads/<id>.part`` (outside ``tmp/``, which
+    CAS garbage collection sweeps), then handed to ``_commit_staged`` for placement.
+    """
+
+    root: Path
+
+    def begin_upload(self, part_size: int) -> dict:
+        staging_dir = self.root / "uploads"
+        staging_dir.mkdir(parents=True, exist_ok=True)
+        staging = staging_dir / f"{uuid.uuid4().hex}.part"
+        staging.touch(mode=0o640, exist_ok=False)
+        return {"staging": str(staging), "part_size": part_size}
+
+    def upload_part(self, state: dict, offset: int, data: bytes) -> dict:
+        fd = os.open(state["staging"], os.O_WRONLY)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.pwrite(fd, view, offset)
+                offset += written
+                view = view[written:]
+        finally:
+            os.close(fd)
+        return state
+
+    def complete_upload(self, state: dict, deal_id: str, filename: str, sha256: str | None = None) -> tuple[Path, str]:
+        staging = Path(state["staging"])
+        with open(staging, "rb") as f:
+            os.fsync(f.fileno())
+            if sha256 is None:
+                hasher = hashlib.sha256()
+                while chunk := f.read(DEFAULT_CHUNK_SIZE):
+                    hasher.update(chunk)
+                sha256 = hasher.hexdigest()
+        return self._commit_staged(staging, deal_id, filename, sha256), sha256
+
+    def abort_upload(self, state: dict) -> None:
+        Path(state["staging"]).unlink(missing_ok=True)
+
+    @abstractmethod
+    def _commit_staged(self, staging: Path, deal_id: str, filename: str, sha256: str) -> Path:
+        """Move the fsynced ``staging`` file to its final place and return that path."""
+        ...
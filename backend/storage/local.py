@@ -2,14 +2,18 @@ from pathlib import Path
 import os
 import uuid
 
+from backend.core import tracing
+
 from .base import StorageClient
+from .filesystem import FilesystemReads, FilesystemUploads
 
 
-class LocalStorage(StorageClient):
+class LocalStorage(FilesystemReads, FilesystemUploads, StorageClient):
     def __init__(self, root: str = "data"):
         self.root = Path(root)
         self.root.mkdir(parents=True, exist_ok=True)
 
+    @tracing.traced("storage.save")
     def save(self, deal_id: str, filename: str, data: bytes) -> Path:
         deal_dir = self.root / deal_id
         deal_dir.mkdir(parents=True, exist_ok=True)
@@ -23,8 +27,16 @@ class LocalStorage(StorageClient):
 
         return path
 
+    def _commit_staged(self, staging: Path, deal_id: str, filename: str, sha256: str) -> Path:
+        deal_dir = self.root / deal_id
+        deal_dir.mkdir(parents=True, exist_ok=True)
+        path = deal_dir / self._safe_filename(filename)
+        os.replace(staging, path)
+        return path
+
+    @tracing.traced("storage.read")
     def read(self, path: Path) -> bytes:
-        return path.read_bytes()
+        return Path(path).read_bytes()
 
     @staticmethod
     def _safe_filename(filename: str) -> str:
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import hmac
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import quote
+from xml.etree import ElementTree
+
+import httpx
+
+from backend.core import tracing
+
+from .base import StorageClient
+from .local import LocalStorage
+
+SCHEME = "s3://"
+_EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+# S3 rejects parts below 5 MiB (except the last one).
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class S3Error(RuntimeError):
+    def __init__(self, status_code: int, code: str, message: str):
+        super().__init__(f"S3 {status_code} {code}: {message}")
+        self.status_code = status_code
+        self.code = code
+
+
+class S3Storage(StorageClient):
+    """S3-protocol blob store (AWS S3, MinIO, Ceph RGW, ...).
+
+    Objects are content-addressed (``<prefix>blobs/ab/cd/<sha256><suffix>``) so a save of
+    bytes that already exist is a single HEAD. Storage paths are ``s3://bucket/key`` URIs.
+    Uploads above ``multipart_threshold`` are split into ``part_size`` parts sent on
+    ``max_concurrency`` threads over one pooled HTTP client; reads stream ranged GETs.
+
+    There is no reference counting: objects are immutable and shared, and reclaiming
+    unreferenced ones is left to bucket lifecycle rules.
+    """
+
+    def __init__(
+        self,
+        *,
+        bucket: str,
+        endpoint_url: str,
+        access_key_id: str,
+        secret_access_key: str,
+        region: str = "us-east-1",
+        prefix: str = "",
+        multipart_threshold: int = 16 * 1024 * 1024,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 4,
+        timeout: float = 60.0,
+        transport: httpx.BaseTransport | None = None,
+    ):
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.region = region
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.multipart_threshold = max(multipart_threshold, MIN_PART_SIZE)
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.max_concurrency = max(1, max_concurrency)
+        self._signer = _SigV4Signer(access_key_id, secret_access_key, region)
+        self._host = httpx.URL(self.endpoint_url).netloc.decode("ascii")
+        self._client = httpx.Client(
+            timeout=timeout,
+            transport=transport or httpx.HTTPTransport(retries=2),
+            limits=httpx.Limits(max_connections=self.max_concurrency * 2, max_keepalive_connections=self.max_concurrency * 2),
+        )
+        self._pool_lock = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+
+    # -- StorageClient -------------------------------------------------------------
+
+    @tracing.traced("storage.save", backend="s3")
+    def save(self, deal_id: str, filename: str, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        key = self._blob_key(digest, filename)
+
+        if not self._exists(key):
+            if len(data) >= self.multipart_threshold:
+                self._put_multipart(key, data)
+            else:
+                self._request("PUT", key, content=data)
+        return f"{SCHEME}{self.bucket}/{key}"
+
+    @tracing.traced("storage.read", backend="s3")
+    def read(self, path: Path | str) -> bytes:
+        return self._request("GET", self._key(path)).content
+
+    def size(self, path: Path | str) -> int:
+        resp = self._request("HEAD", self._key(path))
+        return int(resp.headers["content-length"])
+
+    def iter_range(
+        self, path: Path | str, start: int = 0, end: int | None = None, chunk_size: int = 1024 * 1024
+    ) -> Iterator[bytes]:
+        if end is not None and end <= start:
+            return
+        byte_range = f"bytes={start}-{'' if end is None else end - 1}"
+        key = self._key(path)
+        request = self._build("GET", key, headers={"range": byte_range})
+        with self._client.stream(request.method, request.url, headers=request.headers) as resp:
+            if resp.status_code >= 300:
+                resp.read()
+                self._raise(resp, key)
+            yield from resp.iter_bytes(chunk_size)
+
+    # -- staged uploads --------------------------------------------------------------
+
+    def begin_upload(self, part_size: int) -> dict:
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"S3 parts must be at least {MIN_PART_SIZE} bytes")
+        key = f"{self.prefix}uploads/{uuid.uuid4().hex}"
+        created = self._request("POST", key, params={"uploads": ""})
+        return {"key": key, "upload_id": _xml_text(created.content, "UploadId"), "part_size": part_size, "parts": {}}
+
+    def upload_part(self, state: dict, offset: int, data: bytes) -> dict:
+        number = offset // state["part_size"] + 1
+        resp = self._request("PUT", state["key"], params={"partNumber": str(number), "uploadId": state["upload_id"]}, content=data)
+        return {**state, "parts": {**state["parts"], str(number): resp.headers["etag"]}}
+
+    def complete_upload(self, state: dict, deal_id: str, filename: str, sha256: str | None = None) -> tuple[str, str]:
+        staging = state["key"]
+        etags = sorted((int(n), etag) for n, etag in state["parts"].items())
+        self._complete_multipart(staging, state["upload_id"], etags)
+
+        if sha256 is None:
+            hasher = hashlib.sha256()
+            for chunk in self.iter_range(f"{SCHEME}{self.bucket}/{staging}"):
+                hasher.update(chunk)
+            sha256 = hasher.hexdigest()
+
+        key = self._blob_key(sha256, filename)
+        if not self._exists(key):
+            # Server-side copy into the content-addressed key; no bytes pass through us.
+            self._request("PUT", key, headers={"x-amz-copy-source": f"/{quote(self.bucket)}/{quote(staging)}"})
+        self._request("DELETE", staging)
+        return f"{SCHEME}{self.bucket}/{key}", sha256
+
+    def abort_upload(self, state: dict) -> None:
+        self._request("DELETE", state["key"], params={"uploadId": state["upload_id"]})
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+        self._client.close()
+
+    # -- multipart -----------------------------------------------------------------
+
+    def _put_multipart(self, key: str, data: bytes) -> None:
+        created = self._request("POST", key, params={"uploads": ""})
+        upload_id = _xml_text(created.content, "UploadId")
+        view = memoryview(data)
+        parts = [(n + 1, view[offset : offset + self.part_size]) for n, offset in enumerate(range(0, len(data), self.part_size))]
+
+        def upload(part: tuple[int, memoryview]) -> tuple[int, str]:
+            number, chunk = part
+            resp = self._request("PUT", key, params={"partNumber": str(number), "uploadId": upload_id}, content=bytes(chunk))
+            return number, resp.headers["etag"]
+
+        try:
+            self._complete_multipart(key, upload_id, list(self._executor().map(upload, parts)))
+        except BaseException:
+            try:
+                self._request("DELETE", key, params={"uploadId": upload_id})
+            except (httpx.HTTPError, S3Error):
+                pass
+            raise
+
+    def _complete_multipart(self, key: str, upload_id: str, etags: list[tuple[int, str]]) -> None:
+        body = "".join(f"<Part><PartNumber>{n}</PartNumber><ETag>{etag}</ETag></Part>" for n, etag in etags)
+        resp = self._request(
+            "POST",
+            key,
+            params={"uploadId": upload_id},
+            content=f"<CompleteMultipartUpload>{body}</CompleteMultipartUpload>".encode(),
+        )
+        # CompleteMultipartUpload can fail with a 200 and an <Error> body.
+        if b"<Error>" in resp.content:
+            raise S3Error(resp.status_code, _xml_text(resp.content, "Code"), _xml_text(resp.content, "Message"))
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="s3-part")
+            return self._pool
+
+    # -- HTTP ----------------------------------------------------------------------
+
+    def _blob_key(self, digest: str, filename: str) -> str:
+        suffix = Path(LocalStorage._safe_filename(filename)).suffix.lower()
+        return f"{self.prefix}blobs/{digest[:2]}/{digest[2:4]}/{digest}{suffix}"
+
+    def _key(self, path: Path | str) -> str:
+        # Path("s3://b/k") collapses the double slash, so accept both spellings.
+        raw = str(path)
+        for scheme in (SCHEME, "s3:/"):
+            if raw.startswith(scheme):
+                bucket, _, key = raw[len(scheme) :].partition("/")
+                if bucket != self.bucket:
+                    raise ValueError(f"Object {raw!r} is not in bucket {self.bucket!r}")
+                return key
+        raise ValueError(f"Not an S3 storage path: {raw!r}")
+
+    def _exists(self, key: str) -> bool:
+        try:
+            self._request("HEAD", key)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _build(self, method: str, key: str, *, params: dict[str, str] | None = None, headers: dict[str, str] | None = None, content: bytes = b"") -> httpx.Request:
+        # Path-style addressing works with every S3-compatible server.
+        path = f"/{quote(self.bucket)}/{quote(key)}"
+        payload_hash = hashlib.sha256(content).hexdigest() if content else _EMPTY_SHA256
+        signed = self._signer.sign(method, self._host, path, params or {}, dict(headers or {}), payload_hash)
+        return self._client.build_request(method, f"{self.endpoint_url}{path}", params=params, headers=signed, content=content or None)
+
+    def _request(self, method: str, key: str, **kwargs) -> httpx.Response:
+        resp = self._client.send(self._build(method, key, **kwargs))
+        if resp.status_code >= 300:
+            self._raise(resp, key)
+        return resp
+
+    @staticmethod
+    def _raise(resp: httpx.Response, key: str) -> None:
+        if resp.status_code == 404:
+            raise FileNotFoundError(key)
+        code = _xml_text(resp.content, "Code") or str(resp.status_code)
+        raise S3Error(resp.status_code, code, _xml_text(resp.content, "Message") or resp.reason_phrase)
+
+
+class _SigV4Signer:
+    """AWS Signature Version 4 for the ``s3`` service, header-based."""
+
+    def __init__(self, access_key_id: str, secret_access_key: str, region: str):
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.region = region
+
+    def sign(
+        self,
+        method: str,
+        host: str,
+        path: str,
+        params: dict[str, str],
+        headers: dict[str, str],
+        payload_hash: str,
+        now: dt.datetime | None = None,
+    ) -> dict[str, str]:
+        now = now or dt.datetime.now(dt.timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date = amz_date[:8]
+
+        headers = {k.lower(): v.strip() for k, v in headers.items()}
+        headers.update({"host": host, "x-amz-date": amz_date, "x-amz-content-sha256": payload_hash})
+        signed_names = ";".join(sorted(headers))
+        canonical_headers = "".join(f"{name}:{headers[name]}\n" for name in sorted(headers))
+        canonical_query = "&".join(f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}" for k, v in sorted(params.items()))
+        canonical_request = "\n".join([method, path, canonical_query, canonical_headers, signed_names, payload_hash])
+
+        scope = f"{date}/{self.region}/s3/aws4_request"
+        string_to_sign = "\n".join(["AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical_request.encode()).hexdigest()])
+
+        key = _hmac(f"AWS4{self.secret_access_key}".encode(), date)
+        for part in (self.region, "s3", "aws4_request"):
+            key = _hmac(key, part)
+        signature = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+        headers["authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self.access_key_id}/{scope}, SignedHeaders={signed_names}, Signature={signature}"
+        )
+        return headers
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode(), hashlib.sha256).digest()
+
+
+def _xml_text(body: bytes, tag: str) -> str:
+    if not body:
+        return ""
+    try:
+        root = ElementTree.fromstring(body)
+    except ElementTree.ParseError:
+        return ""
+    for el in root.iter():
+        if el.tag.rsplit("}", 1)[-1] == tag:
+            return el.text or ""
+    return ""
@@ -0,0 +1,86 @@
+"""Shared test setup: the app over in-memory SQLite, and sessions on the same database.
+
+The benchmarks drive the app through ``app_client`` too.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):  # pragma: no cover - DDL hook
+    # Tests and benchmarks run against SQLite; JSONB renders as plain JSON there.
+    return "JSON"
+
+
+@contextmanager
+def app_client(storage_root: Path) -> Iterator[Any]:
+    """In-process FastAPI client backed by in-memory SQLite and a temp storage root.
+
+    ``client.app.state.session_factory`` opens sessions on the app's database.
+    """
+    from fastapi.testclient import TestClient
+
+    from backend import models as _models  # noqa: F401
+    from backend.core.config import settings
+    from backend.db.base import Base
+    from backend.db.session import get_db
+    from backend.main import create_app
+    from backend.storage import get_storage
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    def _get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    previous_root = settings.storage_root
+    settings.storage_root = str(storage_root)
+    get_storage.cache_clear()
+    # StaticPool shares one SQLite connection; a background audit flush on it would
+    # commit the request's open transaction, so audit rows are written in-request here.
+    previous_audit = settings.audit_read_durability
+    settings.audit_read_durability = "sync"
+
+    app = create_app()
+    app.dependency_overrides[get_db] = _get_db
+    app.state.session_factory = session_factory
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        settings.storage_root = previous_root
+        settings.audit_read_durability = previous_audit
+        get_storage.cache_clear()
+        engine.dispose()
+
+
+@pytest.fixture
+def client(tmp_path):
+    with app_client(tmp_path / "storage") as client:
+        yield client
+
+
+@pytest.fixture
+def db(client):
+    with client.app.state.session_factory() as session:
+        yield session
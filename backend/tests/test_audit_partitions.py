@@ -0,0 +1,72 @@
+import datetime as dt
+import gzip
+import json
+
+from backend.services.audit_partitions import archive_expired, ensure_partitions
+from backend.storage import LocalStorage
+
+TODAY = dt.date(2026, 10, 19)
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return iter(self._rows)
+
+    def mappings(self):
+        return iter(self._rows)
+
+
+class _RecordingConnection:
+    """Records each statement with the execution options it ran under.
+
+    Like SQLAlchemy's Connection, ``execution_options`` applies to the connection itself
+    and every later statement on it.
+    """
+
+    def __init__(self, partitions: list[str], rows: list[dict] | None = None):
+        self.partitions = partitions
+        self.rows = rows or []
+        self.options: dict = {}
+        self.statements: list[tuple[str, dict]] = []
+
+    def execution_options(self, **options):
+        self.options.update(options)
+        return self
+
+    def execute(self, statement, parameters=None, *, execution_options=None):
+        sql = " ".join(str(statement).split())
+        self.statements.append((sql, {**self.options, **(execution_options or {})}))
+        if "pg_inherits" in sql:
+            return _Result(self.partitions)
+        if sql.startswith("SELECT id"):
+            return _Result(self.rows)
+        return None
+
+
+def test_missing_months_are_created_and_attached():
+    conn = _RecordingConnection(["audit_logs_2026_10", "audit_logs_2026_12"])
+    assert ensure_partitions(conn, months_ahead=2, today=TODAY) == ["audit_logs_2026_11"]
+    ddl = [sql for sql, _ in conn.statements[1:]]
+    assert ddl[0].startswith("CREATE TABLE audit_logs_2026_11 (LIKE audit_logs")
+    assert "DELETE FROM audit_logs_default" in ddl[1]
+    assert ddl[2] == (
+        "ALTER TABLE audit_logs ATTACH PARTITION audit_logs_2026_11 FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')"
+    )
+
+
+def test_expired_partitions_are_archived_then_dropped_without_streaming_the_ddl(tmp_path):
+    rows = [{"id": 1, "actor": "a@x", "action": "export", "deal_id": "d1", "metadata_json": {}, "created_at": "2019-01-05"}]
+    conn = _RecordingConnection(["audit_logs_2019_01", "audit_logs_2019_11", "audit_logs_2026_10"], rows)
+
+    archived = archive_expired(conn, retention_months=84, storage=LocalStorage(tmp_path), today=TODAY)
+
+    assert [(e["partition"], e["rows"]) for e in archived] == [("audit_logs_2019_01", 1)]
+    with gzip.open(archived[0]["archive"], "rt") as f:
+        assert [json.loads(line)["id"] for line in f] == [1]
+    select, detach, drop = conn.statements[1:]
+    assert select[1] == {"yield_per": 5_000}
+    assert detach == ("ALTER TABLE audit_logs DETACH PARTITION audit_logs_2019_01", {})
+    assert drop == ("DROP TABLE audit_logs_2019_01", {})
@@ -0,0 +1,107 @@
+import json
+import os
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from backend import models  # noqa: F401
+from backend.core.config import settings
+from backend.db.base import Base
+from backend.models import AuditLog
+from backend.services import audit as audit_module
+from backend.services.audit import AuditWriter, Durability, audit
+from backend.utils.time import now_utc
+
+
+def _engine(tmp_path, *, tables: bool = True):
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    if tables:
+        Base.metadata.create_all(engine)
+    return engine
+
+
+def _entry(i: int) -> dict:
+    return {"actor": "a@x", "action": "export", "deal_id": "d1", "metadata_json": {"i": i}, "created_at": now_utc()}
+
+
+def _count(engine) -> int:
+    with Session(engine) as db:
+        return db.query(AuditLog).count()
+
+
+def test_full_batch_is_flushed_without_waiting_for_the_interval(tmp_path):
+    engine = _engine(tmp_path)
+    writer = AuditWriter(engine, batch_size=3, flush_interval=60)
+    try:
+        for i in range(3):
+            assert writer.submit(_entry(i))
+        deadline = time.monotonic() + 5
+        while writer.buffered and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _count(engine) == 3
+    finally:
+        writer.close()
+
+
+def test_wal_left_by_a_dead_process_is_replayed(tmp_path):
+    engine = _engine(tmp_path)
+    wal_dir = tmp_path / "wal"
+    wal_dir.mkdir()
+    lines = [json.dumps(_entry(i), default=str) for i in range(2)]
+    (wal_dir / "999999999.wal").write_text("\n".join(lines) + '\n{"actor": "torn', encoding="utf-8")
+
+    writer = AuditWriter(engine, wal_dir=wal_dir, flush_interval=60)
+    try:
+        assert writer.buffered == 2
+        writer.submit(_entry(2))
+        assert writer.flush() == 3
+        assert _count(engine) == 3
+        assert [p.suffix for p in wal_dir.iterdir()] == [".wal"]  # only this process's live WAL
+    finally:
+        writer.close()
+
+
+def test_leftover_batches_from_a_reused_pid_are_each_replayed_once(tmp_path):
+    engine = _engine(tmp_path)
+    wal_dir = tmp_path / "wal"
+    wal_dir.mkdir()
+    # A restarted container worker often gets the dead process's pid; ten or more files
+    # also sort out of numeric order (1, 10, 11, 2, ...).
+    for seq in range(1, 13):
+        (wal_dir / f"{os.getpid()}.{seq}.batch").write_text(json.dumps(_entry(seq), default=str) + "\n", encoding="utf-8")
+
+    writer = AuditWriter(engine, wal_dir=wal_dir, flush_interval=60)
+    try:
+        assert writer.buffered == 12
+        assert writer.flush() == 12
+        with Session(engine) as db:
+            assert sorted(row.metadata_json["i"] for row in db.query(AuditLog)) == list(range(1, 13))
+    finally:
+        writer.close()
+
+
+def test_full_buffer_pushes_back_on_callers(tmp_path):
+    engine = _engine(tmp_path, tables=False)  # every flush fails
+    writer = AuditWriter(engine, capacity=2, flush_interval=60, submit_timeout=0.05)
+    try:
+        assert writer.submit(_entry(0)) and writer.submit(_entry(1))
+        assert writer.submit(_entry(2)) is False
+        assert writer.buffered == 2
+    finally:
+        writer.close()
+
+
+def test_reads_are_buffered_and_changes_written_in_the_transaction(tmp_path, monkeypatch):
+    engine = _engine(tmp_path)
+    monkeypatch.setattr(settings, "audit_read_durability", "memory")
+    try:
+        with Session(engine) as db:
+            audit(db, actor="a@x", action="export", deal_id="d1", metadata={})
+            audit(db, actor="a@x", action="edit_terms", deal_id="d1", metadata={})
+            assert [row.action for row in db.new] == ["edit_terms"]
+            db.commit()
+        assert audit_module.get_audit_writer(engine, Durability.memory).flush() == 1
+        assert _count(engine) == 2
+    finally:
+        audit_module.close_audit_writers()
@@ -0,0 +1,23 @@
+import json
+
+from backend.benchmarks.corpus import generate_term_sheet
+from backend.benchmarks.run import main
+
+
+def test_corpus_is_deterministic_and_sized():
+    a = generate_term_sheet(3, seed=7)
+    b = generate_term_sheet(3, seed=7)
+
+    assert a == b
+    assert len(a.text) >= 3 * 3000
+    assert "Facility Amount" in a.text
+
+
+def test_suite_writes_json_results(tmp_path):
+    out = tmp_path / "results.json"
+
+    assert main(["--sizes", "small", "--repeat", "1", "--out", str(out)]) == 0
+
+    report = json.loads(out.read_text())
+    assert "extract_text.pdf.small" in report["results"]
+    assert report["results"]["e2e.extract.txt.small"]["n"] == 1
@@ -0,0 +1,41 @@
+from backend.benchmarks.corpus import generate_term_sheet
+from backend.models import Document
+from backend.services.citations import CitationIndex, resolve_citations
+from backend.services.prompts import set_prompt_segment
+
+
+def test_resolves_normalised_snippet_with_cut_edges():
+    text = "Schedule 1\n\nThe  Lender holds a FIRST ranking\nregistered mortgage over the Secured Property.\n"
+    index = CitationIndex(text)
+
+    start, end = index.resolve("nder holds a first ranking registered mortgage over the Secu")
+    assert text[start:end] == "nder holds a FIRST ranking\nregistered mortgage over the Secu"
+    assert index.resolve("holds a second ranking mortgage") is None
+    assert text[slice(*index.resolve("Schedule 1"))] == "Schedule 1"
+
+
+def test_pages_map_to_source_page_numbers():
+    doc = Document(id=7, filename="facility.pdf", extracted_text="")
+    set_prompt_segment(doc, ["Cover page", "", "loan amount: $4,000,000 repayable in 18 months"])
+
+    spans = resolve_citations([doc], {"loan_amount": ["loan amount: $4,000,000 repayable"], "notes": ["absent text here"]})
+
+    [loan] = spans["loan_amount"]
+    assert (loan["document_id"], loan["page"]) == (7, 3)
+    assert doc.prompt_segment[loan["start"] : loan["end"]] == "loan amount: $4,000,000 repayable"
+    assert spans["notes"][0]["document_id"] is None
+
+
+def test_deal_detail_returns_spans_for_extracted_citations(client):
+    sheet = generate_term_sheet(5, seed=3)
+    deal_id = client.post("/deals", json={"name": "cited"}).json()["id"]
+    doc_id = client.post(
+        f"/deals/{deal_id}/documents", files={"file": ("sheet.txt", sheet.text.encode(), "text/plain")}
+    ).json()["document_id"]
+    client.post(f"/deals/{deal_id}/extract").raise_for_status()
+
+    detail = client.get(f"/deals/{deal_id}").json()
+
+    spans = [s for field in detail["citation_spans"].values() for s in field]
+    assert spans and all(s["document_id"] == doc_id and s["page"] == 1 for s in spans)
+    assert all(s["end"] - s["start"] >= len(s["snippet"]) for s in spans)
@@ -0,0 +1,44 @@
+import io
+
+from docx import Document as DocxDocument
+
+from backend.services.docx_text import extract_docx_text, iter_docx_blocks
+
+
+def _docx() -> bytes:
+    doc = DocxDocument()
+    doc.add_paragraph("Indicative Term Sheet")
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Facility Amount"
+    table.cell(0, 1).text = "$12,500,000 AUD"
+    table.cell(1, 0).text = "LVR"
+    inner = table.cell(1, 1)
+    inner.text = "65%"
+    inner.add_paragraph("on as-is value")
+    doc.add_paragraph("")
+    p = doc.add_paragraph("Fees\tpayable")
+    p.add_run().add_break()
+    p.add_run("at settlement")
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def test_blocks_are_in_document_order_and_include_tables():
+    blocks = list(iter_docx_blocks(io.BytesIO(_docx())))
+
+    assert blocks == [
+        "Indicative Term Sheet",
+        "Facility Amount | $12,500,000 AUD",
+        "LVR | 65% on as-is value",
+        "Fees\tpayable\nat settlement",
+    ]
+
+
+def test_paragraph_text_matches_python_docx():
+    data = _docx()
+    expected = [p.text for p in DocxDocument(io.BytesIO(data)).paragraphs if p.text.strip()]
+    blocks = extract_docx_text(io.BytesIO(data)).split("\n")
+
+    for text in expected:
+        assert text.split("\n")[0] in blocks
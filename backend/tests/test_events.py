@@ -0,0 +1,88 @@
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+
+from backend.llm import azure
+from backend.services import events
+from backend.services.events import InProcessEventBus, format_sse, token_progress
+
+
+def test_bus_fans_out_per_deal_and_accepts_publishes_from_threads():
+    bus = InProcessEventBus(queue_size=2)
+
+    async def scenario():
+        async with bus.subscribe("a") as sub_a, bus.subscribe("b") as sub_b:
+            thread = threading.Thread(target=lambda: [bus.publish("a", "stage", n=i) for i in range(3)])
+            thread.start()
+            thread.join()
+            bus.publish("b", "upload")
+            await asyncio.sleep(0)
+            got_a = [await sub_a.get(timeout=1), await sub_a.get(timeout=1)]
+            return got_a, sub_a.dropped, await sub_b.get(timeout=1), await sub_b.get(timeout=0.01)
+
+    got_a, dropped, got_b, nothing = asyncio.run(scenario())
+
+    assert [e["n"] for e in got_a] == [1, 2] and dropped == 1  # oldest dropped, not blocked
+    assert got_b["type"] == "upload" and nothing is None
+    assert bus.subscriber_count("a") == 0
+    assert format_sse(got_b, 7).startswith("id: 7\nevent: upload\ndata: {")
+
+
+def test_stages_publish_transitions(client, monkeypatch):
+    events: list[tuple[str, dict]] = []
+    monkeypatch.setattr("backend.api.deals.publish", lambda deal_id, kind, **data: events.append((kind, data)))
+
+    deal = f"/deals/{client.post('/deals', json={'name': 'events'}).json()['id']}"
+    client.post(f"{deal}/documents", files={"file": ("sheet.txt", b"Term: 12 months\n")})
+    client.post(f"{deal}/pipeline")
+    client.post(f"{deal}/extract")
+
+    stages = [(d["stage"], d["status"]) for kind, d in events if kind == "stage"]
+    assert events[0][0] == "document"
+    assert stages == [
+        ("extract", "started"),
+        ("extract", "ran"),
+        ("analyze", "started"),
+        ("analyze", "ran"),
+        ("draft", "blocked"),
+        ("extract", "skipped"),
+    ]
+    assert ("llm", "extract") in [(k, d.get("stage")) for k, d in events]
+
+
+def test_token_progress_only_when_someone_is_watching(monkeypatch):
+    bus = InProcessEventBus()
+    monkeypatch.setattr(events, "get_event_bus", lambda: bus)
+
+    async def scenario():
+        assert token_progress("d1", "extract") is None
+        async with bus.subscribe("d1") as sub:
+            token_progress("d1", "extract", every=1)(5)
+            await asyncio.sleep(0)
+            return await sub.get(timeout=1)
+
+    assert asyncio.run(scenario())["tokens"] == 5
+
+
+@pytest.mark.parametrize(("api_version", "stream_options"), [("2024-02-15-preview", False), ("2024-10-21", True)])
+def test_azure_asks_for_stream_usage_only_where_supported(monkeypatch, api_version, stream_options):
+    bodies: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        chunk = {"choices": [{"delta": {"content": '{"ok": true}'}}]}
+        return httpx.Response(200, text=f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n")
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(azure.httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw))
+    client = azure.AzureOpenAIClient(endpoint="https://x", deployment="d", api_key="k", api_version=api_version)
+
+    progress: list[int] = []
+    out = asyncio.run(client.complete_json(prompt="p", schema_name="ExtractedTerms", on_progress=progress.append))
+
+    assert out == {"ok": True} and progress == [1]
+    assert bodies[0]["stream"] is True
+    assert ("stream_options" in bodies[0]) is stream_options
@@ -0,0 +1,91 @@
+import sys
+import time
+
+import pytest
+
+from backend.services.extraction_pool import STATUS_ERROR, STATUS_MEMORY_LIMIT, STATUS_OK, STATUS_TIMEOUT, ExtractionPool
+
+
+# Worker targets must be importable by the spawned workers, so they live at module level.
+def pages_then_hang(data: bytes, suffix: str):
+    for line in data.decode().splitlines():
+        if line == "hang":
+            time.sleep(60)
+        yield line
+
+
+def balloon(data: bytes, suffix: str):
+    yield "before"
+    hog = [bytearray(16 * 1024 * 1024) for _ in range(32)]
+    time.sleep(60)
+    yield str(len(hog))
+
+
+@pytest.fixture
+def pool():
+    pool = ExtractionPool(1, timeout_seconds=1.0, target=pages_then_hang)
+    yield pool
+    pool.close()
+
+
+def test_timeout_keeps_partial_pages_and_replaces_worker(pool):
+    first = pool._idle.queue[0].process.pid
+
+    result = pool.extract(b"page 1\npage 2\nhang\npage 4", ".txt")
+    assert result.status == STATUS_TIMEOUT
+    assert result.pages == ["page 1", "page 2"]
+
+    # The stuck worker was killed; the replacement serves the next document normally.
+    again = pool.extract(b"page 1", ".txt")
+    assert again.status == STATUS_OK and again.text == "page 1"
+    assert pool._idle.queue[0].process.pid != first
+
+
+def test_parser_errors_are_reported_without_recycling():
+    pool = ExtractionPool(1, timeout_seconds=10.0)
+    try:
+        pid = pool._idle.queue[0].process.pid
+        result = pool.extract(b"not a pdf", ".pdf")
+        assert result.status == STATUS_ERROR and result.pages == []
+        assert pool.extract(b"plain text", ".txt").text == "plain text"
+        assert pool._idle.queue[0].process.pid == pid
+    finally:
+        pool.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="RSS is read from /proc")
+def test_rss_cap_kills_worker():
+    pool = ExtractionPool(1, timeout_seconds=20.0, max_rss_bytes=256 * 1024 * 1024, target=balloon)
+    try:
+        result = pool.extract(b"", ".txt")
+        assert result.status == STATUS_MEMORY_LIMIT
+        assert result.pages == ["before"]
+    finally:
+        pool.close()
+
+
+def test_failed_respawn_is_retried_on_the_next_document(pool, monkeypatch):
+    from backend.services import extraction_pool
+
+    real_worker = extraction_pool._Worker
+
+    def fail_to_start(*args):
+        raise OSError("cannot allocate memory")
+
+    monkeypatch.setattr(extraction_pool, "_Worker", fail_to_start)
+    assert pool.extract(b"hang", ".txt").status == STATUS_TIMEOUT
+    assert pool._idle.qsize() == 0
+
+    monkeypatch.setattr(extraction_pool, "_Worker", real_worker)
+    again = pool.extract(b"page 1", ".txt")
+    assert again.status == STATUS_OK and again.text == "page 1"
+
+
+def test_waiting_for_a_worker_times_out_with_an_error(pool):
+    pool.queue_timeout_seconds = 0.05
+    busy = pool._idle.get()
+    try:
+        result = pool.extract(b"page 1", ".txt")
+        assert result.status == STATUS_ERROR and "no extraction worker" in result.error
+    finally:
+        pool._idle.put(busy)
@@ -0,0 +1,75 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.loadtest.fake_llm import FakeLLMConfig, LatencyModel, _Bucket, _take_all, create_fake_llm_app
+
+URL = "/openai/deployments/gpt-test/chat/completions?api-version=2024-02-15-preview"
+HEADERS = {"api-key": "test"}
+
+
+def _body(prompt: str, **extra):
+    return {"messages": [{"role": "system", "content": "json"}, {"role": "user", "content": prompt}], **extra}
+
+
+def test_returns_azure_shaped_completion():
+    client = TestClient(create_fake_llm_app())
+
+    resp = client.post(URL, headers=HEADERS, json=_body("Term: 12 months"))
+
+    assert resp.status_code == 200
+    data = resp.json()
+    content = json.loads(data["choices"][0]["message"]["content"])
+    assert content["term_months"] == 12
+    assert data["usage"]["total_tokens"] > 0
+
+
+def test_streams_chunks_that_reassemble_to_json():
+    client = TestClient(create_fake_llm_app(FakeLLMConfig(stream_chunk_chars=8)))
+
+    resp = client.post(URL, headers=HEADERS, json=_body("ic_summary_3_lines", stream=True))
+
+    events = [line[6:] for line in resp.text.splitlines() if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    content = "".join(json.loads(e)["choices"][0]["delta"].get("content", "") for e in events[:-1])
+    assert "ic_summary_3_lines" in json.loads(content)
+
+
+def test_stream_ends_with_usage_when_asked():
+    client = TestClient(create_fake_llm_app())
+
+    resp = client.post(URL, headers=HEADERS, json=_body("Term: 12 months", stream=True, stream_options={"include_usage": True}))
+
+    events = [json.loads(line[6:]) for line in resp.text.splitlines() if line.startswith("data: {")]
+    assert events[-1]["choices"] == [] and events[-1]["usage"]["completion_tokens"] > 0
+    assert all("usage" not in e for e in events[:-1])
+
+
+def test_injected_429_and_rate_limit():
+    client = TestClient(create_fake_llm_app(FakeLLMConfig(error_rate_429=1.0)))
+    resp = client.post(URL, headers=HEADERS, json=_body("x"))
+    assert resp.status_code == 429
+    assert int(resp.headers["retry-after"]) >= 1
+
+    client = TestClient(create_fake_llm_app(FakeLLMConfig(requests_per_minute=1)))
+    assert client.post(URL, headers=HEADERS, json=_body("x")).status_code == 200
+    assert client.post(URL, headers=HEADERS, json=_body("x")).status_code == 429
+
+    # A prompt bigger than the whole TPM bucket is admitted once the bucket is full.
+    client = TestClient(create_fake_llm_app(FakeLLMConfig(tokens_per_minute=10)))
+    assert client.post(URL, headers=HEADERS, json=_body("x" * 400)).status_code == 200
+
+
+def test_request_refused_for_tokens_keeps_its_request_slot():
+    rpm, tpm = _Bucket(2), _Bucket(60)
+    tpm.tokens = 0.0
+
+    wait, reason = _take_all([(rpm, 1, "requests per minute"), (tpm, 30, "tokens per minute")])
+
+    assert reason == "tokens per minute" and 29 < wait <= 30
+    assert rpm.tokens == 2.0
+
+
+def test_latency_spec_parsing():
+    assert LatencyModel.parse("uniform:5,30").kind == "uniform"
+    assert LatencyModel.parse("lognormal:8,0.5,30").params == (8.0, 0.5, 30.0)
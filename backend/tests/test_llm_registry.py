@@ -0,0 +1,134 @@
+import asyncio
+
+import httpx
+import pytest
+
+from backend.llm.base import LLMClient
+from backend.llm.registry import Backend, LLMRegistry
+
+
+class FakeBackend(LLMClient):
+    def __init__(self, name: str, *, fail_with: int | None = None, delay: float = 0.0):
+        self.name = name
+        self.fail_with = fail_with
+        self.delay = delay
+        self.calls = 0
+
+    async def complete_json(self, *, prompt: str, schema_name: str, **kwargs) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail_with is not None:
+            request = httpx.Request("POST", f"http://{self.name}")
+            raise httpx.HTTPStatusError("boom", request=request, response=httpx.Response(self.fail_with, request=request))
+        self._record_call()
+        return {"backend": self.name}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _call(registry: LLMRegistry) -> dict:
+    return asyncio.run(registry.complete_json(prompt="p", schema_name="ExtractedTerms"))
+
+
+def test_concurrent_calls_spread_by_weight():
+    big, small = FakeBackend("big", delay=0.02), FakeBackend("small", delay=0.02)
+    registry = LLMRegistry([Backend(big, weight=2), Backend(small, weight=1)])
+
+    async def scenario():
+        await asyncio.gather(*(registry.complete_json(prompt="p", schema_name="s") for _ in range(6)))
+
+    asyncio.run(scenario())
+    assert (big.calls, small.calls) == (4, 2)
+
+
+def test_failing_backend_is_ejected_and_probed_back():
+    clock = Clock()
+    flaky, steady = FakeBackend("flaky", fail_with=429), FakeBackend("steady")
+    registry = LLMRegistry([Backend(flaky), Backend(steady)], max_errors=2, eject_seconds=10, clock=clock)
+    registry.backends[1].in_flight = 100  # make "flaky" the least loaded
+
+    # Each failure is retried on "steady"; the second ejects "flaky".
+    assert _call(registry) == {"backend": "steady"}
+    assert _call(registry) == {"backend": "steady"}
+    assert flaky.calls == 2
+    _call(registry)
+    assert flaky.calls == 2
+
+    # After the ejection a single failed probe re-ejects for twice as long.
+    clock.now = 10.0
+    _call(registry)
+    assert flaky.calls == 3
+    assert registry.backends[0].ejected_until == pytest.approx(30.0)
+
+    clock.now = 30.0
+    flaky.fail_with = None
+    assert _call(registry) == {"backend": "flaky"}
+    assert registry.backends[0].ejections == 0
+
+
+def test_success_started_before_an_ejection_keeps_the_backoff():
+    clock = Clock()
+    flaky = FakeBackend("flaky", fail_with=429)
+    registry = LLMRegistry([Backend(flaky), Backend(FakeBackend("steady"))], max_errors=1, eject_seconds=10, clock=clock)
+    backend = registry.backends[0]
+    registry.backends[1].in_flight = 100  # make "flaky" the least loaded
+    registry._record_failure(backend, probe=False)
+    clock.now = 10.0
+    registry._record_failure(backend, probe=True)
+    assert backend.ejections == 2
+
+    # A slow call that was already in flight comes back fine while the backend is out.
+    registry._record_success(backend, 1.0)
+    assert backend.ejections == 2 and backend.ejected_until == pytest.approx(30.0)
+
+    # It still has to pass a probe, and a failed one backs off further.
+    clock.now = 30.0
+    _call(registry)
+    assert flaky.calls == 1
+    assert backend.ejected_until == pytest.approx(70.0)
+
+
+def test_slow_backend_is_ejected():
+    clock = Clock()
+    slow, fast = FakeBackend("slow"), FakeBackend("fast")
+    registry = LLMRegistry([Backend(slow), Backend(fast)], max_latency_seconds=5, clock=clock)
+    backend = registry.backends[0]
+    for _ in range(3):
+        registry._record_success(backend, 9.0)
+    assert backend.ejected_until > clock.now
+    assert registry.pick().name == "fast"
+
+
+def test_request_errors_do_not_eject_or_retry():
+    bad = FakeBackend("bad", fail_with=400)
+    other = FakeBackend("other")
+    registry = LLMRegistry([Backend(bad), Backend(other)], max_errors=1)
+    registry.backends[1].in_flight = 100
+    with pytest.raises(httpx.HTTPStatusError):
+        _call(registry)
+    assert other.calls == 0
+    assert registry.backends[0].ejected_until == 0.0
+
+
+def test_all_ejected_still_routes_to_soonest_back():
+    clock = Clock()
+    a, b = FakeBackend("a"), FakeBackend("b")
+    registry = LLMRegistry([Backend(a), Backend(b)], clock=clock)
+    registry.backends[0].ejected_until = 50.0
+    registry.backends[1].ejected_until = 20.0
+    assert _call(registry) == {"backend": "b"}
+
+
+def test_llm_run_records_backend(client, db):
+    from backend.models import LLMRun
+
+    deal = f"/deals/{client.post('/deals', json={'name': 'routing'}).json()['id']}"
+    client.post(f"{deal}/documents", files={"file": ("memo.txt", b"Term: 12 months\n")})
+    assert client.post(f"{deal}/extract").status_code == 200
+    assert [run.backend for run in db.query(LLMRun).all()] == ["stub"]
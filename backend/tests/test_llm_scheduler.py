@@ -0,0 +1,101 @@
+import asyncio
+
+from backend.llm import Priority
+from backend.llm.scheduler import LLMScheduler, ScheduledLLMClient
+from backend.llm.stub import StubLLMClient
+
+
+async def _run(scheduler: LLMScheduler, jobs: list[tuple[str, Priority]], *, hold: float = 0.01) -> list[str]:
+    """Start a blocker holding the only slot, queue ``jobs`` behind it, return grant order."""
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def blocker():
+        async with scheduler.slot(Priority.interactive):
+            await release.wait()
+
+    async def job(name: str, priority: Priority):
+        async with scheduler.slot(priority):
+            order.append(name)
+            await asyncio.sleep(hold)
+
+    first = asyncio.create_task(blocker())
+    await asyncio.sleep(0)
+    tasks = []
+    for name, priority in jobs:
+        tasks.append(asyncio.create_task(job(name, priority)))
+        await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(first, *tasks)
+    return order
+
+
+def test_interactive_jumps_queued_batch_work():
+    scheduler = LLMScheduler(1, interactive_reserved=0, interactive_weight=10)
+    jobs = [("b1", Priority.batch), ("b2", Priority.batch), ("i1", Priority.interactive)]
+    assert asyncio.run(_run(scheduler, jobs)) == ["i1", "b1", "b2"]
+
+
+def test_batch_gets_weighted_share_under_interactive_load():
+    scheduler = LLMScheduler(1, interactive_reserved=0, interactive_weight=2)
+    jobs = [("b1", Priority.batch)] + [(f"i{n}", Priority.interactive) for n in range(1, 5)]
+    # The blocker counts as the first interactive grant of the streak.
+    assert asyncio.run(_run(scheduler, jobs)) == ["i1", "b1", "i2", "i3", "i4"]
+
+
+def test_starved_batch_call_is_admitted():
+    scheduler = LLMScheduler(1, interactive_reserved=0, interactive_weight=100, max_batch_wait_seconds=0.0)
+    jobs = [("b1", Priority.batch), ("i1", Priority.interactive)]
+    assert asyncio.run(_run(scheduler, jobs)) == ["b1", "i1"]
+
+
+def test_batch_never_takes_reserved_slots():
+    scheduler = LLMScheduler(3, interactive_reserved=1)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def hold(priority: Priority):
+            async with scheduler.slot(priority):
+                await release.wait()
+
+        tasks = [asyncio.create_task(hold(Priority.batch)) for _ in range(4)]
+        await asyncio.sleep(0.01)
+        assert (scheduler.running, scheduler.queued(Priority.batch)) == (2, 2)
+        tasks.append(asyncio.create_task(hold(Priority.interactive)))
+        await asyncio.sleep(0.01)
+        assert (scheduler.running, scheduler.queued(Priority.interactive)) == (3, 0)
+        release.set()
+        await asyncio.gather(*tasks)
+        assert scheduler.running == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    scheduler = LLMScheduler(1)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot(Priority.interactive):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        assert scheduler.queued(Priority.interactive) == 0
+        release.set()
+        await holder
+        assert scheduler.running == 0
+
+    asyncio.run(scenario())
+
+
+def test_scheduled_client_forwards_to_provider():
+    client = ScheduledLLMClient(StubLLMClient(), LLMScheduler(1))
+    out = asyncio.run(client.complete_json(prompt="Deal Name: Acme", schema_name="ExtractedTerms", priority=Priority.batch))
+    assert isinstance(out, dict)
@@ -0,0 +1,44 @@
+from backend.core.metrics import Histogram, Registry, STAGE_SECONDS, stage
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    h = registry.histogram("t_seconds", "test", labels=("stage",), buckets=(0.1, 1.0))
+    h.observe(0.05, stage="parse")
+    h.observe(0.5, stage="parse")
+    h.observe(5.0, stage="parse")
+
+    text = registry.render()
+
+    assert "# TYPE t_seconds histogram" in text
+    assert 't_seconds_bucket{stage="parse",le="0.1"} 1' in text
+    assert 't_seconds_bucket{stage="parse",le="1.0"} 2' in text
+    assert 't_seconds_bucket{stage="parse",le="+Inf"} 3' in text
+    assert 't_seconds_count{stage="parse"} 3' in text
+
+
+def test_stage_records_even_on_error():
+    before = STAGE_SECONDS.count(pipeline="test", stage="boom")
+    try:
+        with stage("test", "boom"):
+            raise RuntimeError("x")
+    except RuntimeError:
+        pass
+
+    assert STAGE_SECONDS.count(pipeline="test", stage="boom") == before + 1
+    assert isinstance(STAGE_SECONDS, Histogram)
+
+
+def test_llm_calls_respect_metrics_enabled(monkeypatch):
+    from backend.core.config import settings
+    from backend.core.metrics import LLM_CALLS, record_llm_call
+
+    labels = {"provider": "test", "schema": "s", "outcome": "ok"}
+    before = LLM_CALLS.value(**labels)
+    monkeypatch.setattr(settings, "metrics_enabled", False)
+    record_llm_call(provider="test", schema_name="s", outcome="ok")
+    assert LLM_CALLS.value(**labels) == before
+
+    monkeypatch.setattr(settings, "metrics_enabled", True)
+    record_llm_call(provider="test", schema_name="s", outcome="ok")
+    assert LLM_CALLS.value(**labels) == before + 1
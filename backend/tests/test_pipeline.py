@@ -0,0 +1,31 @@
+SHEET = b"Facility Amount: $2,500,000 AUD\nTerm: 12 months\nFirst ranking mortgage\n"
+CONFIRMED = {f: True for f in ("loan_amount", "lien_position", "repayment_source", "collateral_value_appraised")}
+
+
+def _stages(resp) -> dict[str, str]:
+    assert resp.status_code == 200, resp.text
+    return {s["stage"]: s["status"] for s in resp.json()["stages"]}
+
+
+def test_pipeline_skips_unchanged_stages(client):
+    deal = f"/deals/{client.post('/deals', json={'name': 'pipeline'}).json()['id']}"
+    client.post(f"{deal}/documents", files={"file": ("sheet.txt", SHEET)})
+
+    assert _stages(client.post(f"{deal}/pipeline")) == {"extract": "ran", "analyze": "ran", "draft": "blocked"}
+    assert _stages(client.post(f"{deal}/pipeline")) == {"extract": "skipped", "analyze": "skipped", "draft": "blocked"}
+    assert client.post(f"{deal}/analyze").headers["X-Stage-Status"] == "skipped"
+
+    terms = client.get(deal).json()["terms"]
+    # term_months is edited but left unconfirmed: a re-extract would overwrite it.
+    terms.update(repayment_source="Sale of units", collateral_value_appraised=4_000_000, term_months=18)
+    client.put(f"{deal}/terms", json={"terms": terms, "confirmed_fields": CONFIRMED})
+    assert _stages(client.post(f"{deal}/pipeline")) == {"extract": "skipped", "analyze": "ran", "draft": "ran"}
+    kept = client.get(deal).json()["terms"]
+    assert kept["term_months"] == 18 and kept["repayment_source"] == "Sale of units"
+
+    again = client.post(f"{deal}/pipeline").json()
+    assert again["ran"] == [] and again["skipped"] == ["extract", "analyze", "draft"]
+
+    export = client.get(f"{deal}/export")
+    assert export.status_code == 200
+    assert client.get(f"{deal}/export", headers={"If-None-Match": export.headers["etag"]}).status_code == 304
@@ -0,0 +1,49 @@
+from backend.models import Document
+from backend.services.prompts import ensure_prompt_segment, set_prompt_segment
+from backend.services.redaction import REDACTION_RULES_VERSION
+from backend.utils.hashing import sha256_text
+
+
+def _doc(text: str) -> Document:
+    return Document(deal_id="d", filename="sheet.txt", storage_path="x", sha256="0" * 64, extracted_text=text)
+
+
+def test_segment_is_sanitized_redacted_and_hashed():
+    doc = _doc("")
+    set_prompt_segment(doc, "Contact jane@example.com\x07 re Loan Amount: $1,000,000")
+
+    assert doc.prompt_segment.startswith("--- sheet.txt ---\n")
+    assert "[REDACTED_EMAIL]" in doc.prompt_segment and "\x07" not in doc.prompt_segment
+    assert doc.segment_sha256 == sha256_text(doc.prompt_segment)
+    assert doc.redaction_version == REDACTION_RULES_VERSION
+
+
+def test_stale_segments_are_rebuilt_and_current_ones_reused():
+    doc = _doc("Call 0412 345 678 about the facility")
+    assert "[REDACTED_PHONE]" in ensure_prompt_segment(doc)
+
+    doc.prompt_segment = "cached"
+    assert ensure_prompt_segment(doc) == "cached"
+
+    doc.redaction_version = "older-rules"
+    assert ensure_prompt_segment(doc) != "cached"
+    assert doc.redaction_version == REDACTION_RULES_VERSION
+
+
+def test_listings_do_not_load_prompt_columns(client, db):
+    from sqlalchemy import event
+
+    deal = f"/deals/{client.post('/deals', json={'name': 'lean'}).json()['id']}"
+    client.post(f"{deal}/documents", files={"file": ("sheet.txt", b"Term: 12 months\n")})
+    engine = db.get_bind()
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    client.get(deal)
+    client.get(f"{deal}/documents")
+    listed = [s for s in statements if "FROM documents" in s]
+    statements.clear()
+    assert client.post(f"{deal}/extract").status_code == 200
+
+    assert listed and not any("prompt_segment" in s or "passages_json" in s for s in listed)
+    assert any("prompt_segment" in s for s in statements if "FROM documents" in s)
@@ -0,0 +1,39 @@
+from backend.benchmarks.corpus import generate_term_sheet
+from backend.models import Document
+from backend.services.prompts import assemble_deal_text, set_prompt_segment
+from backend.services.retrieval import BM25Index, chunk_passages, index_passages
+
+
+def test_chunks_cover_text_on_line_boundaries():
+    text = "\n".join(f"Clause {i}: " + "words " * 30 for i in range(50))
+    spans = chunk_passages(text, target_chars=500)
+
+    assert spans[0][0] == 0 and spans[-1][1] == len(text)
+    assert all(a[1] == b[0] for a, b in zip(spans, spans[1:]))
+    assert all(text[end - 1] == "\n" for _, end in spans[:-1])
+
+
+def test_bm25_prefers_passage_with_query_terms():
+    filler = "The borrower shall provide quarterly reports to the agent. " * 20
+    target = "The Lender holds a first ranking registered mortgage over the Secured Property."
+    text = f"{filler}\n{target}\n{filler}"
+    index = BM25Index([index_passages(text, target_chars=400)])
+
+    best = index.search("first ranking lien mortgage", 1)[0]
+    assert target in text[best.start : best.end]
+
+
+def test_large_corpus_is_reduced_to_relevant_passages():
+    sheet = generate_term_sheet(20, seed=1)
+    docs = []
+    for i in range(2):
+        doc = Document(filename=f"agreement-{i}.txt", extracted_text=sheet.text)
+        set_prompt_segment(doc, sheet.text)
+        docs.append(doc)
+
+    text, stats = assemble_deal_text(docs)
+
+    assert stats["mode"] == "retrieval"
+    assert stats["deal_text_chars"] * 10 < stats["corpus_chars"]
+    assert text.startswith("--- agreement-0.txt ---")
+    assert sheet.schedule[0][1] in text  # the facility amount
@@ -0,0 +1,47 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from backend.llm.stub import StubLLMClient
+from backend.services.singleflight import coalesce
+
+
+def test_concurrent_callers_share_one_computation():
+    db = Session(create_engine("sqlite://"))
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def scenario():
+        run = lambda: coalesce(db, ("d", "extract", "h"), compute, recheck=lambda: None, on_shared=lambda r: f"shared {r}")
+        return await asyncio.gather(run(), run(), run())
+
+    assert asyncio.run(scenario()) == ["result", "shared result", "shared result"]
+    assert calls == 1
+
+
+def test_double_submitted_extract_makes_one_llm_call(client, monkeypatch):
+    calls: list[str] = []
+
+    class SlowLLM(StubLLMClient):
+        async def complete_json(self, *, prompt: str, schema_name: str, **kwargs) -> dict:
+            calls.append(schema_name)
+            await asyncio.sleep(0.3)
+            return await super().complete_json(prompt=prompt, schema_name=schema_name, **kwargs)
+
+    monkeypatch.setattr("backend.api.deals.get_llm_client", SlowLLM)
+    deal = f"/deals/{client.post('/deals', json={'name': 'double-click'}).json()['id']}"
+    client.post(f"{deal}/documents", files={"file": ("sheet.txt", b"Term: 12 months\n")})
+
+    with ThreadPoolExecutor(2) as pool:
+        responses = list(pool.map(lambda _: client.post(f"{deal}/extract"), range(2)))
+
+    assert len(calls) == 1
+    assert responses[0].json() == responses[1].json()
+    assert sorted(r.headers["X-Stage-Status"] for r in responses) == ["ran", "skipped"]
@@ -0,0 +1,162 @@
+import datetime as dt
+import os
+from pathlib import Path
+
+from backend.storage.cas import ContentAddressedStorage
+
+
+def test_identical_bytes_are_stored_once_across_deals(tmp_path):
+    store = ContentAddressedStorage(root=str(tmp_path))
+
+    a = store.save("deal-a", "term_sheet.pdf", b"%PDF-1.4 same bytes")
+    b = store.save("deal-b", "renamed.PDF", b"%PDF-1.4 same bytes")
+
+    assert a == b
+    assert a.suffix == ".pdf"
+    assert a.parent.parent.parent == tmp_path / "blobs"
+    assert store.refcount(a) == 2
+    assert store.read(a) == b"%PDF-1.4 same bytes"
+
+
+def test_same_filename_new_bytes_does_not_overwrite(tmp_path):
+    store = ContentAddressedStorage(root=str(tmp_path))
+
+    v1 = store.save("deal", "valuation.txt", b"v1")
+    v2 = store.save("deal", "valuation.txt", b"v2")
+
+    assert v1 != v2
+    assert store.read(v1) == b"v1"
+
+
+def test_gc_removes_only_unreferenced_blobs(tmp_path):
+    store = ContentAddressedStorage(root=str(tmp_path))
+    kept = store.save("deal", "a.txt", b"keep")
+    dropped = store.save("deal", "b.txt", b"drop")
+    store.release(dropped)
+
+    assert store.gc(min_age_seconds=3600) == []  # too young
+
+    old = 1_000_000_000
+    os.utime(dropped, (old, old))
+    assert store.gc(min_age_seconds=3600) == [dropped]
+    assert not dropped.exists()
+    assert kept.exists()
+
+
+def test_range_and_mmap_reads(tmp_path):
+    store = ContentAddressedStorage(root=str(tmp_path))
+    data = bytes(range(256)) * 40
+    path = store.save("deal", "blob.bin", data)
+
+    assert store.size(path) == len(data)
+    assert b"".join(store.iter_range(path, chunk_size=1000)) == data
+    assert store.read_range(path, 100, 4100) == data[100:4100]
+    assert store.read_range(path, len(data) - 5) == data[-5:]
+    with store.mmap_view(path) as view:
+        assert view[10:20] == data[10:20]
+
+
+def test_parse_range_header():
+    import pytest
+
+    from backend.utils.http_range import RangeNotSatisfiable, parse_range
+
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 10)
+    assert parse_range("bytes=90-", 100) == (90, 100)
+    assert parse_range("bytes=-10", 100) == (90, 100)
+    assert parse_range("bytes=95-500", 100) == (95, 100)
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=100-", 100)
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=-5", 0)
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=-0", 100)
+
+
+def test_document_content_endpoint_serves_ranges(client):
+    body = b"Loan Amount: $1,000,000\n" * 200
+    deal_id = client.post("/deals", json={"name": "range"}).json()["id"]
+    doc_id = client.post(f"/deals/{deal_id}/documents", files={"file": ("t.txt", body)}).json()["document_id"]
+    url = f"/deals/{deal_id}/documents/{doc_id}/content"
+
+    full = client.get(url)
+    assert full.status_code == 200
+    assert full.content == body
+    assert full.headers["accept-ranges"] == "bytes"
+
+    part = client.get(url, headers={"Range": "bytes=24-47"})
+    assert part.status_code == 206
+    assert part.content == body[24:48]
+    assert part.headers["content-range"] == f"bytes 24-47/{len(body)}"
+
+    assert client.get(url, headers={"Range": f"bytes={len(body)}-"}).status_code == 416
+    assert client.get(f"/deals/{deal_id}/documents/999/content").status_code == 404
+
+
+def test_gc_keeps_the_shard_lock_and_sweeps_stale_staging(tmp_path):
+    store = ContentAddressedStorage(root=str(tmp_path))
+    dropped = store.save("deal", "b.txt", b"drop")
+    store.release(dropped)
+    stale = Path(store.begin_upload(1024)["staging"])
+    live = Path(store.begin_upload(1024)["staging"])
+    old = 1_000_000_000
+    os.utime(dropped, (old, old))
+    os.utime(stale, (old, old))
+
+    assert store.gc(min_age_seconds=3600, staging_max_age_seconds=3600) == [dropped]
+    assert (dropped.parent / ".lock").exists()  # only the refs file is removed
+    assert not stale.exists() and live.exists()
+
+    again = store.save("deal", "b.txt", b"drop")
+    assert again == dropped and store.refcount(again) == 1
+
+
+def test_upload_store_without_commit_staged_cannot_be_built(tmp_path):
+    import pytest
+
+    from backend.storage.filesystem import FilesystemUploads
+
+    class Incomplete(FilesystemUploads):
+        root = tmp_path
+
+    with pytest.raises(TypeError, match="_commit_staged"):
+        Incomplete()
+
+
+def test_storage_gc_expires_idle_uploads(client, db):
+    from backend.models import UploadSession
+    from backend.services.storage_gc import collect
+    from backend.storage import get_storage
+
+    deal = f"/deals/{client.post('/deals', json={'name': 'gc'}).json()['id']}"
+    upload_id = client.post(f"{deal}/uploads", json={"filename": "a.txt", "size_bytes": 10}).json()["upload_id"]
+    session = db.get(UploadSession, upload_id)
+    session.updated_at = dt.datetime(2020, 1, 1, tzinfo=dt.timezone.utc)
+    db.commit()
+
+    result = collect(db, get_storage(), upload_max_age_seconds=3600)
+
+    assert result["expired_uploads"] == [upload_id]
+    assert not Path(session.storage_state["staging"]).exists()
+    assert client.put(f"{deal}/uploads/{upload_id}", params={"offset": 0}, content=b"0123456789").status_code == 409
+
+
+def test_download_header_survives_unicode_and_quotes(client):
+    from urllib.parse import quote
+
+    from backend.utils.http_headers import content_disposition
+
+    # Multipart clients percent-encode quotes in filenames, so those are checked directly.
+    assert content_disposition("inline", 'a"b.pdf') == "inline; filename=\"a_b.pdf\"; filename*=UTF-8''a%22b.pdf"
+
+    name = "Résumé 契約.txt"
+    deal_id = client.post("/deals", json={"name": "names"}).json()["id"]
+    doc_id = client.post(f"/deals/{deal_id}/documents", files={"file": (name, b"Term: 12 months\n")}).json()["document_id"]
+    resp = client.get(f"/deals/{deal_id}/documents/{doc_id}/content")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-disposition"] == (
+        f"inline; filename=\"Resume __.txt\"; filename*=UTF-8''{quote(name, safe='')}"
+    )
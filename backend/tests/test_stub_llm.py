@@ -0,0 +1,45 @@
+import asyncio
+
+from backend.llm.stub import StubLLMClient, scan_deal_text
+
+TEMPLATE_NOISE = 'Schema: "lien_position": "first"|"second", "jurisdiction": string\nDEAL TEXT\n'
+
+DEAL = """Facility Amount: $12,500,000 AUD
+Interest: 11.5% per annum
+Term: 12 months
+Collateral: residential development site
+Appraised Value: $18,000,000
+As-is value: $15.5m
+Stressed Value: $14,000,000
+Lien Position: second ranking
+Governed by the laws of New South Wales.
+"""
+
+
+def test_extracts_loan_lvr_inputs_lien_and_jurisdiction():
+    out = asyncio.run(StubLLMClient().complete_json(prompt=TEMPLATE_NOISE + DEAL, schema_name="ExtractedTerms"))
+
+    assert out["loan_amount"] == 12_500_000
+    assert out["currency"] == "AUD"
+    assert out["interest_rate_pct"] == 11.5
+    assert out["term_months"] == 12
+    assert out["collateral_type"] == "residential development site"
+    assert out["collateral_value_appraised"] == 18_000_000
+    assert out["collateral_value_as_is"] == 15_500_000
+    assert out["collateral_value_stressed"] == 14_000_000
+    assert out["lien_position"] == "second"
+    assert out["jurisdiction"] == "New South Wales"
+    assert out["citations"]["loan_amount"][0].startswith("Facility Amount")
+
+
+def test_first_occurrence_wins_and_unlabelled_money_is_fallback():
+    found = scan_deal_text("Advance of $2.5m to the borrower.\nTerm: 6 months\nTerm: 9 months")
+
+    assert found["loan_amount"][0] == 2_500_000
+    assert found["term_months"][0] == 6
+
+
+def test_scan_is_deterministic_on_large_input():
+    big = DEAL + ("The Borrower must not create any Security Interest. " * 50_000)
+
+    assert scan_deal_text(big) == scan_deal_text(big)
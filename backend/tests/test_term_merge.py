@@ -0,0 +1,79 @@
+import pytest
+
+from backend.llm.stub import StubLLMClient
+from backend.services.term_merge import merge_terms
+
+
+def _out(**fields):
+    citations = fields.pop("citations", {})
+    return {"collateral_type": "unknown", **fields, "citations": citations}
+
+
+def test_newest_cited_value_wins_and_lists_are_unioned():
+    older = _out(loan_amount=1_000_000.0, currency="USD", key_conditions=["Presales"], citations={"currency": ["USD 1m"]})
+    newer = _out(loan_amount=1_200_000.0, collateral_value_as_is=2_000_000.0, key_conditions=["Presales", "Valuation"])
+
+    merged = merge_terms([older, newer])
+
+    assert merged["loan_amount"] == 1_200_000.0
+    assert merged["currency"] == "USD"  # the newer doc only has the default
+    assert merged["citations"]["currency"] == ["USD 1m"]
+    assert merged["collateral_value_as_is"] == 2_000_000.0
+    assert merged["key_conditions"] == ["Presales", "Valuation"]
+
+
+def test_confirmed_fields_are_preserved():
+    existing = _out(loan_amount=900_000.0, citations={"loan_amount": ["confirmed by credit"]})
+
+    merged = merge_terms([_out(loan_amount=1_000_000.0)], existing=existing, confirmed={"loan_amount": True})
+
+    assert merged["loan_amount"] == 900_000.0
+    assert merged["citations"]["loan_amount"] == ["confirmed by credit"]
+
+
+def test_reextract_sends_only_new_documents(client, monkeypatch):
+    prompts: list[str] = []
+
+    class CountingLLM(StubLLMClient):
+        async def complete_json(self, *, prompt: str, schema_name: str, **kwargs) -> dict:
+            prompts.append(prompt)
+            return await super().complete_json(prompt=prompt, schema_name=schema_name, **kwargs)
+
+    monkeypatch.setattr("backend.api.deals.get_llm_client", CountingLLM)
+    deal = f"/deals/{client.post('/deals', json={'name': 'incremental'}).json()['id']}"
+    for i in range(3):
+        client.post(f"{deal}/documents", files={"file": (f"doc{i}.txt", f"Term: {12 + i} months\n".encode())})
+    assert client.post(f"{deal}/extract").json()["term_months"] == 14
+    assert len(prompts) == 3
+
+    client.put(f"{deal}/terms", json={"terms": {"collateral_type": "land", "term_months": 10}, "confirmed_fields": {"term_months": True}})
+    client.post(f"{deal}/documents", files={"file": ("valuation.txt", b"As is value: $3,000,000\n")})
+    terms = client.post(f"{deal}/extract").json()
+
+    assert len(prompts) == 4 and "valuation.txt" in prompts[-1]
+    assert terms["term_months"] == 10
+
+
+def test_failed_document_keeps_the_others_results(client, monkeypatch):
+    prompts: list[str] = []
+    fail = {"bad.txt"}
+
+    class FlakyLLM(StubLLMClient):
+        async def complete_json(self, *, prompt: str, schema_name: str, **kwargs) -> dict:
+            prompts.append(prompt)
+            if any(name in prompt for name in fail):
+                raise RuntimeError("upstream 500")
+            return await super().complete_json(prompt=prompt, schema_name=schema_name, **kwargs)
+
+    monkeypatch.setattr("backend.api.deals.get_llm_client", FlakyLLM)
+    deal = f"/deals/{client.post('/deals', json={'name': 'flaky'}).json()['id']}"
+    for name in ("good.txt", "bad.txt"):
+        client.post(f"{deal}/documents", files={"file": (name, f"{name} Term: 12 months\n".encode())})
+    with pytest.raises(RuntimeError):
+        client.post(f"{deal}/extract")
+    assert len(prompts) == 2
+
+    fail.clear()
+    assert client.post(f"{deal}/extract").status_code == 200
+
+    assert len(prompts) == 3 and "bad.txt" in prompts[-1]
@@ -0,0 +1,53 @@
+from backend.benchmarks.corpus import generate_term_sheet
+from backend.core.config import settings
+from backend.llm.tokens import context_window, count_tokens, prompt_budget, truncate_to_tokens
+from backend.models import Document
+from backend.services.prompts import assemble_deal_text, set_prompt_segment
+
+
+def test_estimate_is_in_the_usual_chars_per_token_range():
+    text = generate_term_sheet(5, seed=3).text
+    tokens = count_tokens(text)
+    assert len(text) / 6 < tokens < len(text) / 2
+
+
+def test_truncate_to_tokens_fits_the_limit():
+    text = "The facility is secured by a first ranking mortgage. " * 50
+    cut = truncate_to_tokens(text, 40)
+    assert text.startswith(cut)
+    assert 30 < count_tokens(cut) <= 40
+
+
+def test_context_window_by_model_prefix(monkeypatch):
+    assert context_window("gpt-4o-mini-2024-07-18") == 128_000
+    assert context_window("gpt-4-0613") == 8_192
+    monkeypatch.setattr(settings, "llm_context_window_tokens", 4_000)
+    assert context_window("gpt-4o") == 4_000
+    assert prompt_budget("ExtractedTerms") < 4_000
+
+
+def test_oversized_document_is_cut_to_best_passages():
+    sheet = generate_term_sheet(20, seed=1)
+    doc = Document(filename="agreement.txt", extracted_text=sheet.text)
+    set_prompt_segment(doc, sheet.text)
+
+    text, stats = assemble_deal_text([doc], max_tokens=1_500)
+
+    assert stats["mode"] == "budget"
+    assert stats["dropped_passages"] > 0
+    assert stats["deal_text_tokens"] == count_tokens(text) <= 1_500
+    assert text.startswith("--- agreement.txt ---")
+
+
+def test_usage_reports_tokens_per_deal(client):
+    deal = f"/deals/{client.post('/deals', json={'name': 'usage'}).json()['id']}"
+    client.post(f"{deal}/documents", files={"file": ("sheet.txt", b"Term: 12 months\nInterest rate: 9%\n")})
+    client.post(f"{deal}/extract")
+    usage = client.get(f"{deal}/usage").json()
+
+    assert usage["runs"] == 1
+    assert usage["prompt_tokens"] > usage["completion_tokens"] > 0
+    assert usage["by_prompt"][0]["prompt_name"] == "extract_terms"
+    assert usage["by_prompt"][0]["backend"] == "stub"
+    assert usage["cost_usd"] > 0
+
@@ -0,0 +1,37 @@
+import json
+import time
+
+from backend.core import tracing
+from backend.core.config import settings
+
+
+def _run_trace(monkeypatch, tmp_path, *, sample_rate, threshold_ms, sleep_s=0.0):
+    monkeypatch.setattr(settings, "tracing_enabled", True)
+    monkeypatch.setattr(settings, "tracing_sample_rate", sample_rate)
+    monkeypatch.setattr(settings, "tracing_slow_threshold_ms", threshold_ms)
+    exporter = tracing.FileExporter(str(tmp_path / "spans.jsonl"))
+    monkeypatch.setattr(tracing, "_exporter", exporter)
+
+    with tracing.start_trace("http.request"):
+        tracing.set_attribute("actor", "analyst@local")
+        with tracing.span("extract_text"):
+            with tracing.span("db.query"):
+                time.sleep(sleep_s)
+
+    exporter.flush()
+    path = tmp_path / "spans.jsonl"
+    return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+
+def test_slow_trace_is_retained_with_nested_spans(monkeypatch, tmp_path):
+    spans = _run_trace(monkeypatch, tmp_path, sample_rate=0.0, threshold_ms=5, sleep_s=0.01)
+
+    by_name = {s["name"]: s for s in spans}
+    assert set(by_name) == {"http.request", "extract_text", "db.query"}
+    assert by_name["db.query"]["parent_id"] == by_name["extract_text"]["span_id"]
+    assert by_name["extract_text"]["parent_id"] == by_name["http.request"]["span_id"]
+    assert all(s["attributes"]["actor"] == "analyst@local" for s in spans)
+
+
+def test_fast_unsampled_trace_is_dropped(monkeypatch, tmp_path):
+    assert _run_trace(monkeypatch, tmp_path, sample_rate=0.0, threshold_ms=10_000) == []
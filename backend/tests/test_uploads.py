@@ -0,0 +1,83 @@
+import hashlib
+
+import pytest
+
+from backend.core.config import settings
+from backend.services.upload_hashes import RUNNING_HASHES
+
+BODY = b"Facility Amount: $2,500,000 AUD\nTerm: 12 months\n" * 100
+
+
+@pytest.fixture
+def client(client, monkeypatch):
+    monkeypatch.setattr(settings, "upload_chunk_size_bytes", 1024)
+    return client
+
+
+def _start(client, **extra):
+    deal_id = client.post("/deals", json={"name": "resumable"}).json()["id"]
+    resp = client.post(f"/deals/{deal_id}/uploads", json={"filename": "sheet.txt", "size_bytes": len(BODY), **extra})
+    assert resp.status_code == 201
+    return f"/deals/{deal_id}", resp.json()
+
+
+def test_chunked_upload_resumes_and_feeds_extraction(client):
+    base, session = _start(client, sha256=hashlib.sha256(BODY).hexdigest())
+    url = f"{base}/uploads/{session['upload_id']}"
+    chunk = session["chunk_size"]
+
+    assert client.put(url, params={"offset": 0}, content=BODY[:chunk]).json()["received_bytes"] == chunk
+    # Retried chunk is a no-op; a gap is rejected with the offset to resume from.
+    assert client.put(url, params={"offset": 0}, content=BODY[:chunk]).status_code == 200
+    gap = client.put(url, params={"offset": 2 * chunk}, content=BODY[2 * chunk : 3 * chunk])
+    assert gap.status_code == 409 and gap.json()["detail"]["expected_offset"] == chunk
+    assert client.post(f"{url}/complete").status_code == 409
+
+    offset = client.get(url).json()["next_offset"]
+    while offset < len(BODY):
+        offset = client.put(url, params={"offset": offset}, content=BODY[offset : offset + chunk]).json()["next_offset"]
+
+    done = client.post(f"{url}/complete")
+    assert done.status_code == 200, done.text
+    doc = done.json()
+    assert doc["sha256"] == hashlib.sha256(BODY).hexdigest()
+    assert doc["size_bytes"] == len(BODY)
+    assert client.post(f"{url}/complete").json()["document_id"] == doc["document_id"]
+    assert client.get(f"{base}/documents/{doc['document_id']}/content").content == BODY
+    assert client.post(f"{base}/extract").json()["loan_amount"] == 2_500_000
+
+
+def test_oversized_chunk_is_rejected_before_it_is_staged(client):
+    base, session = _start(client)
+    url = f"{base}/uploads/{session['upload_id']}"
+
+    assert client.put(url, params={"offset": 0}, content=BODY[: session["chunk_size"] + 1]).status_code == 413
+    assert client.get(url).json()["received_bytes"] == 0
+
+
+def test_digest_mismatch_discards_upload(client):
+    base, session = _start(client, sha256="0" * 64)
+    url = f"{base}/uploads/{session['upload_id']}"
+    chunk = session["chunk_size"]
+    for offset in range(0, len(BODY), chunk):
+        client.put(url, params={"offset": offset}, content=BODY[offset : offset + chunk])
+    # Force the fallback path that hashes the staged file.
+    RUNNING_HASHES.discard(session["upload_id"])
+
+    assert client.post(f"{url}/complete").status_code == 422
+    assert client.get(url).json()["status"] == "aborted"
+
+
+def test_batch_upload_reports_per_file_status(client):
+    deal_id = client.post("/deals", json={"name": "data room"}).json()["id"]
+    files = [("files", (f"doc{i}.txt", f"Term: {i + 6} months".encode(), "text/plain")) for i in range(6)]
+    files.append(("files", ("notes.xls", b"nope", "application/vnd.ms-excel")))
+
+    resp = client.post(f"/deals/{deal_id}/documents/batch", files=files)
+
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["created"] == 6 and body["failed"] == 1
+    assert [r["status"] for r in body["results"]] == ["ok"] * 6 + ["error"]
+    assert body["results"][0]["filename"] == "doc0.txt" and body["results"][0]["document_id"]
+    assert len(client.get(f"/deals/{deal_id}/documents").json()) == 6
@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from backend import models  # noqa: F401
+from backend.db import upsert as upsert_module
+from backend.db.base import Base
+from backend.db.upsert import upsert
+from backend.models import Deal, DealTerms
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Deal(id="d1", name="Acme"))
+        session.commit()
+        yield session
+
+
+def _write(db: Session, terms: dict, confirmed: dict) -> DealTerms:
+    return upsert(
+        db,
+        DealTerms,
+        key={"deal_id": "d1"},
+        values={"terms_json": terms, "citations_json": {}},
+        insert_only={"confirmed_fields_json": confirmed},
+    )
+
+
+@pytest.mark.parametrize("on_conflict", [True, False], ids=["on_conflict", "fallback"])
+def test_upsert_inserts_then_updates(db, monkeypatch, on_conflict):
+    if not on_conflict:
+        monkeypatch.setattr(upsert_module, "_ON_CONFLICT_INSERTS", {})
+
+    first = _write(db, {"term_months": 12}, {"term_months": True})
+    db.commit()
+    created, updated = first.created_at, first.updated_at
+
+    second = _write(db, {"term_months": 18}, {})
+    db.commit()
+
+    assert second is first
+    assert second.terms_json == {"term_months": 18}
+    assert second.confirmed_fields_json == {"term_months": True}  # insert-only
+    assert second.created_at == created
+    assert second.updated_at > updated
+    assert db.query(DealTerms).count() == 1
+
+
+def test_upsert_is_one_statement(db):
+    statements: list[str] = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    _write(db, {}, {})
+    _write(db, {"loan_amount": 1.0}, {})
+    assert len(statements) == 2
+    assert all("ON CONFLICT" in s for s in statements)
+
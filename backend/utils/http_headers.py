@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from pathlib import PurePath
+from urllib.parse import quote
+
+
+def content_disposition(disposition: str, filename: str) -> str:
+    """``Content-Disposition`` value that is safe for any filename (RFC 6266 / 5987).
+
+    ``filename`` gets an ASCII fallback with quotes, backslashes and control characters
+    replaced; ``filename*`` carries the exact UTF-8 name for clients that support it.
+    """
+    name = PurePath(filename.replace("\\", "/")).name or "download"
+    # Accents are dropped (é -> e); other non-ASCII characters become "_".
+    ascii_name = "".join(c for c in unicodedata.normalize("NFKD", name) if not unicodedata.combining(c))
+    ascii_name = re.sub(r'[^\x20-\x7e]|["\\]', "_", ascii_name).strip() or "download"
+    return f"{disposition}; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(name, safe='')}"
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse a single ``Range: bytes=...`` header into a half-open ``(start, end)``.
+
+    Returns None when the whole object should be served (no header, another unit, or a
+    multi-range request, which we do not support). Raises RangeNotSatisfiable for ranges
+    outside the object.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first == "":
+            # Suffix range: the last N bytes.
+            length = int(last)
+        else:
+            start = int(first)
+            end = int(last) + 1 if last else size
+    except ValueError:
+        return None
+
+    if first == "":
+        # An empty object has no last byte to serve.
+        if length <= 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(0, size - length), size
+    if start >= size or start < 0 or end <= start:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size)
@@ -1,4 +1,4 @@
-import type { AnalysisResponse, DealDetail, DealOut, ExtractedTerms, ICDraft, UploadDocumentResponse } from './types';
+import type { AnalysisResponse, BatchUploadResponse, DealDetail, DealOut, ExtractedTerms, ICDraft, LLMUsage, PipelineResponse, UploadDocumentResponse, UploadSession } from './types';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
 
@@ -31,6 +31,38 @@ export const api = {
     return http<UploadDocumentResponse>(`/deals/${encodeURIComponent(dealId)}/documents`, { method: 'POST', body: fd });
   },
 
+  uploadDocuments: async (dealId: string, files: File[]) => {
+    const fd = new FormData();
+    files.forEach((f) => fd.append('files', f));
+    return http<BatchUploadResponse>(`/deals/${encodeURIComponent(dealId)}/documents/batch`, { method: 'POST', body: fd });
+  },
+
+  // Chunked upload that survives dropped connections: each chunk is retried, and the
+  // server's next_offset tells us where to carry on.
+  uploadDocumentResumable: async (dealId: string, file: File, onProgress?: (received: number, total: number) => void) => {
+    const base = `/deals/${encodeURIComponent(dealId)}/uploads`;
+    let session = await http<UploadSession>(base, {
+      method: 'POST',
+      headers: { 'content-type': 'application/json' },
+      body: JSON.stringify({ filename: file.name, size_bytes: file.size, content_type: file.type || null })
+    });
+    const url = `${base}/${session.upload_id}`;
+    let attempts = 0;
+    while (session.next_offset < file.size) {
+      const chunk = file.slice(session.next_offset, session.next_offset + session.chunk_size);
+      try {
+        session = await http<UploadSession>(`${url}?offset=${session.next_offset}`, { method: 'PUT', body: chunk });
+        attempts = 0;
+        onProgress?.(session.received_bytes, file.size);
+      } catch (err) {
+        if (++attempts > 5) throw err;
+        await new Promise((r) => setTimeout(r, 1000 * attempts));
+        session = await http<UploadSession>(url);
+      }
+    }
+    return http<UploadDocumentResponse>(`${url}/complete`, { method: 'POST' });
+  },
+
   extractTerms: (dealId: string) => http<ExtractedTerms>(`/deals/${encodeURIComponent(dealId)}/extract`, { method: 'POST' }),
   updateTerms: (dealId: string, terms: ExtractedTerms, confirmed_fields: Record<string, boolean>) =>
     http<{ status: string }>(`/deals/${encodeURIComponent(dealId)}/terms`, {
@@ -40,6 +72,13 @@ export const api = {
     }),
   analyze: (dealId: string) => http<AnalysisResponse>(`/deals/${encodeURIComponent(dealId)}/analyze`, { method: 'POST' }),
   draft: (dealId: string) => http<ICDraft>(`/deals/${encodeURIComponent(dealId)}/draft`, { method: 'POST' }),
+  runPipeline: (dealId: string) => http<PipelineResponse>(`/deals/${encodeURIComponent(dealId)}/pipeline`, { method: 'POST' }),
+  llmUsage: (dealId: string) => http<LLMUsage>(`/deals/${encodeURIComponent(dealId)}/usage`),
+  // Server-sent events for live stage/upload/LLM progress (see DealEvent).
+  dealEventsUrl: (dealId: string) => `${API_BASE_URL}/deals/${encodeURIComponent(dealId)}/events`,
+  // Plain URL so the browser can stream it and issue its own Range requests (PDF viewer).
+  documentContentUrl: (dealId: string, documentId: number) =>
+    `${API_BASE_URL}/deals/${encodeURIComponent(dealId)}/documents/${documentId}/content`,
   exportPdf: async (dealId: string) => {
     const res = await fetch(`${API_BASE_URL}/deals/${encodeURIComponent(dealId)}/export`, { headers: { 'x-dev-actor': 'dev.user@local' } });
     if (!res.ok) throw new Error('Export failed');
@@ -4,10 +4,34 @@ export type DealOut = {
   created_at: string;
 };
 
+export type ExtractionStatus = 'ok' | 'timeout' | 'memory_limit' | 'error';
+
 export type UploadDocumentResponse = {
   document_id: number;
   filename: string;
   sha256: string;
+  extraction_status?: ExtractionStatus;
+};
+
+export type BatchUploadResult =
+  | (UploadDocumentResponse & { status: 'ok' })
+  | { filename: string; status: 'error'; error: string };
+
+export type BatchUploadResponse = {
+  results: BatchUploadResult[];
+  created: number;
+  failed: number;
+};
+
+export type UploadSession = {
+  upload_id: string;
+  filename: string;
+  size_bytes: number;
+  chunk_size: number;
+  received_bytes: number;
+  next_offset: number;
+  status: 'open' | 'completed' | 'aborted';
+  document_id: number | null;
 };
 
 export type DocumentOut = {
@@ -17,6 +41,7 @@ export type DocumentOut = {
   content_type?: string | null;
   size_bytes?: number | null;
   sha256: string;
+  extraction_status?: ExtractionStatus;
   created_at: string;
 };
 
@@ -56,11 +81,65 @@ export type ICDraft = {
   what_changes_my_mind: string;
 };
 
+export type StageOutcome = {
+  stage: 'extract' | 'analyze' | 'draft';
+  status: 'ran' | 'skipped' | 'blocked';
+  input_hash: string | null;
+  reason: string | null;
+};
+
+export type PipelineResponse = {
+  stages: StageOutcome[];
+  ran: string[];
+  skipped: string[];
+};
+
+export type LLMUsageRow = {
+  prompt_name: string;
+  backend: string | null;
+  runs: number;
+  prompt_tokens: number;
+  completion_tokens: number;
+  cost_usd: number;
+};
+
+export type LLMUsage = {
+  runs: number;
+  prompt_tokens: number;
+  completion_tokens: number;
+  cost_usd: number;
+  by_prompt: LLMUsageRow[];
+};
+
+export type DealEvent = {
+  type: 'stage' | 'upload' | 'document' | 'llm' | 'pipeline';
+  deal_id: string;
+  ts: number;
+  stage?: string;
+  status?: string;
+  reason?: string | null;
+  filename?: string;
+  received_bytes?: number;
+  size_bytes?: number;
+  completed?: number;
+  total?: number;
+  tokens?: number;
+};
+
+export type CitationSpan = {
+  snippet: string;
+  document_id: number | null;
+  page: number | null;
+  start: number | null;
+  end: number | null;
+};
+
 export type DealDetail = {
   deal: DealOut;
   documents: DocumentOut[];
   terms: ExtractedTerms | null;
   citations: Record<string, string[] | null> | null;
+  citation_spans: Record<string, CitationSpan[]> | null;
   confirmed_fields: Record<string, boolean> | null;
   analysis: AnalysisResponse | null;
   draft: ICDraft | null;
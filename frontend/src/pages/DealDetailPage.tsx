@@ -1,6 +1,6 @@
-import React, { useEffect, useMemo, useState } from 'react';
+import React, { useEffect, useMemo, useRef, useState } from 'react';
 import { api } from '../api/client';
-import type { DealDetail, ExtractedTerms } from '../api/types';
+import type { DealDetail, DealEvent, ExtractedTerms, LLMUsage } from '../api/types';
 
 const emptyTerms: ExtractedTerms = {
   loan_amount: null,
@@ -22,17 +22,55 @@ const emptyTerms: ExtractedTerms = {
   citations: {}
 };
 
+// Larger files go through the chunked, resumable upload endpoints.
+const RESUMABLE_UPLOAD_THRESHOLD = 16 * 1024 * 1024;
+
+function describeEvent(ev: DealEvent): string {
+  switch (ev.type) {
+    case 'stage':
+      return `${ev.stage}: ${ev.status}${ev.reason ? ` (${ev.reason})` : ''}`;
+    case 'upload':
+      return ev.size_bytes
+        ? `Uploading ${ev.filename}: ${Math.round((100 * (ev.received_bytes || 0)) / ev.size_bytes)}%`
+        : `Processed ${ev.completed}/${ev.total} files`;
+    case 'llm':
+      return ev.tokens != null ? `${ev.stage}: ${ev.tokens} tokens` : `${ev.stage}: ${ev.completed}/${ev.total} documents`;
+    case 'document':
+      return `Added ${ev.filename}`;
+    default:
+      return ev.type;
+  }
+}
+
 export function DealDetailPage({ dealId, onBack }: { dealId: string; onBack: () => void }) {
   const [detail, setDetail] = useState<DealDetail | null>(null);
   const [terms, setTerms] = useState<ExtractedTerms>(emptyTerms);
   const [confirmed, setConfirmed] = useState<Record<string, boolean>>({});
   const [error, setError] = useState<string | null>(null);
   const [busy, setBusy] = useState<string | null>(null);
+  const [usage, setUsage] = useState<LLMUsage | null>(null);
 
-  async function refresh() {
+  // Unsaved edits to terms/confirmations. A ref, so the event listener sees the current value.
+  const dirty = useRef(false);
+  // Server terms the local edits started from, to tell whether an event changed them.
+  const loadedTerms = useRef('');
+  const [termsChanged, setTermsChanged] = useState(false);
+
+  // keepEdits: refreshes triggered by other users' activity leave unsaved edits alone and
+  // offer a reload instead.
+  async function refresh({ keepEdits = false } = {}) {
     setError(null);
-    const d = await api.dealDetail(dealId);
+    const [d, u] = await Promise.all([api.dealDetail(dealId), api.llmUsage(dealId)]);
     setDetail(d);
+    setUsage(u);
+    const serverTerms = JSON.stringify([d.terms, d.confirmed_fields]);
+    if (keepEdits && dirty.current) {
+      if (serverTerms !== loadedTerms.current) setTermsChanged(true);
+      return;
+    }
+    dirty.current = false;
+    loadedTerms.current = serverTerms;
+    setTermsChanged(false);
     setTerms(d.terms || emptyTerms);
     setConfirmed(d.confirmed_fields || {});
   }
@@ -42,6 +80,22 @@ export function DealDetailPage({ dealId, onBack }: { dealId: string; onBack: ()
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [dealId]);
 
+  // Live progress instead of polling: re-read the deal only when something finished.
+  const [progress, setProgress] = useState<string | null>(null);
+  useEffect(() => {
+    const source = new EventSource(api.dealEventsUrl(dealId));
+    const onEvent = (msg: MessageEvent) => {
+      const ev = JSON.parse(msg.data) as DealEvent;
+      setProgress(describeEvent(ev));
+      if (ev.type === 'document' || (ev.type === 'stage' && ev.status === 'ran')) {
+        refresh({ keepEdits: true }).catch((e) => setError(String(e)));
+      }
+    };
+    for (const kind of ['stage', 'upload', 'document', 'llm']) source.addEventListener(kind, onEvent);
+    return () => source.close();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [dealId]);
+
   const requiredDraftReady = useMemo(() => {
     const okLoan = !!confirmed.loan_amount;
     const okLien = !!confirmed.lien_position;
@@ -51,9 +105,15 @@ export function DealDetailPage({ dealId, onBack }: { dealId: string; onBack: ()
   }, [confirmed]);
 
   function updateField<K extends keyof ExtractedTerms>(k: K, v: ExtractedTerms[K]) {
+    dirty.current = true;
     setTerms((t) => ({ ...t, [k]: v }));
   }
 
+  function confirmField(k: string, c: boolean) {
+    dirty.current = true;
+    setConfirmed((x) => ({ ...x, [k]: c }));
+  }
+
   if (!detail) {
     return <div style={{ padding: 24 }}>{error ? <pre style={{ color: 'crimson' }}>{error}</pre> : 'Loading...'}</div>;
   }
@@ -64,6 +124,12 @@ export function DealDetailPage({ dealId, onBack }: { dealId: string; onBack: ()
         <div>
           <h2 style={{ margin: 0 }}>{detail.deal.name}</h2>
           <div style={{ fontSize: 12, opacity: 0.7 }}>{detail.deal.id}</div>
+          {usage && usage.runs ? (
+            <div style={{ fontSize: 12, opacity: 0.7 }}>
+              LLM: {usage.runs} runs, {(usage.prompt_tokens + usage.completion_tokens).toLocaleString()} tokens (~$
+              {usage.cost_usd.toFixed(4)})
+            </div>
+          ) : null}
         </div>
         <button onClick={onBack} style={{ padding: '8px 12px' }}>
           Back
@@ -72,6 +138,7 @@ export function DealDetailPage({ dealId, onBack }: { dealId: string; onBack: ()
 
       {error ? <pre style={{ color: 'crimson' }}>{error}</pre> : null}
       {busy ? <div style={{ marginTop: 10, opacity: 0.7 }}>Working: {busy}</div> : null}
+      {progress ? <div style={{ marginTop: 4, fontSize: 12, opacity: 0.6 }}>{progress}</div> : null}
 
       <hr style={{ margin: '18px 0' }} />
 
@@ -80,12 +147,28 @@ export function DealDetailPage({ dealId, onBack }: { dealId: string; onBack: ()
         <input
           type="file"
           accept=".pdf,.docx,.txt"
+          multiple
           onChange={async (e) => {
-            const f = e.target.files?.[0];
-            if (!f) return;
+            const files = Array.from(e.target.files ?? []);
+            if (!files.length) return;
             try {
               setBusy('Uploading');
-              await api.uploadDocument(dealId, f);
+              // Small files go up together in one batch request; large ones resumably.
+              const small = files.filter((f) => f.size <= RESUMABLE_UPLOAD_THRESHOLD);
+              const large = files.filter((f) => f.size > RESUMABLE_UPLOAD_THRESHOLD);
+              const failures: string[] = [];
+              if (small.length === 1) {
+                await api.uploadDocument(dealId, small[0]);
+              } else if (small.length > 1) {
+                const res = await api.uploadDocuments(dealId, small);
+                res.results.forEach((r) => r.status === 'error' && failures.push(`${r.filename}: ${r.error}`));
+              }
+              for (const f of large) {
+                await api.uploadDocumentResumable(dealId, f, (received, total) =>
+                  setBusy(`Uploading ${f.name} ${Math.floor((100 * received) / total)}%`)
+                );
+              }
+              if (failures.length) setError(`Some files failed:\n${failures.join('\n')}`);
               await refresh();
             } catch (err) {
               setError(String(err));
@@ -144,6 +227,25 @@ export function DealDetailPage({ dealId, onBack }: { dealId: string; onBack: ()
         >
           Draft
         </button>
+        <button
+          title="Extract, analyze and draft; unchanged steps are skipped"
+          onClick={async () => {
+            try {
+              setBusy('Running pipeline');
+              const res = await api.runPipeline(dealId);
+              const blocked = res.stages.find((s) => s.status === 'blocked');
+              if (blocked) setError(`${blocked.stage}: ${blocked.reason}`);
+              await refresh();
+            } catch (err) {
+              setError(String(err));
+            } finally {
+              setBusy(null);
+            }
+          }}
+          style={{ padding: '8px 12px' }}
+        >
+          Run all
+        </button>
         <button
           onClick={async () => {
             try {
@@ -172,6 +274,14 @@ export function DealDetailPage({ dealId, onBack }: { dealId: string; onBack: ()
           <div key={doc.id} style={{ border: '1px solid #eee', padding: 10, borderRadius: 8 }}>
             <div style={{ fontWeight: 700 }}>{doc.filename}</div>
             <div style={{ fontSize: 12, opacity: 0.7 }}>{doc.sha256}</div>
+            {doc.extraction_status && doc.extraction_status !== 'ok' && (
+              <div style={{ fontSize: 12, color: '#b45309' }}>
+                Text extraction incomplete ({doc.extraction_status.replace('_', ' ')}); only partial text is available.
+              </div>
+            )}
+            <a href={api.documentContentUrl(dealId, doc.id)} target="_blank" rel="noreferrer" style={{ fontSize: 12 }}>
+              Preview
+            </a>
           </div>
         ))}
       </div>
@@ -179,13 +289,19 @@ export function DealDetailPage({ dealId, onBack }: { dealId: string; onBack: ()
       <hr style={{ margin: '18px 0' }} />
 
       <h3>Extracted Terms (editable)</h3>
+      {termsChanged ? (
+        <div style={{ marginBottom: 10, fontSize: 12, color: '#b45309' }}>
+          Terms changed since you started editing.{' '}
+          <button onClick={() => refresh().catch((e) => setError(String(e)))}>Reload (discard my edits)</button>
+        </div>
+      ) : null}
       <div style={{ display: 'grid', gridTemplateColumns: '1fr 1fr', gap: 12 }}>
         <Field label="Loan amount" value={terms.loan_amount ?? ''} onChange={(v) => updateField('loan_amount', v ? Number(v) : null)} />
-        <Confirm label="Confirm" checked={!!confirmed.loan_amount} onChange={(c) => setConfirmed((x) => ({ ...x, loan_amount: c }))} />
+        <Confirm label="Confirm" checked={!!confirmed.loan_amount} onChange={(c) => confirmField('loan_amount', c)} />
 
         <Field label="Collateral (type)" value={terms.collateral_type || ''} onChange={(v) => updateField('collateral_type', v)} />
         <Field label="Lien position" value={terms.lien_position} onChange={(v) => updateField('lien_position', v as any)} />
-        <Confirm label="Confirm lien" checked={!!confirmed.lien_position} onChange={(c) => setConfirmed((x) => ({ ...x, lien_position: c }))} />
+        <Confirm label="Confirm lien" checked={!!confirmed.lien_position} onChange={(c) => confirmField('lien_position', c)} />
 
         <Field
           label="Collateral value (appraised)"
@@ -195,7 +311,7 @@ export function DealDetailPage({ dealId, onBack }: { dealId: string; onBack: ()
         <Confirm
           label="Confirm appraised"
           checked={!!confirmed.collateral_value_appraised}
-          onChange={(c) => setConfirmed((x) => ({ ...x, collateral_value_appraised: c }))}
+          onChange={(c) => confirmField('collateral_value_appraised', c)}
         />
 
         <Field
@@ -206,11 +322,11 @@ export function DealDetailPage({ dealId, onBack }: { dealId: string; onBack: ()
         <Confirm
           label="Confirm stressed"
           checked={!!confirmed.collateral_value_stressed}
-          onChange={(c) => setConfirmed((x) => ({ ...x, collateral_value_stressed: c }))}
+          onChange={(c) => confirmField('collateral_value_stressed', c)}
         />
 
         <Field label="Repayment source" value={terms.repayment_source ?? ''} onChange={(v) => updateField('repayment_source', v || null)} />
-        <Confirm label="Confirm repay" checked={!!confirmed.repayment_source} onChange={(c) => setConfirmed((x) => ({ ...x, repayment_source: c }))} />
+        <Confirm label="Confirm repay" checked={!!confirmed.repayment_source} onChange={(c) => confirmField('repayment_source', c)} />
       </div>
 
       <div style={{ marginTop: 12, display: 'flex', gap: 10 }}>
@@ -235,6 +351,32 @@ export function DealDetailPage({ dealId, onBack }: { dealId: string; onBack: ()
         </div>
       </div>
 
+      {detail.citation_spans && Object.keys(detail.citation_spans).length > 0 ? (
+        <div style={{ marginTop: 12, fontSize: 12 }}>
+          <b>Sources</b>
+          {Object.entries(detail.citation_spans).map(([field, spans]) =>
+            spans.map((span, i) => (
+              <div key={`${field}-${i}`} style={{ marginTop: 4 }}>
+                <code>{field}</code>{' '}
+                {span.document_id != null ? (
+                  <a
+                    href={`${api.documentContentUrl(dealId, span.document_id)}${span.page ? `#page=${span.page}` : ''}`}
+                    target="_blank"
+                    rel="noreferrer"
+                  >
+                    {detail.documents.find((d) => d.id === span.document_id)?.filename ?? `#${span.document_id}`}
+                    {span.page ? ` p.${span.page}` : ''}
+                  </a>
+                ) : (
+                  <span style={{ opacity: 0.6 }}>not found</span>
+                )}
+                : <span style={{ opacity: 0.8 }}>{span.snippet}</span>
+              </div>
+            ))
+          )}
+        </div>
+      ) : null}
+
       <hr style={{ margin: '18px 0' }} />
 
       <h3>Analysis</h3>